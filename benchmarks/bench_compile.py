@@ -0,0 +1,288 @@
+"""
+Benchmark of the compilation of representative programs.
+
+Measures the time to build the program with the q1pulse statements, the time
+to clone the program, the time of `Program.compile` and the time of the compile
+and assemble phases separately, and the peak memory allocated during compilation.
+The programs cover the hot paths of the compiler: long ramps, chirps,
+nested range loops, large array loops, conditional blocks, phase shifts with
+high resolution registers, programs with 60 sequencers and a train of
+100_000 block pulses added one by one and with the bulk `Program.block_pulses`.
+
+The programs are built without instruments and compiled without writing files.
+
+The classes follow the asv conventions (setup, time_*, track_*).
+Run with asv to track the results across commits:
+    asv run --bench bench_compile
+Run as script for a quick comparison:
+    python -m benchmarks.bench_compile
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from q1pulse.program import Program
+from q1pulse.sequencer.control import ControlBuilder
+from q1pulse.sequencer.readout import ReadoutBuilder
+from q1pulse.util.profiler import Profiler
+
+
+def _new_program(n_control=2, n_readout=1):
+    p = Program()
+    for i in range(n_control):
+        p.add_sequence_builder(ControlBuilder(f"P{i+1}", [0], 2.5))
+    p.add_sequence_builder(ControlBuilder("q1", [0, 1], 2.5, nco_frequency=100e6))
+    for i in range(n_readout):
+        p.add_sequence_builder(ReadoutBuilder(f"R{i+1}", [], 0.5, nco_frequency=100e6))
+    return p
+
+
+def _ramps():
+    p = _new_program()
+    for i in range(200):
+        p.P1.ramp(20_000 + 4*i, -0.5, 0.5)
+        p.P2.ramp(20_000 + 4*i, 0.5, -0.5)
+        p.wait(100)
+    with p.loop_linspace(-0.5, 0.5, 20) as v:
+        p.P1.ramp(10_000, v, -v)
+        p.P2.ramp(10_000, -v, v)
+    return p
+
+
+def _chirps():
+    p = _new_program()
+    for i in range(100):
+        p.q1.chirp(20_000, 0.5, 1e6 * (1 + i % 4), 10e6)
+        p.wait(100)
+    return p
+
+
+def _loop_nest():
+    p = _new_program()
+    p.R1.add_acquisition_bins("default", 3**8)
+    p.R1.integration_length_acq = 100
+    p.R.bin = 0
+    loops = []
+    for i in range(8):
+        loop = p.loop_range(3)
+        loop.__enter__()
+        loops.append(loop)
+        p.P1.block_pulse(100, 0.01*i)
+    with p.parallel():
+        p.P2.block_pulse(300, 0.2)
+        p.R1.acquire("default", p.R.bin, t_offset=100)
+        p.R.bin += 1
+    for loop in reversed(loops):
+        loop.__exit__(None, None, None)
+    return p
+
+
+def _loop_array():
+    p = _new_program()
+    p.R1.add_acquisition_bins("default", 2000)
+    p.R1.integration_length_acq = 100
+    values = np.linspace(-0.5, 0.5, 2000)
+    with p.loop_array(values) as v:
+        with p.parallel():
+            p.P1.block_pulse(300, v)
+            p.P2.block_pulse(300, -v)
+            p.R1.acquire("default", "increment", t_offset=100)
+        p.wait(200)
+    return p
+
+
+def _conditional():
+    p = _new_program()
+    trigger = p.configure_trigger("R1")
+    counter = p.add_trigger_counter(trigger)
+    p.R1.add_acquisition_bins("default", 500)
+    p.R1.integration_length_acq = 100
+    p.R1.thresholded_acq_threshold = 0.1
+    for i in range(500):
+        p.R1.acquire("default")
+        p.wait(400)
+        p.latch_reset()
+        p.wait(20)
+        p.P1.latch_enable(True)
+        p.wait(100)
+        with p.conditional([counter], evaluation_time=20) as flags:
+            with flags.all_set():
+                p.P1.block_pulse(100, 0.5)
+            with flags.none_set():
+                p.P1.ramp(100, 0.25, 0.0)
+        p.wait(100)
+    return p
+
+
+def _hires_phase():
+    p = _new_program()
+    p.q1.Rs.phase_shift = 0.001
+    p.R1.add_acquisition_bins("default", 1000)
+    p.R1.integration_length_acq = 100
+    with p.loop_range(1000):
+        with p.parallel():
+            p.q1.block_pulse(300, 0.1)
+            p.R1.acquire("default", "increment", t_offset=100)
+        p.q1.shift_phase(p.q1.Rs.phase_shift, hires_reg=True)
+        p.q1.Rs.phase_shift += 0.001
+        p.wait(200)
+    for i in range(200):
+        p.q1.set_phase(0.001*i)
+        p.q1.block_pulse(100, 0.1)
+    return p
+
+
+def _sequencers_60():
+    p = _new_program(n_control=50, n_readout=9)
+    for builder in p.sequence_builders.values():
+        if isinstance(builder, ReadoutBuilder):
+            builder.add_acquisition_bins("default", 100)
+            builder.integration_length_acq = 100
+    with p.loop_linspace(-0.5, 0.5, 100) as v:
+        with p.parallel():
+            for i in range(50):
+                p[f"P{i+1}"].block_pulse(200, v, t_offset=(i % 10) * 4)
+            for i in range(9):
+                p[f"R{i+1}"].acquire("default", "increment", t_offset=60)
+        p.wait(300)
+        for i in range(50):
+            p[f"P{i+1}"].ramp(200, 0.0, v)
+    return p
+
+
+def _pulse_train(n=100_000):
+    rng = np.random.default_rng(0)
+    durations = rng.integers(4, 100, size=n)
+    times = np.cumsum(durations + 4) - durations - 4
+    amplitudes = rng.uniform(-0.5, 0.5, size=n)
+    return times, amplitudes, durations
+
+
+def _pulses_loop():
+    p = _new_program()
+    times, amplitudes, durations = _pulse_train()
+    with p.parallel():
+        for t, a, d in zip(times.tolist(), amplitudes.tolist(), durations.tolist()):
+            p.P1.block_pulse(d, a, t_offset=t)
+    return p
+
+
+def _pulses_bulk():
+    p = _new_program()
+    times, amplitudes, durations = _pulse_train()
+    p.block_pulses(times, np.full(len(times), "P1"), amplitudes, durations)
+    return p
+
+
+PROGRAMS = {
+    "ramps": _ramps,
+    "chirps": _chirps,
+    "loop_nest": _loop_nest,
+    "loop_array": _loop_array,
+    "conditional": _conditional,
+    "hires_phase": _hires_phase,
+    "sequencers_60": _sequencers_60,
+    "pulses_loop": _pulses_loop,
+    "pulses_bulk": _pulses_bulk,
+    }
+
+
+class TimeBuild:
+    params = list(PROGRAMS)
+    param_names = ["program"]
+    timeout = 300
+
+    def time_build(self, program):
+        PROGRAMS[program]()
+
+
+class TimeClone:
+    params = list(PROGRAMS)
+    param_names = ["program"]
+    timeout = 300
+
+    def setup(self, program):
+        self.program = PROGRAMS[program]()
+
+    def time_clone(self, program):
+        self.program.clone()
+
+
+class TimeCompile:
+    params = list(PROGRAMS)
+    param_names = ["program"]
+    timeout = 300
+
+    def setup(self, program):
+        self.program = PROGRAMS[program]()
+
+    def _compile(self):
+        self.program.compile(add_comments=False, json=False)
+
+    def _phase_time(self, phase):
+        with Profiler() as profiler:
+            self._compile()
+        n, total = profiler.summary()[phase]
+        return total
+
+    def time_compile(self, program):
+        self._compile()
+
+    def time_compile_with_comments(self, program):
+        self.program.compile(add_comments=True, json=False)
+
+    def peakmem_compile(self, program):
+        self._compile()
+
+    def track_compile_phase(self, program):
+        return self._phase_time("compile")
+
+    track_compile_phase.unit = "seconds"
+
+    def track_assemble_phase(self, program):
+        return self._phase_time("assemble")
+
+    track_assemble_phase.unit = "seconds"
+
+    def track_compile_memory(self, program):
+        tracemalloc.start()
+        try:
+            self._compile()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak
+
+    track_compile_memory.unit = "bytes"
+
+    def track_n_instructions(self, program):
+        self._compile()
+        return sum(
+            self.program.statistics(name).n_instructions
+            for name in self.program.sequence_builders
+            )
+
+    track_n_instructions.unit = "instructions"
+
+
+if __name__ == "__main__":
+    n = 3
+    bench = TimeCompile()
+    print(f"{'program':14} {'build':>8} {'compile':>8} {'(compile':>9} {'assemble)':>9} "
+          f"{'memory':>8} {'instr':>7}")
+    for name in PROGRAMS:
+        t_start = time.perf_counter()
+        bench.setup(name)
+        t_build = time.perf_counter() - t_start
+        t_start = time.perf_counter()
+        for _ in range(n):
+            bench.time_compile(name)
+        t_compile = (time.perf_counter() - t_start) / n
+        t_phase_compile = bench.track_compile_phase(name)
+        t_phase_assemble = bench.track_assemble_phase(name)
+        memory = bench.track_compile_memory(name)
+        n_instructions = bench.track_n_instructions(name)
+        print(f"{name:14} {t_build*1000:6.1f}ms {t_compile*1000:6.1f}ms "
+              f"{t_phase_compile*1000:7.1f}ms {t_phase_assemble*1000:7.1f}ms "
+              f"{memory/2**20:6.1f}MB {n_instructions:7}")
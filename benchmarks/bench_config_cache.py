@@ -0,0 +1,98 @@
+"""
+Benchmark of the sequencer configuration cache of TurboCluster.
+
+QCoDeS calls the configuration getters for every parameter access.
+The classes follow the asv conventions (setup, time_*).
+Run as script for a quick comparison:
+    python -m benchmarks.bench_config_cache
+"""
+import json
+import timeit
+
+from qblox_instruments.native.helpers import get_generic_json_config_val, set_generic_json_config_val
+
+from q1pulse.turbo_cluster import TurboCluster
+from q1pulse.util.frozen_json import freeze
+
+
+def _sequencer_config():
+    """Returns a sequencer configuration of a QRM as retrieved from the module."""
+    return {
+        "acq": [{
+            "demod": {"en": False},
+            "th_acq": {
+                "discr_threshold": 0.0,
+                "non_weighed_integration_len": 1024,
+                "rotation_matrix_a11": 1.0,
+                "rotation_matrix_a12": 0.0,
+                },
+            "th_acq_mrk_map": {"addr": 0, "en": False, "inv": False},
+            "th_acq_trg_map": {"addr": 0, "en": False, "inv": False},
+            "ttl": {"auto_bin_incr_en": False, "in": False, "threshold": 0.0},
+            }],
+        "awg": [{
+            "cont_mode": {"en_path": [False, False], "wave_idx_path": [0, 0]},
+            "mixer": {"en": False, "corr_gain_ratio": 1.0, "corr_phase_offset_degree": -0.0},
+            "marker_ovr": {"en": False, "val": 0},
+            "gain_path": [1.0, 1.0],
+            "nco": {"freq_hz": 0.0, "po": 0.0, "delay_comp": 0, "delay_comp_en": False},
+            "offs_path": [0.0, 0.0],
+            "upsample_rate_path": [0, 0],
+            }],
+        "seq_proc": {
+            "sync_en": False,
+            "trg": [{"count_threshold": 1, "threshold_invert": False}] * 15,
+            },
+        }
+
+
+def _offline_cluster():
+    """Returns a TurboCluster without connection. Only the configuration cache can be used."""
+    cluster = TurboCluster.__new__(TurboCluster)
+    cluster._clear_cache()
+    return cluster
+
+
+class TimeSequencerConfigCache:
+
+    def setup(self):
+        self.cluster = _offline_cluster()
+        self.cluster._sequencer_config_cache[(2, 0)] = freeze(_sequencer_config())
+        self.json_str = json.dumps(_sequencer_config())
+
+    def time_json_loads(self):
+        # reference: implementation before frozen cache
+        json.loads(self.json_str)
+
+    def time_get_sequencer_config(self):
+        self.cluster._get_sequencer_config(2, 0)
+
+    def time_get_sequencer_config_val(self):
+        get_generic_json_config_val(
+            lambda: self.cluster._get_sequencer_config(2, 0),
+            ["awg", "nco", "freq_hz"],
+            is_sequencer=True)
+
+    def time_set_sequencer_config_val(self):
+        set_generic_json_config_val(
+            lambda: self.cluster._get_sequencer_config(2, 0),
+            # only update the cache; there is no module to send the configuration to.
+            lambda cfg: self.cluster._sequencer_config_cache.__setitem__((2, 0), freeze(cfg)),
+            ["awg", "nco", "freq_hz"],
+            1.0e8,
+            is_sequencer=True)
+
+
+if __name__ == "__main__":
+    n = 10_000
+    bench = TimeSequencerConfigCache()
+    bench.setup()
+    for name in [
+            "time_json_loads",
+            "time_get_sequencer_config",
+            "time_get_sequencer_config_val",
+            "time_set_sequencer_config_val",
+            ]:
+        method = getattr(bench, name)
+        t = timeit.timeit(method, number=n)
+        print(f"{name[5:]:30} {n} calls {t*1000:7.1f} ms, {t/n*1e6:6.2f} us/call")
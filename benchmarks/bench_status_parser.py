@@ -0,0 +1,51 @@
+"""
+Benchmark of the sequencer status parsing during polling.
+
+The classes follow the asv conventions (setup, time_*).
+Run as script for a quick comparison:
+    python -m benchmarks.bench_status_parser
+"""
+import timeit
+
+from q1pulse.modules.sequencer_states import parse_sequencer_status, translate_seq_status
+from q1pulse.turbo_cluster import _convert_sequencer_status
+
+
+STATUS_STRINGS = [
+    "OKAY;RUNNING;;;;",
+    "OKAY;Q1 STOPPED;;;;",
+    "OKAY;STOPPED;ACQ BINNING DONE,;;;",
+    "OKAY;STOPPED;ACQ SCOPE DONE PATH 0,ACQ SCOPE DONE PATH 1,ACQ BINNING DONE,;;;",
+    "WARNING;STOPPED;ACQ BINNING DONE,;ACQ SCOPE OUT OF RANGE PATH 0,;;",
+    ]
+
+
+class TimeStatusParser:
+    params = STATUS_STRINGS
+    param_names = ["status"]
+
+    def setup(self, status_str):
+        parse_sequencer_status.cache_clear()
+        # fill the cache like during polling
+        parse_sequencer_status(status_str)
+
+    def time_convert_and_translate(self, status_str):
+        translate_seq_status(_convert_sequencer_status(status_str))
+
+    def time_parse_cached(self, status_str):
+        parse_sequencer_status(status_str)
+
+    def time_parse_uncached(self, status_str):
+        parse_sequencer_status.__wrapped__(status_str)
+
+
+if __name__ == "__main__":
+    n = 10_000
+    bench = TimeStatusParser()
+    for status_str in STATUS_STRINGS:
+        bench.setup(status_str)
+        print(status_str)
+        for name in ["time_convert_and_translate", "time_parse_uncached", "time_parse_cached"]:
+            method = getattr(bench, name)
+            t = timeit.timeit(lambda: method(status_str), number=n)
+            print(f"  {name[5:]:24} {t/n*1e6:7.2f} us")
@@ -0,0 +1,152 @@
+"""
+Benchmark of the communication of TurboCluster with a local SCPI emulator.
+
+Measures the throughput of the steps of a program run: upload of the sequences,
+configuration of the sequencers, arm and start, and status polling.
+The emulator adds a latency to every response to make the effect of the number
+of round trips visible.
+
+The classes follow the asv conventions (setup, teardown, time_*).
+Run as script for a quick comparison:
+    python -m benchmarks.bench_turbo_communication
+"""
+import time
+
+from qblox_instruments import ClusterType
+from qblox_instruments.types import DebugLevel
+
+from q1pulse.turbo_cluster import TurboCluster
+from q1pulse.modules.sequencer_states import parse_sequencer_status
+from benchmarks.scpi_emulator import ScpiEmulator
+
+
+HOST = "127.0.0.2"
+N_SEQUENCERS = 6
+
+_q1asm = """
+          wait_sync       4
+          set_mrk         15
+          upd_param       100
+          move            100,R0
+loop:     set_awg_offs    8000,-8000
+          upd_param       20
+          set_awg_offs    0,0
+          upd_param       20
+          loop            R0,@loop
+          set_mrk         0
+          upd_param       4
+          stop
+"""
+
+
+def _modules():
+    return {
+        2: ClusterType.CLUSTER_QCM,
+        3: ClusterType.CLUSTER_QCM,
+        4: ClusterType.CLUSTER_QRM,
+        5: ClusterType.CLUSTER_QRM,
+        }
+
+
+def _sequence():
+    return {
+        "waveforms": {},
+        "weights": {},
+        "acquisitions": {"default": {"num_bins": 1, "index": 0}},
+        "program": _q1asm,
+        }
+
+
+class TimeTurboCommunication:
+    params = [0.0, 0.0005]
+    param_names = ["latency"]
+    timeout = 300
+
+    def setup(self, latency):
+        self.emulator = ScpiEmulator(_modules(), HOST, latency=latency)
+        self.emulator.start()
+        # NOTE: the emulator has firmware version 0.0.0. Skip version check.
+        self.cluster = TurboCluster("bench_turbo", HOST, debug=DebugLevel.ERROR_CHECK)
+        self.slots = list(_modules())
+        self.sequencers = [
+            self.cluster.modules[slot-1].sequencers[seq_nr]
+            for slot in self.slots
+            for seq_nr in range(N_SEQUENCERS)
+            ]
+        self.sequence = _sequence()
+        # wait for the connections to the modules.
+        self.cluster.get_system_errors()
+
+    def teardown(self, latency):
+        self.cluster.close()
+        self.emulator.stop()
+
+    def time_upload(self, latency):
+        for sequencer in self.sequencers:
+            sequencer.sequence(self.sequence)
+
+    def _configure(self):
+        for i, sequencer in enumerate(self.sequencers):
+            sequencer.sync_en(True)
+            sequencer.mod_en_awg(True)
+            sequencer.nco_freq(10e6 + i * 1e6)
+            sequencer.offset_awg_path0(0.0)
+            sequencer.offset_awg_path1(0.0)
+            sequencer.marker_ovr_en(False)
+
+    def time_configure(self, latency):
+        self._configure()
+        self.cluster.get_system_errors()
+
+    def time_configure_batch(self, latency):
+        with self.cluster.batch():
+            self._configure()
+        self.cluster.get_system_errors()
+
+    def time_arm_start(self, latency):
+        with self.cluster.batch():
+            for slot in self.slots:
+                self.cluster.arm_sequencer(slot)
+        self.cluster.get_system_errors()
+        with self.cluster.batch():
+            for slot in self.slots:
+                self.cluster.start_sequencer(slot)
+        self.cluster.get_system_errors()
+
+    def time_status_polling(self, latency):
+        for sequencer in self.sequencers:
+            sequencer.get_sequencer_status()
+
+    def time_status_polling_multiple(self, latency):
+        self.cluster.get_sequencer_status_multiple(
+            {slot: list(range(N_SEQUENCERS)) for slot in self.slots},
+            parse_sequencer_status)
+
+    def time_system_errors(self, latency):
+        self.cluster.get_system_errors()
+
+
+if __name__ == "__main__":
+    n = 10
+    bench = TimeTurboCommunication()
+    for latency in TimeTurboCommunication.params:
+        bench.setup(latency)
+        try:
+            print(f"latency {latency*1000:3.1f} ms")
+            for name in [
+                    "time_upload",
+                    "time_configure",
+                    "time_configure_batch",
+                    "time_arm_start",
+                    "time_status_polling",
+                    "time_status_polling_multiple",
+                    "time_system_errors",
+                    ]:
+                method = getattr(bench, name)
+                t_start = time.perf_counter()
+                for _ in range(n):
+                    method(latency)
+                t = (time.perf_counter() - t_start) / n
+                print(f"  {name[5:]:30} {t*1000:7.2f} ms")
+        finally:
+            bench.teardown(latency)
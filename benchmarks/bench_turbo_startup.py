@@ -0,0 +1,73 @@
+"""
+Benchmark of the construction of TurboCluster against a local SCPI emulator.
+
+The construction time of TurboCluster and Cluster is about equal. It is dominated
+by the creation of the QCoDeS parameters of qblox-instruments.
+
+The classes follow the asv conventions (setup, teardown, time_*).
+Run as script for a quick comparison:
+    python -m benchmarks.bench_turbo_startup
+"""
+import time
+
+from qblox_instruments import Cluster, ClusterType
+from qblox_instruments.types import DebugLevel
+
+from q1pulse.turbo_cluster import TurboCluster
+from benchmarks.scpi_emulator import ScpiEmulator
+
+
+HOST = "127.0.0.2"
+
+
+def _modules(n_modules):
+    return {
+        slot: ClusterType.CLUSTER_QCM if slot % 2 else ClusterType.CLUSTER_QRM
+        for slot in range(2, 2 + n_modules)
+        }
+
+
+class TimeClusterStartup:
+    params = [2, 10]
+    param_names = ["n_modules"]
+    timeout = 300
+
+    def setup(self, n_modules):
+        self.emulator = ScpiEmulator(_modules(n_modules), HOST)
+        self.emulator.start()
+
+    def teardown(self, n_modules):
+        self.emulator.stop()
+
+    def time_turbo_cluster(self, n_modules):
+        # NOTE: the emulator has firmware version 0.0.0. Skip version check.
+        cluster = TurboCluster("bench_turbo", HOST, debug=DebugLevel.ERROR_CHECK)
+        cluster.close()
+
+    def time_turbo_cluster_first_request(self, n_modules):
+        # includes the wait for the connections to the modules.
+        cluster = TurboCluster("bench_turbo", HOST, debug=DebugLevel.ERROR_CHECK)
+        cluster.get_sequencer_status_multiple({slot: [0] for slot in _modules(n_modules)})
+        cluster.close()
+
+    def time_cluster(self, n_modules):
+        cluster = Cluster("bench_cluster", HOST, debug=DebugLevel.ERROR_CHECK)
+        cluster.close()
+
+
+if __name__ == "__main__":
+    n = 3
+    bench = TimeClusterStartup()
+    for n_modules in TimeClusterStartup.params:
+        bench.setup(n_modules)
+        try:
+            print(f"{n_modules} modules")
+            for name in ["time_cluster", "time_turbo_cluster", "time_turbo_cluster_first_request"]:
+                method = getattr(bench, name)
+                t_start = time.perf_counter()
+                for _ in range(n):
+                    method(n_modules)
+                t = (time.perf_counter() - t_start) / n
+                print(f"  {name[5:]:34} {t*1000:7.1f} ms")
+        finally:
+            bench.teardown(n_modules)
@@ -0,0 +1,144 @@
+"""
+Local TCP server that emulates the SCPI interface of a Qblox Cluster.
+
+The commands are executed by the dummy transport of qblox-instruments.
+The CMM listens on port 5025 and the modules on port 25000+slot, like a
+real cluster. Use another loopback address than 127.0.0.1 to avoid conflicts
+with other servers, e.g. 127.0.0.2.
+
+The latency of the instrument can be emulated with a delay per command and
+a delay per response. The delays are per connection, like on the real cluster
+where the modules process commands in parallel.
+
+Example:
+    with ScpiEmulator({2: ClusterType.CLUSTER_QCM, 4: ClusterType.CLUSTER_QRM}):
+        cluster = TurboCluster("cluster", "127.0.0.2")
+"""
+import logging
+import socket
+import socketserver
+import threading
+import time
+
+from qblox_instruments import ClusterType
+from qblox_instruments.ieee488_2.cluster_dummy_transport import ClusterDummyTransport
+from qblox_instruments.pnp import resolve
+
+
+logger = logging.getLogger(__name__)
+
+
+class ScpiEmulator:
+    """Emulates a Qblox Cluster on a local TCP address.
+
+    Args:
+        modules: module type per slot.
+        host: local IP address to listen on.
+        latency: delay before every response [s].
+        command_time: processing time of every command [s].
+    """
+
+    def __init__(self, modules: dict[int, ClusterType], host: str = "127.0.0.2",
+                 latency: float = 0.0, command_time: float = 0.0):
+        self.host = host
+        self.latency = latency
+        self.command_time = command_time
+        self._transport = ClusterDummyTransport(modules)
+        # The dummy transport is not thread-safe.
+        self._lock = threading.Lock()
+        self._servers: list[socketserver.ThreadingTCPServer] = []
+        self._threads: list[threading.Thread] = []
+        self._targets = {resolve(host).scpi_port: self._transport}
+        for slot in modules:
+            self._targets[resolve(f"{host}/{slot}").scpi_port] = self._transport._modules[str(slot)]
+
+    def start(self) -> None:
+        for port, transport in self._targets.items():
+            server = _ScpiServer((self.host, port), _ScpiHandler)
+            server.emulator = self
+            server.transport = transport
+            thread = threading.Thread(target=server.serve_forever, daemon=True,
+                                      name=f"ScpiEmulator-{port}")
+            thread.start()
+            self._servers.append(server)
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._servers = []
+        self._threads = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def execute(self, transport, cmd: bytes, bin_block: bytes | None) -> bytes | None:
+        """Executes the command on the dummy transport and returns the response, if any."""
+        with self._lock:
+            transport._bin_out = None
+            if bin_block is None:
+                transport.write(cmd.decode())
+            else:
+                transport.write_binary(cmd, bin_block)
+            if b"?" not in cmd.split(b" ", 1)[0]:
+                return None
+            if transport._bin_out is not None:
+                return transport._bin_out
+            return f"{transport._data_out}\n".encode()
+
+
+class _ScpiServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _ScpiHandler(socketserver.StreamRequestHandler):
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self):
+        emulator = self.server.emulator
+        transport = self.server.transport
+        rfile = self.rfile
+        while line := rfile.readline():
+            cmd, bin_block = _split_binary_block(line, rfile)
+            cmd = cmd.rstrip()
+            if not cmd:
+                continue
+            if emulator.command_time:
+                time.sleep(emulator.command_time)
+            try:
+                response = emulator.execute(transport, cmd, bin_block)
+            except Exception:
+                logger.error(f"Failed to execute {cmd}", exc_info=True)
+                response = b"\n" if b"?" in cmd else None
+            if response is not None:
+                if emulator.latency:
+                    time.sleep(emulator.latency)
+                self.wfile.write(response)
+
+
+def _split_binary_block(line: bytes, rfile) -> tuple[bytes, bytes | None]:
+    """Splits a line with an IEEE488.2 binary block in command and block.
+    The binary block can contain newlines. The remainder of the block is read from rfile.
+    """
+    i = line.find(b" #")
+    if i < 0 or not line[i+2:i+3].isdigit():
+        return line, None
+    n_digits = int(line[i+2:i+3])
+    start = i + 3 + n_digits
+    size = int(line[i+3:start])
+    data = line[start:]
+    if len(data) < size + 1:
+        # read remainder of block and line end
+        data += rfile.read(size + 1 - len(data))
+    return line[:i+1], line[i+1:start] + data[:size]
@@ -0,0 +1,635 @@
+'''
+Host-side executor for compiled Q1 programs.
+
+The executor runs the Q1 instructions of a single sequencer and records the
+real-time events with their time in ns. The result can be used to verify the
+timing of compiled programs without instrument or simulator.
+
+The real-time settings (offset, gain, markers, frequency, phase) are recorded
+at the time of the next upd_param, play or acquire, like on the sequencer.
+Time 0 is the start of the program, i.e. the start of `wait_sync`.
+
+Conditional real-time instructions are executed when `condition` is True and
+replaced by a wait of the else-duration otherwise. The triggers are not simulated.
+
+Example:
+    p.compile()
+    results = execute_program(p)
+    offsets = results['P1'].select(RtEvent.OFFSET)
+    print(offsets['time'], offsets['arg0'])
+'''
+import re
+from dataclasses import dataclass
+from enum import IntEnum
+
+import numpy as np
+
+from .instruction_queue import Instruction
+from ..lang.exceptions import Q1ExecutionError
+
+N_REGISTERS = 64
+_MASK = 0xFFFF_FFFF
+
+
+class RtEvent(IntEnum):
+    OFFSET = 1
+    GAIN = 2
+    MARKER = 3
+    FREQUENCY = 4
+    PHASE = 5
+    PHASE_DELTA = 6
+    RESET_PHASE = 7
+    PLAY = 8
+    ACQUIRE = 9
+    ACQUIRE_WEIGHED = 10
+    ACQUIRE_TTL = 11
+    LATCH_EN = 12
+    LATCH_RST = 13
+
+
+EVENT_DTYPE = np.dtype([
+    ('time', np.int64),
+    ('event', np.uint8),
+    ('arg0', np.int64),
+    ('arg1', np.int64),
+    ('arg2', np.int64),
+    ('arg3', np.int64),
+    ])
+'''
+Event arguments:
+    OFFSET, GAIN: path0, path1 (signed 16 bit)
+    MARKER: marker bits
+    FREQUENCY: frequency in 0.25 Hz (signed 32 bit)
+    PHASE, PHASE_DELTA: phase in 1e-9 rotations
+    PLAY: wave index path0, path1
+    ACQUIRE: acquisition index, bin index
+    ACQUIRE_WEIGHED: acquisition index, bin index, weight index path0, path1
+    ACQUIRE_TTL: acquisition index, bin index, enable
+    LATCH_EN: enable
+'''
+
+
+@dataclass
+class ExecutionResult:
+    events: np.ndarray
+    '''Real-time events with dtype EVENT_DTYPE sorted on time.'''
+    end_time: int
+    '''Real-time at stop [ns].'''
+    n_instructions: int
+    '''Number of executed Q1 instructions.'''
+    registers: np.ndarray
+    '''Values of registers at stop.'''
+
+    def select(self, event: RtEvent) -> np.ndarray:
+        return self.events[self.events['event'] == event]
+
+
+# opcodes. Arithmetic opcodes _SUB .. _NOT must be in a contiguous range.
+_LOOP, _ADD, _SETTING, _RT_UPDATE, _MOVE, _NOP, _WAIT, _JMP, _JLT, _JGE = range(10)
+_SUB, _ASR, _ASL, _AND, _OR, _XOR, _NOT = range(10, 17)
+_SET_COND, _RT_COMMAND, _STOP, _ILLEGAL = range(17, 21)
+
+_ALU = {
+    'add': _ADD, 'sub': _SUB, 'asr': _ASR, 'asl': _ASL,
+    'and': _AND, 'or': _OR, 'xor': _XOR,
+    }
+
+_SETTINGS = {
+    'set_awg_offs': RtEvent.OFFSET,
+    'set_awg_gain': RtEvent.GAIN,
+    'set_mrk': RtEvent.MARKER,
+    'set_freq': RtEvent.FREQUENCY,
+    'set_ph': RtEvent.PHASE,
+    'set_ph_delta': RtEvent.PHASE_DELTA,
+    'reset_ph': RtEvent.RESET_PHASE,
+    }
+
+_ACQUIRES = {
+    'acquire': RtEvent.ACQUIRE,
+    'acquire_weighed': RtEvent.ACQUIRE_WEIGHED,
+    'acquire_ttl': RtEvent.ACQUIRE_TTL,
+    }
+
+_RT_COMMANDS = {
+    'set_latch_en': RtEvent.LATCH_EN,
+    'latch_rst': RtEvent.LATCH_RST,
+    }
+
+# Inner loops with at least this number of remaining iterations are executed vectorized.
+VECTORIZE_MIN_ITERATIONS = 8
+
+_line_pattern = re.compile(r'\s*(?:(\S+):)?\s*(\S+)\s*([^#]*)')
+
+
+def parse_q1asm(program: str) -> list[Instruction]:
+    '''
+    Converts q1asm program text to instructions.
+    The duration of real-time instructions is the last argument.
+    '''
+    instructions = []
+    for line in program.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        m = _line_pattern.match(line)
+        label, mnemonic, arg_str = m.groups()
+        if mnemonic.endswith(':'):
+            # label without instruction
+            instructions.append(Instruction(None, label=mnemonic[:-1]))
+            continue
+        if label is not None:
+            instructions.append(Instruction(None, label=label))
+        args = tuple(
+            arg if arg[0] in 'R@' else int(arg)
+            for arg in (arg.strip() for arg in arg_str.split(','))
+            if arg
+            )
+        instructions.append(Instruction(mnemonic, args))
+    return instructions
+
+
+class Q1Executor:
+    '''
+    Executes the instructions of a compiled Q1 program.
+
+    Args:
+        instructions: instructions of the generator, or parsed with `parse_q1asm`.
+        condition: result of conditions set with set_cond.
+        max_instructions: maximum number of instructions to execute.
+    '''
+
+    def __init__(self,
+                 instructions: list[Instruction | str],
+                 condition: bool = False,
+                 max_instructions: int = 1_000_000_000):
+        self.condition = condition
+        self.max_instructions = max_instructions
+        self._decode(instructions)
+
+    @classmethod
+    def from_q1asm(cls, program: str, **kwargs) -> 'Q1Executor':
+        return cls(parse_q1asm(program), **kwargs)
+
+    def _decode(self, instructions):
+        program = []
+        labels = {}
+        for i in instructions:
+            if isinstance(i, str) or i.overwritten:
+                continue
+            if i.mnemonic is None:
+                labels[i.label] = len(program)
+                continue
+            program.append(i)
+
+        # Memory with registers followed by constants.
+        # Operands are indices in memory, so registers and immediate values are handled alike.
+        constants = {}
+        memory = [0] * N_REGISTERS
+
+        def operand(arg):
+            if isinstance(arg, str):
+                if arg[0] == 'R':
+                    return int(arg[1:])
+                if arg[0] == '@':
+                    try:
+                        arg = labels[arg[1:]]
+                    except KeyError:
+                        raise Q1ExecutionError(f'Unknown label {arg}') from None
+            value = arg & _MASK
+            index = constants.get(value)
+            if index is None:
+                index = len(memory)
+                constants[value] = index
+                memory.append(value)
+            return index
+
+        zero = operand(0)
+        code = []
+        for line_nr, i in enumerate(program, 1):
+            args = tuple(i.args or ())
+            if i.wait_after is not None:
+                args += (i.wait_after,)
+            mnemonic = i.mnemonic
+            ops = [operand(arg) for arg in args]
+            try:
+                if mnemonic in _ALU:
+                    instr = (_ALU[mnemonic], *ops)
+                elif mnemonic == 'loop':
+                    instr = (_LOOP, *ops)
+                elif mnemonic == 'move':
+                    instr = (_MOVE, *ops)
+                elif mnemonic == 'not':
+                    instr = (_NOT, *ops)
+                elif mnemonic == 'jmp':
+                    instr = (_JMP, *ops)
+                elif mnemonic == 'jlt':
+                    instr = (_JLT, *ops)
+                elif mnemonic == 'jge':
+                    instr = (_JGE, *ops)
+                elif mnemonic == 'nop':
+                    instr = (_NOP,)
+                elif mnemonic in _SETTINGS:
+                    instr = (_SETTING, int(_SETTINGS[mnemonic]), *ops, *[zero]*(2-len(ops)))
+                elif mnemonic == 'set_cond':
+                    instr = (_SET_COND, ops[0], ops[3])
+                elif mnemonic == 'upd_param':
+                    instr = (_RT_UPDATE, 0, ops[0])
+                elif mnemonic == 'wait':
+                    instr = (_WAIT, ops[0])
+                elif mnemonic == 'wait_sync':
+                    instr = (_WAIT, ops[0])
+                elif mnemonic == 'play':
+                    instr = (_RT_UPDATE, int(RtEvent.PLAY), ops[-1], *ops[:-1])
+                elif mnemonic in _ACQUIRES:
+                    instr = (_RT_UPDATE, int(_ACQUIRES[mnemonic]), ops[-1], *ops[:-1])
+                elif mnemonic in _RT_COMMANDS:
+                    instr = (_RT_COMMAND, int(_RT_COMMANDS[mnemonic]), ops[-1], *ops[:-1])
+                elif mnemonic == 'stop':
+                    instr = (_STOP,)
+                elif mnemonic == 'illegal':
+                    instr = (_ILLEGAL, line_nr, i.comment)
+                else:
+                    raise Q1ExecutionError(f'Unsupported instruction {mnemonic} (L{line_nr:04})')
+            except IndexError:
+                raise Q1ExecutionError(f'Missing argument for {mnemonic} (L{line_nr:04})') from None
+            if instr[0] in (_RT_UPDATE, _RT_COMMAND):
+                # event arguments: 4 operands
+                instr += (zero,) * (7 - len(instr))
+            elif len(instr) < 7:
+                instr += (None,) * (7 - len(instr))
+            code.append(instr)
+
+        for index, instr in enumerate(code):
+            if instr[0] == _LOOP:
+                start = memory[instr[2]] if instr[2] >= N_REGISTERS else None
+                if start is not None and start <= index:
+                    vector_loop = _VectorLoop.create(code, memory, start, index)
+                    if vector_loop is not None:
+                        code[index] = instr[:3] + (vector_loop,) + instr[4:]
+        self._code = code
+        self._memory = memory
+
+    def run(self) -> ExecutionResult:
+        code = self._code
+        mem = list(self._memory)
+        max_instructions = self.max_instructions
+        condition = self.condition
+        events = []
+        append_event = events.append
+        chunks = []
+        pending = {}
+        skip_rt = False
+        else_duration = 0
+        t = 0
+        pc = 0
+        n = 0
+        M = _MASK
+
+        while True:
+            op, a, b, c, d, e, f = code[pc]
+            n += 1
+            if op == _LOOP:
+                v = (mem[a] - 1) & M
+                mem[a] = v
+                if not v:
+                    pc += 1
+                elif c is not None and v >= VECTORIZE_MIN_ITERATIONS and not skip_rt:
+                    # execute remaining iterations at once
+                    if events:
+                        chunks.append(np.array(events, dtype=EVENT_DTYPE))
+                        events.clear()
+                    chunk, t, n_executed = c.run(v, mem, t, pending)
+                    chunks.append(chunk)
+                    n += n_executed
+                    mem[a] = 0
+                    pc += 1
+                else:
+                    pc = mem[b]
+                if n >= max_instructions:
+                    raise Q1ExecutionError(f'Program did not stop after {n} instructions')
+            elif op == _ADD:
+                mem[c] = (mem[a] + mem[b]) & M
+                pc += 1
+            elif op == _SETTING:
+                pending[a] = (mem[b], mem[c])
+                pc += 1
+            elif op == _RT_UPDATE:
+                if skip_rt:
+                    # conditional real-time instruction is replaced by wait
+                    t += else_duration
+                else:
+                    if pending:
+                        for event, (v0, v1) in pending.items():
+                            append_event((t, event, v0, v1, 0, 0))
+                        pending.clear()
+                    if a:
+                        append_event((t, a, mem[c], mem[d], mem[e], mem[f]))
+                    t += mem[b]
+                pc += 1
+            elif op == _MOVE:
+                mem[b] = mem[a]
+                pc += 1
+            elif op == _NOP:
+                pc += 1
+            elif op == _WAIT:
+                t += else_duration if skip_rt else mem[a]
+                pc += 1
+            elif op == _JMP or op == _JLT or op == _JGE:
+                if op == _JMP or (mem[a] < mem[b]) == (op == _JLT):
+                    pc = mem[a if op == _JMP else c]
+                    if n >= max_instructions:
+                        raise Q1ExecutionError(f'Program did not stop after {n} instructions')
+                else:
+                    pc += 1
+            elif op <= _NOT:
+                x = mem[a]
+                if op == _NOT:
+                    mem[b] = ~x & M
+                else:
+                    y = mem[b]
+                    if op == _ASR:
+                        # Q1 asr is a logical shift right.
+                        x = x >> y
+                    elif op == _SUB:
+                        x = (x - y) & M
+                    elif op == _ASL:
+                        x = (x << y) & M
+                    elif op == _AND:
+                        x = x & y
+                    elif op == _OR:
+                        x = x | y
+                    else:
+                        x = x ^ y
+                    mem[c] = x
+                pc += 1
+            elif op == _SET_COND:
+                skip_rt = mem[a] != 0 and not condition
+                else_duration = mem[b]
+                pc += 1
+            elif op == _RT_COMMAND:
+                if skip_rt:
+                    t += else_duration
+                else:
+                    append_event((t, a, mem[c], mem[d], mem[e], mem[f]))
+                    t += mem[b]
+                pc += 1
+            elif op == _STOP:
+                break
+            else:
+                comment = f': {b}' if b else ''
+                raise Q1ExecutionError(f'Illegal instruction at L{a:04}{comment}')
+
+        chunks.append(np.array(events, dtype=EVENT_DTYPE))
+        return ExecutionResult(
+            events=_convert_events(np.concatenate(chunks)),
+            end_time=t,
+            n_instructions=n,
+            registers=np.array(mem[:N_REGISTERS], dtype=np.uint32),
+            )
+
+
+def _convert_events(result: np.ndarray) -> np.ndarray:
+    '''Converts the unsigned register values of the events to signed values.'''
+    event = result['event']
+    signed_16 = (event == RtEvent.OFFSET) | (event == RtEvent.GAIN)
+    for field in ['arg0', 'arg1']:
+        values = result[field]
+        values[signed_16] = values[signed_16].astype(np.uint16).astype(np.int16)
+        frequency = event == RtEvent.FREQUENCY
+        values[frequency] = values[frequency].astype(np.uint32).astype(np.int32)
+    return result
+
+
+def _operands(instr) -> tuple[list[int], int | None]:
+    '''Returns source operands and destination register of instruction.'''
+    op = instr[0]
+    if op == _ADD or _SUB <= op <= _XOR:
+        return [instr[1], instr[2]], instr[3]
+    if op in (_NOT, _MOVE):
+        return [instr[1]], instr[2]
+    if op == _SETTING:
+        return [instr[2], instr[3]], None
+    if op in (_RT_UPDATE, _RT_COMMAND):
+        return list(instr[2:7]), None
+    if op == _WAIT:
+        return [instr[1]], None
+    if op in (_JLT, _JGE):
+        return [instr[1], instr[2]], None
+    return [], None
+
+
+class _VectorLoop:
+    '''
+    Inner loop that is executed with NumPy arrays holding the values of all iterations.
+
+    The loop body may only contain arithmetic, real-time settings and commands,
+    and forward jumps over arithmetic instructions. The forward jumps are
+    executed as a selection of values per iteration.
+    Registers that are carried to the next iteration must be incremented with
+    a loop invariant value. Other loops are executed by the interpreter.
+    '''
+
+    def __init__(self, body: list[tuple], memory: list[int], start: int,
+                 inductions: dict[int, tuple[int, int]]):
+        self.body = body
+        self.start = start
+        self.inductions = inductions
+        # jump targets
+        self.targets = {
+            index: memory[instr[3]]
+            for index, instr in enumerate(body, start)
+            if instr[0] in (_JLT, _JGE)
+            }
+
+    @staticmethod
+    def create(code: list[tuple], memory: list[int], start: int, end: int) -> '_VectorLoop | None':
+        body = code[start:end]
+        counter = code[end][1]
+        alu_ops = {_ADD, _MOVE, _NOP, _SUB, _ASR, _ASL, _AND, _OR, _XOR, _NOT}
+        allowed = alu_ops | {_SETTING, _RT_UPDATE, _RT_COMMAND, _WAIT, _JLT, _JGE}
+        written = set()
+        n_writes = {}
+        read_first = set()
+        conditional = set()
+        skip_ends = []
+        for index, instr in enumerate(body, start):
+            op = instr[0]
+            if op not in allowed:
+                return None
+            skip_ends = [skip_end for skip_end in skip_ends if skip_end > index]
+            sources, dest = _operands(instr)
+            read_first.update(r for r in sources if r < N_REGISTERS and r not in written)
+            if dest is not None:
+                if skip_ends:
+                    conditional.add(dest)
+                    if dest not in written:
+                        read_first.add(dest)
+                written.add(dest)
+                n_writes[dest] = n_writes.get(dest, 0) + 1
+            if op in (_JLT, _JGE):
+                if instr[3] < N_REGISTERS:
+                    return None
+                target = memory[instr[3]]
+                if not index < target <= end:
+                    return None
+                if any(code[i][0] not in alu_ops for i in range(index+1, target)):
+                    return None
+                skip_ends.append(target)
+        if counter in written:
+            return None
+
+        inductions = {}
+        for r in read_first & written:
+            if n_writes[r] != 1 or r in conditional:
+                return None
+            op, a, b, c = next(instr[:4] for instr in body if _operands(instr)[1] == r)
+            if op == _ADD and a == r and b not in written:
+                inductions[r] = (b, 1)
+            elif op == _ADD and b == r and a not in written:
+                inductions[r] = (a, 1)
+            elif op == _SUB and a == r and b not in written:
+                inductions[r] = (b, -1)
+            else:
+                return None
+        return _VectorLoop(body, memory, start, inductions)
+
+    def run(self, n_iterations: int, mem: list[int], t: int, pending: dict
+            ) -> tuple[np.ndarray, int, int]:
+        '''
+        Executes the loop body n_iterations times.
+        Updates the registers in `mem` and the pending settings.
+
+        Returns:
+            events, end time, number of executed instructions.
+        '''
+        M = np.uint64(_MASK)
+        regs = {}
+
+        def get(i):
+            value = regs.get(i)
+            return np.uint64(mem[i]) if value is None else value
+
+        k = np.arange(n_iterations, dtype=np.uint64)
+        for r, (x, sign) in self.inductions.items():
+            step = mem[x] if sign > 0 else -mem[x] & _MASK
+            regs[r] = (np.uint64(mem[r]) + k * np.uint64(step)) & M
+
+        n_executed = n_iterations
+        t_offset = 0
+        actions = []
+        skips = []
+        for index, instr in enumerate(self.body, self.start):
+            op, a, b, c, d, e, f = instr
+            skips = [(skip_end, mask) for skip_end, mask in skips if skip_end > index]
+            skip = None
+            for _, mask in skips:
+                skip = mask if skip is None else skip | mask
+            if skip is not None:
+                n_executed += n_iterations - int(np.count_nonzero(np.broadcast_to(skip, k.shape)))
+            else:
+                n_executed += n_iterations
+            if op == _SETTING:
+                actions.append((None, a, get(b), get(c)))
+            elif op == _RT_UPDATE or op == _RT_COMMAND:
+                actions.append((t_offset, a if op == _RT_UPDATE else -a, get(c), get(d), get(e), get(f)))
+                t_offset = t_offset + get(b)
+            elif op == _WAIT:
+                t_offset = t_offset + get(a)
+            elif op == _JLT or op == _JGE:
+                mask = get(a) < get(b) if op == _JLT else get(a) >= get(b)
+                skips.append((self.targets[index], mask))
+            elif op != _NOP:
+                if op == _MOVE:
+                    value, dest = get(a), b
+                elif op == _NOT:
+                    value, dest = ~get(a) & M, b
+                else:
+                    x, y = get(a), get(b)
+                    if op == _ADD:
+                        value = (x + y) & M
+                    elif op == _SUB:
+                        value = (x - y) & M
+                    elif op == _ASR:
+                        value = x >> y
+                    elif op == _ASL:
+                        value = (x << y) & M
+                    elif op == _AND:
+                        value = x & y
+                    elif op == _OR:
+                        value = x | y
+                    else:
+                        value = x ^ y
+                    dest = c
+                if skip is not None:
+                    value = np.where(skip, get(dest), value)
+                regs[dest] = value
+
+        def per_iteration(value):
+            return np.broadcast_to(value, k.shape)
+
+        # Settings after the last update are carried to the next iteration.
+        trailing = {}
+        for action in actions:
+            if action[0] is None:
+                trailing[action[1]] = action
+            elif action[1] >= 0:
+                trailing.clear()
+        current = {}
+        for event, values in pending.items():
+            if event in trailing:
+                _, _, v0, v1 = trailing[event]
+                values = tuple(
+                    np.concatenate((np.array([value], dtype=np.uint64), per_iteration(v)[:-1]))
+                    for value, v in zip(values, (v0, v1)))
+            current[event] = values
+
+        # durations of iterations
+        if isinstance(t_offset, np.ndarray) and t_offset.ndim:
+            t_start = np.concatenate(([0], np.cumsum(t_offset[:-1], dtype=np.int64))) + t
+            t_end = t + int(np.sum(t_offset, dtype=np.int64))
+        else:
+            t_start = k.astype(np.int64) * int(t_offset) + t
+            t_end = t + n_iterations * int(t_offset)
+
+        emissions = []
+        for action in actions:
+            if action[0] is None:
+                current[action[1]] = action[2:]
+                continue
+            t_offset, event, *args = action
+            if event >= 0:
+                for setting, (v0, v1) in current.items():
+                    emissions.append((t_offset, setting, v0, v1, 0, 0))
+                current.clear()
+            if event != 0:
+                emissions.append((t_offset, abs(event), *args))
+
+        chunk = np.empty((n_iterations, len(emissions)), dtype=EVENT_DTYPE)
+        for j, (t_offset, event, *args) in enumerate(emissions):
+            chunk['time'][:, j] = t_start + np.asarray(t_offset, dtype=np.int64)
+            chunk['event'][:, j] = event
+            for name, value in zip(['arg0', 'arg1', 'arg2', 'arg3'], args):
+                chunk[name][:, j] = value
+
+        pending.clear()
+        for event, (v0, v1) in current.items():
+            pending[event] = (int(per_iteration(v0)[-1]), int(per_iteration(v1)[-1]))
+        for r, value in regs.items():
+            mem[r] = int(per_iteration(value)[-1])
+
+        return chunk.reshape(-1), t_end, n_executed
+
+
+def execute_program(program, condition: bool = False) -> dict[str, ExecutionResult]:
+    '''
+    Executes the compiled programs of all sequencers of a Program.
+    Sequencers without program are not in the result.
+    '''
+    results = {}
+    for name in program.sequence_builders:
+        q1asm = program.q1asm(name)
+        if q1asm is None:
+            continue
+        executor = Q1Executor.from_q1asm(q1asm['program'], condition=condition)
+        results[name] = executor.run()
+    return results
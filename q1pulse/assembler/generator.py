@@ -11,6 +11,8 @@ from dataclasses import dataclass, field
 from .generator_data import GeneratorData
 from .instruction_queue import InstructionQueue, Instruction, PendingUpdate, MIN_WAIT, CLOCK_PERIOD
 from .registers import SequencerRegisters
+from .statistics import ProgramStatistics
+from .rt_budget import check_rt_budget
 from ..lang.math_expressions import get_dtype, Expression, Operand
 from ..lang.generator import GeneratorBase
 from ..lang.register import Register
@@ -18,6 +20,7 @@ from ..lang.exceptions import (
         Q1ValueError, Q1TypeError,
         Q1Exception, Q1CompileError
         )
+from ..util import profiler
 
 logger = logging.getLogger(__name__)
 
@@ -157,6 +160,17 @@ class ConditionalBlockState:
     rt_end_times: list[int] = field(default_factory=list)
 
 
+@dataclass
+class SubroutineState:
+    label: str
+    return_reg: str
+    duration: int = 0
+    n_rt_instructions: int = 0
+    pending_update: bool = False
+    contains_io_instr: bool = False
+    n_calls: int = 0
+
+
 @dataclass
 class LastRtSettings:
     awg_offs_time: int = -1
@@ -170,6 +184,8 @@ class LastRtSettings:
 
 
 class Q1asmGenerator(InstructionQueue, GeneratorBase):
+    check_rt_budget = True
+
     def __init__(self, add_comments=False, list_registers=True,
                  line_numbers=True, comment_arg_conversions=False,
                  optimize=1):
@@ -179,9 +195,14 @@ class Q1asmGenerator(InstructionQueue, GeneratorBase):
         self._show_arg_conversions = comment_arg_conversions
         self._optimize = optimize
         self.q1asm = None
+        self.statistics = None
         self._repetitions = 1
+        self._average_repetitions = False
         self._last_rt_settings = LastRtSettings()
         self._conditional_block_state = None
+        self._subroutines = {}
+        self._subroutine_instructions = []
+        self._main_instructions = None
         self._data = GeneratorData()
         self._registers = SequencerRegisters(self._add_reg_comment if add_comments else None)
         # counter for signed ASR emulation
@@ -199,6 +220,14 @@ class Q1asmGenerator(InstructionQueue, GeneratorBase):
     def repetitions(self, value):
         self._repetitions = value
 
+    @property
+    def average_repetitions(self):
+        return self._average_repetitions
+
+    @average_repetitions.setter
+    def average_repetitions(self, value):
+        self._average_repetitions = value
+
     def start_main(self):
         self._add_rt_command('wait_sync', time=0)
         self._wait_till(100)
@@ -225,6 +254,7 @@ class Q1asmGenerator(InstructionQueue, GeneratorBase):
             self.block_end()
         self._flush_pending_update()
         self._add_instruction('stop')
+        self._instructions += self._subroutine_instructions
 
     def block_start(self):
         # Pending updates of the previous block must be updated now.
@@ -238,6 +268,68 @@ class Q1asmGenerator(InstructionQueue, GeneratorBase):
         # NOTE pending update will move to next block start.
         self._last_rt_settings.clear()
 
+    def start_subroutine(self, name):
+        '''
+        Starts the body of a subroutine. The body is compiled to a separate
+        list of instructions that is added after the end of the program.
+        The time in the subroutine starts at 0.
+        '''
+        state = SubroutineState(f'sub_{name}', self._registers.allocate_reg(f'_return_{name}', log=False))
+        self._subroutines[name] = state
+        self._main_instructions = self._instructions
+        self._instructions = []
+        state.n_rt_instructions = self._n_rt_instructions
+        self._rt_time = 0
+        self._last_rt_command = None
+        self._updating_reg = None
+        self._contains_io_instr = False
+        self.add_comment(f'--SUBROUTINE {name}--')
+        self.set_label(state.label)
+        # updates pending at the call are done at the start of the subroutine.
+        self.block_start()
+
+    def end_subroutine(self, name, duration):
+        state = self._subroutines[name]
+        self._wait_till(duration)
+        if self._pending_update is not None:
+            # the update at the end of the subroutine is done after the return.
+            state.pending_update = True
+            self._pending_update = None
+        self.block_end()
+        self.jmp(state.return_reg)
+        state.duration = duration
+        state.n_rt_instructions = self._n_rt_instructions - state.n_rt_instructions
+        state.contains_io_instr = self._contains_io_instr
+        self._n_rt_instructions -= state.n_rt_instructions
+        self._subroutine_instructions += self._instructions
+        self._instructions = self._main_instructions
+        self._main_instructions = None
+        self._rt_time = 0
+        self._last_rt_command = None
+        self._updating_reg = None
+        # registers used in the subroutine may not be used by the caller.
+        self._registers.reserve_used_registers()
+
+    def call_subroutine(self, time, name):
+        state = self._subroutines[name]
+        self._wait_till(time)
+        # updates pending at time are done at the start of the subroutine.
+        self._pending_update = None
+        self.block_end()
+        state.n_calls += 1
+        return_label = f'ret_{name}_{state.n_calls}'
+        self.move('@'+return_label, state.return_reg)
+        self.jmp('@'+state.label)
+        self.set_label(return_label)
+        self._rt_time = time + state.duration
+        self._n_rt_instructions += state.n_rt_instructions
+        self._last_rt_command = None
+        self._updating_reg = None
+        if state.contains_io_instr:
+            self._contains_io_instr = True
+        if state.pending_update:
+            self._pending_update = PendingUpdate(len(self._instructions), self._rt_time)
+
     def enter_conditional(self, time):
         self._flush_pending_update()
         self._wait_till(time)
@@ -434,7 +526,8 @@ class Q1asmGenerator(InstructionQueue, GeneratorBase):
         offset0, offset1 = self._both_reg_or_imm(offset0, offset1)
         last_rt_settings = self._last_rt_settings
         if last_rt_settings.awg_offs_time == time:
-            self.add_comment(f'-- Overwrites set_awg_offs at {time} --')
+            if self.add_comments:
+                self.add_comment(f'-- Overwrites set_awg_offs at {time} --')
             self._overwrite_rt_setting(last_rt_settings.awg_offs_instr)
         instr = self._add_rt_setting('set_awg_offs', offset0, offset1,
                                      time=time)
@@ -447,7 +540,8 @@ class Q1asmGenerator(InstructionQueue, GeneratorBase):
         gain0, gain1 = self._both_reg_or_imm(gain0, gain1)
         last_rt_settings = self._last_rt_settings
         if last_rt_settings.awg_gain_time == time:
-            self.add_comment(f'-- Overwrites set_awg_gain at {time} --')
+            if self.add_comments:
+                self.add_comment(f'-- Overwrites set_awg_gain at {time} --')
             self._overwrite_rt_setting(last_rt_settings.awg_gain_instr)
         instr = self._add_rt_setting('set_awg_gain', gain0, gain1,
                                      time=time)
@@ -758,6 +852,9 @@ class Q1asmGenerator(InstructionQueue, GeneratorBase):
         return lines
 
     def assemble(self, listing=False, json_output=False, filename=None):
+        self.statistics = self._get_statistics()
+        if Q1asmGenerator.check_rt_budget:
+            self.statistics.rt_budget_violations = check_rt_budget(self._init_section + self._instructions)
         if listing:
             self._save_prog_and_data_txt(filename.replace('.json', '.q1asm'))
         if self._optimize > 0 and not self._contains_io_instr:
@@ -769,7 +866,28 @@ class Q1asmGenerator(InstructionQueue, GeneratorBase):
             d['program'] = self._q1asm_prog(compact=True)
             self.q1asm = d
             if json_output:
-                self._save_prog_and_data_json(filename)
+                with profiler.span("serialize"):
+                    self._save_prog_and_data_json(filename)
+
+    def _get_statistics(self):
+        stats = ProgramStatistics(
+            n_rt_instructions=self._n_rt_instructions,
+            n_wait_loops=self._wait_loop_cnt,
+            n_registers=self._registers.max_stack_ptr,
+            n_waveforms=len(self._data.waveforms),
+            waveform_memory=self._data._size_waveforms,
+            n_weights=len(self._data.weights),
+            weight_memory=self._data._size_weights,
+            )
+        for i in self._init_section + self._instructions:
+            if isinstance(i, str) or i.mnemonic is None or i.overwritten:
+                continue
+            stats.n_instructions += 1
+            if i.mnemonic == 'nop':
+                stats.n_nops += 1
+            elif i.mnemonic == 'upd_param':
+                stats.n_upd_params += 1
+        return stats
 
     def _q1asm_prog(self, compact=False):
         return '\n'.join(self.q1asm_lines(compact))
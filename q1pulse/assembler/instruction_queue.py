@@ -46,6 +46,7 @@ class InstructionQueue:
         self._pending_update = None
         self._last_rt_command = None
         self._n_rt_instructions = 0
+        self._n_q1_instructions = 0
         self._updating_reg = None
 
     def add_comment(self, line, init_section=False):
@@ -66,6 +67,7 @@ class InstructionQueue:
     def __append_instruction(self, instruction):
         self._wait_register_updates(instruction)
         self._instructions.append(instruction)
+        self._n_q1_instructions += 1
 
     def _add_reg_instruction(self, mnemonic, *args, init_section=False):
         if self._reg_comment:
@@ -76,6 +78,7 @@ class InstructionQueue:
         instruction = Instruction(mnemonic, args, comment=comment)
         if init_section:
             self._init_section.append(instruction)
+            self._n_q1_instructions += 1
             return
         self.__append_instruction(instruction)
         self._updating_reg = args[-1]
@@ -170,6 +173,7 @@ class InstructionQueue:
                 comment = None
             instruction = Instruction('upd_param',  wait_after=wait_after, comment=comment)
             self._instructions.insert(pending_update.index, instruction)
+            self._n_q1_instructions += 1
             self._n_rt_instructions += 1
             self._pending_update = None
             self._last_rt_command = instruction
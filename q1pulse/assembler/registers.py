@@ -11,6 +11,7 @@ class SequencerRegisters:
         self._allocated_regs = {}
         # stack for registers allcated in scope
         self._stack_ptr = 0
+        self.max_stack_ptr = 0
         self._scope = []
         self.enter_scope()
 
@@ -42,6 +43,12 @@ class SequencerRegisters:
         for reg_name in named:
             del self._allocated_regs[reg_name]
 
+    def reserve_used_registers(self):
+        '''
+        Prevents reuse of all registers that have been used till now.
+        '''
+        self._stack_ptr = self.max_stack_ptr
+
     @contextmanager
     def temp_regs(self, n):
         self.enter_scope()
@@ -56,6 +63,7 @@ class SequencerRegisters:
         self._stack_ptr += 1
         if self._stack_ptr >= SequencerRegisters.stack_size:
             raise Q1MemoryError('Stack overflow')
+        self.max_stack_ptr = max(self.max_stack_ptr, self._stack_ptr)
         reg_name = f'R{reg_nr}'
         if name:
             self._scope[-1][1][name] = reg_name
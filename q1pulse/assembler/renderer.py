@@ -0,0 +1,200 @@
+'''
+Renders the output of compiled Q1 programs to sampled arrays with 1 ns resolution.
+
+The renderer uses the real-time events of the executor and the waveforms of
+the compiled program. The output per sample is the AWG output of path 0 and 1
+and the marker bits, i.e. the output before NCO modulation and mixer.
+The values are 16 bit integers like in the sequencer:
+`offset + (gain * waveform) >> 15`.
+
+The output is rendered in chunks of `chunk_size` ns to limit the memory
+usage of long programs. The output can be written to memory-mapped .npy files.
+
+Example:
+    p.compile()
+    outputs = render_program(p, directory='rendered')
+    plt.plot(outputs['P1']['path0'])
+
+    # compare with output of other q1pulse version
+    reference = np.load('reference/P1.npy', mmap_mode='r')
+    print(first_difference(outputs['P1'], reference))
+'''
+import os
+
+import numpy as np
+
+from .executor import ExecutionResult, RtEvent, execute_program
+from ..lang.exceptions import Q1ExecutionError
+
+OUTPUT_DTYPE = np.dtype([
+    ('path0', np.int16),
+    ('path1', np.int16),
+    ('marker', np.uint8),
+    ])
+
+CHUNK_SIZE = 1_000_000
+'''Number of samples rendered at once.'''
+
+_DEFAULT_GAIN = 32767
+
+
+def waveform_memory(waveforms: dict[str, dict]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    Converts the waveforms of a compiled program to 16 bit samples in a
+    contiguous memory.
+
+    Args:
+        waveforms: waveforms as in the compiled program, {name: {'data': ..., 'index': ...}}
+
+    Returns:
+        memory, start per waveform index, length per waveform index.
+        Length is -1 for unused waveform indices.
+    '''
+    n_waves = max((wave['index'] for wave in waveforms.values()), default=-1) + 1
+    starts = np.zeros(n_waves, dtype=np.int64)
+    lengths = np.full(n_waves, -1, dtype=np.int64)
+    data = []
+    size = 0
+    for wave in waveforms.values():
+        samples = np.asarray(wave['data'], dtype=float)
+        index = wave['index']
+        starts[index] = size
+        lengths[index] = len(samples)
+        size += len(samples)
+        data.append((samples * 2**15).astype(np.int32))
+    memory = np.concatenate(data) if data else np.zeros(0, dtype=np.int32)
+    return memory, starts, lengths
+
+
+def render(result: ExecutionResult,
+           waveforms: dict[str, dict],
+           t_stop: int | None = None,
+           out: np.ndarray | None = None,
+           chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    '''
+    Renders the output of a sequencer from the real-time events.
+
+    Args:
+        result: execution result of the sequencer.
+        waveforms: waveforms of the compiled program.
+        t_stop: end of the rendered output [ns]. Default is the end time of the program.
+        out: array with dtype OUTPUT_DTYPE to write the output to, e.g. a memmap.
+            The output is rendered till the end of `out`.
+        chunk_size: number of samples rendered at once.
+
+    Returns:
+        array with dtype OUTPUT_DTYPE and 1 sample per ns.
+    '''
+    if out is None:
+        if t_stop is None:
+            t_stop = result.end_time
+        out = np.zeros(t_stop, dtype=OUTPUT_DTYPE)
+    t_stop = len(out)
+
+    events = result.events
+    offsets = events[events['event'] == RtEvent.OFFSET]
+    gains = events[events['event'] == RtEvent.GAIN]
+    markers = events[events['event'] == RtEvent.MARKER]
+    plays = events[events['event'] == RtEvent.PLAY]
+
+    memory, wave_starts, wave_lengths = waveform_memory(waveforms)
+    wave_indices = np.concatenate([plays['arg0'], plays['arg1']])
+    valid = wave_indices < len(wave_lengths)
+    valid[valid] = wave_lengths[wave_indices[valid]] >= 0
+    if not np.all(valid):
+        raise Q1ExecutionError(f'Invalid waveform index {wave_indices[~valid][0]}')
+
+    play_index = np.arange(len(plays))
+    for t0 in range(0, t_stop, chunk_size):
+        t1 = min(t0 + chunk_size, t_stop)
+        chunk = out[t0:t1]
+        chunk['marker'] = _step_values(markers['time'], markers['arg0'], 0, t0, t1)
+        # index of the last play per sample
+        if len(plays):
+            i_play = _step_values(plays['time'], play_index, -1, t0, t1)
+            playing = i_play >= 0
+            t_wave = np.arange(t0, t1) - plays['time'][i_play]
+        for path, arg in enumerate(['arg0', 'arg1']):
+            offset = _step_values(offsets['time'], offsets[arg], 0, t0, t1)
+            output = offset.astype(np.int32)
+            if len(plays):
+                wave = plays[arg][i_play]
+                active = playing & (t_wave < wave_lengths[wave])
+                gain = _step_values(gains['time'], gains[arg], _DEFAULT_GAIN, t0, t1)
+                samples = memory[wave_starts[wave[active]] + t_wave[active]]
+                output[active] += (gain[active] * samples) >> 15
+            # the output saturates
+            np.clip(output, -32768, 32767, out=output)
+            chunk[f'path{path}'] = output.astype(np.int16)
+    return out
+
+
+def render_program(program,
+                   condition: bool = False,
+                   t_stop: int | None = None,
+                   directory: str | None = None,
+                   chunk_size: int = CHUNK_SIZE) -> dict[str, np.ndarray]:
+    '''
+    Renders the output of all sequencers of a compiled Program.
+    Sequencers without program are not in the result.
+
+    Args:
+        program: compiled program.
+        condition: result of conditions set with set_cond. See `Q1Executor`.
+        t_stop: end of the rendered output [ns]. Default is the end time of the
+            longest sequencer program.
+        directory: if not None, the output is written to memory-mapped
+            files '<directory>/<sequencer>.npy'.
+        chunk_size: number of samples rendered at once.
+
+    Returns:
+        output per sequencer with dtype OUTPUT_DTYPE.
+    '''
+    results = execute_program(program, condition=condition)
+    if t_stop is None:
+        t_stop = max((result.end_time for result in results.values()), default=0)
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+
+    outputs = {}
+    for name, result in results.items():
+        if directory is not None:
+            out = np.lib.format.open_memmap(os.path.join(directory, f'{name}.npy'),
+                                            mode='w+', dtype=OUTPUT_DTYPE, shape=(t_stop,))
+        else:
+            out = np.zeros(t_stop, dtype=OUTPUT_DTYPE)
+        outputs[name] = render(result, program.q1asm(name)['waveforms'], out=out,
+                               chunk_size=chunk_size)
+    return outputs
+
+
+def first_difference(output1: np.ndarray, output2: np.ndarray,
+                     chunk_size: int = CHUNK_SIZE) -> int | None:
+    '''
+    Returns the time of the first difference between two rendered outputs,
+    or None if the outputs are equal.
+    Outputs with different length differ at the end of the shortest output.
+    '''
+    n = min(len(output1), len(output2))
+    for t0 in range(0, n, chunk_size):
+        t1 = min(t0 + chunk_size, n)
+        different = output1[t0:t1] != output2[t0:t1]
+        if np.any(different):
+            return t0 + int(np.argmax(different))
+    if len(output1) != len(output2):
+        return n
+    return None
+
+
+def _step_values(times: np.ndarray, values: np.ndarray, initial: int,
+                 t0: int, t1: int) -> np.ndarray:
+    '''
+    Returns the values per ns in [t0, t1) of a step function that changes
+    value at `times`. `times` must be sorted.
+    '''
+    i0 = np.searchsorted(times, t0, side='right')
+    i1 = np.searchsorted(times, t1, side='left')
+    start_value = values[i0-1] if i0 > 0 else initial
+    segment_values = np.concatenate([np.array([start_value], dtype=values.dtype), values[i0:i1]])
+    bounds = np.concatenate([[t0], times[i0:i1], [t1]])
+    return np.repeat(segment_values, np.diff(bounds))
@@ -0,0 +1,114 @@
+'''
+Static check of the real-time budget of loops.
+
+The Q1 processor executes every instruction in 4 ns and queues the real-time
+instructions for the real-time executor. The real-time executor stalls with
+`SEQUENCE PROCESSOR RT EXEC COMMAND UNDERFLOW` when the queue is empty.
+The queue fills up in sections where the real-time instructions take more time
+than the Q1 instructions, but a loop body that executes more Q1 instructions
+than its real-time duration drains the queue with every iteration.
+
+The check estimates the Q1 time and the real-time duration of every loop body,
+i.e. the instructions from a label to a jump back to this label.
+The execution path of an array loop via its jump table is followed.
+The instructions of a called subroutine are added to the loop body.
+Loop bodies with a wait on a register time are skipped, because the
+real-time duration is unknown.
+
+Note:
+    All branches of a conditional block are counted in the real-time duration.
+'''
+from dataclasses import dataclass
+
+from .instruction_queue import Instruction, CLOCK_PERIOD
+
+Q1_INSTRUCTION_TIME = CLOCK_PERIOD
+
+
+@dataclass
+class RtBudgetViolation:
+    label: str
+    line_nr: int
+    '''Line number of first instruction of the loop body.'''
+    q1_time: int
+    '''Execution time of the Q1 instructions in the loop body [ns].'''
+    rt_time: int
+    '''Duration of the real-time instructions in the loop body [ns].'''
+
+    def __str__(self):
+        return (f"loop '{self.label}' (L{self.line_nr:04}): "
+                f"Q1 instructions {self.q1_time} ns > real-time {self.rt_time} ns")
+
+
+def _rt_duration(instruction: Instruction) -> int | None:
+    '''Returns real-time duration of instruction or None if unknown.'''
+    if instruction.wait_after is not None:
+        return instruction.wait_after
+    if instruction.mnemonic == 'wait':
+        duration = instruction.args[0]
+        return duration if isinstance(duration, int) else None
+    return 0
+
+
+def _is_call(instruction: Instruction) -> bool:
+    return instruction.mnemonic == 'jmp' and str(instruction.args[0]).startswith('@sub_')
+
+
+def _add_subroutines(body: list[Instruction], program: list[Instruction], labels: dict[str, int]) -> list[Instruction]:
+    '''Returns the body with the instructions of the called subroutines till the return jump.'''
+    result = []
+    for i in body:
+        result.append(i)
+        if _is_call(i):
+            start = labels[i.args[0][1:]]
+            end = start
+            while program[end].mnemonic != 'jmp' or _is_call(program[end]):
+                end += 1
+            result += _add_subroutines(program[start:end+1], program, labels)
+    return result
+
+
+def check_rt_budget(instructions: list[Instruction | str]) -> list[RtBudgetViolation]:
+    '''
+    Returns loop bodies where the execution of the Q1 instructions takes more
+    time than the real-time instructions.
+    '''
+    # executed instructions without comments, labels and overwritten instructions.
+    program = []
+    labels = {}
+    for i in instructions:
+        if isinstance(i, str) or i.overwritten:
+            continue
+        if i.mnemonic is None:
+            labels[i.label] = len(program)
+            continue
+        program.append(i)
+
+    violations = []
+    checked = set()
+    for index, i in enumerate(program):
+        if i.mnemonic not in ('jmp', 'loop', 'jlt', 'jge'):
+            continue
+        target = i.args[-1]
+        if not isinstance(target, str) or not target.startswith('@') or _is_call(i):
+            continue
+        label = target[1:]
+        start = labels[label]
+        if start > index or label in checked:
+            continue
+        checked.add(label)
+        body = program[start:index+1]
+        # follow a jump out of the loop body and back via a jump table.
+        jumps = [n for n, instr in enumerate(body[:-1]) if instr.mnemonic == 'jmp' and not _is_call(instr)]
+        if jumps:
+            body = body[:jumps[0]+1] + body[jumps[-1]+1:]
+        body = _add_subroutines(body, program, labels)
+        durations = [_rt_duration(instr) for instr in body]
+        if None in durations:
+            continue
+        q1_time = len(body) * Q1_INSTRUCTION_TIME
+        rt_time = sum(durations)
+        if q1_time > rt_time:
+            # line numbers start at 1
+            violations.append(RtBudgetViolation(label, start+1, q1_time, rt_time))
+    return violations
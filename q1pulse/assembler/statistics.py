@@ -0,0 +1,49 @@
+from dataclasses import dataclass, field
+
+from .registers import SequencerRegisters
+from .rt_budget import RtBudgetViolation
+from ..util.q1configuration import Q1Configuration
+
+
+@dataclass
+class ProgramStatistics:
+    """Size and resource usage of an assembled sequencer program."""
+    n_instructions: int = 0
+    """Number of Q1 instructions in the program."""
+    n_rt_instructions: int = 0
+    """Number of real-time instructions, including the iterations of wait loops."""
+    n_nops: int = 0
+    """Number of NOPs inserted to wait for register updates."""
+    n_wait_loops: int = 0
+    """Number of wait loops for long waits and waits with register time."""
+    n_upd_params: int = 0
+    """Number of upd_param instructions."""
+    n_registers: int = 0
+    """Peak number of registers in use."""
+    n_waveforms: int = 0
+    waveform_memory: int = 0
+    """Number of waveform samples."""
+    n_weights: int = 0
+    weight_memory: int = 0
+    """Number of acquisition weight samples."""
+    rt_budget_violations: list[RtBudgetViolation] = field(default_factory=list)
+    """Loops with more Q1 instruction time than real-time duration."""
+
+    @property
+    def waveform_memory_usage(self) -> float:
+        """Fraction of waveform memory used."""
+        return self.waveform_memory / Q1Configuration.WAVEFORM_MEM_SIZE
+
+    @property
+    def weight_memory_usage(self) -> float:
+        """Fraction of acquisition weight memory used."""
+        return self.weight_memory / Q1Configuration.WEIGHTS_MEM_SIZE
+
+    def __str__(self):
+        return (f"instructions:{self.n_instructions} (rt:{self.n_rt_instructions}, "
+                f"nop:{self.n_nops}, upd_param:{self.n_upd_params}), "
+                f"wait loops:{self.n_wait_loops}, "
+                f"registers:{self.n_registers}/{SequencerRegisters.stack_size}, "
+                f"waveforms:{self.n_waveforms} ({self.waveform_memory_usage:.1%}), "
+                f"weights:{self.n_weights} ({self.weight_memory_usage:.1%}), "
+                f"rt budget violations:{len(self.rt_budget_violations)}")
@@ -1,11 +1,17 @@
+import concurrent.futures
+import contextlib
 import json
 import os
+import threading
 import time
 import logging
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from typing import Any, Iterator
 
+import numpy as np
 
 from q1pulse.program import Program
 from q1pulse.lang.exceptions import Q1InputOverloaded, Q1InternalError
@@ -14,8 +20,11 @@ from q1pulse.sequencer.control import ControlBuilder
 from q1pulse.sequencer.readout import ReadoutBuilder
 from q1pulse.turbo_cluster import TurboCluster
 from q1pulse.modules.modules import QcmModule, QrmModule, QbloxModule, Sequencer
-from q1pulse.modules.sequencer_states import translate_seq_status
+from q1pulse.modules.acquisition_data import reduce_bins
+from q1pulse.modules.sequencer_states import parse_sequencer_status
+from q1pulse.util import profiler
 from q1pulse.util.delayedkeyboardinterrupt import DelayedKeyboardInterrupt
+from q1pulse.util.poll_scheduler import PollScheduler, PollStatistics
 from q1pulse.util.qblox_version import check_qblox_instrument_version
 
 logger = logging.getLogger(__name__)
@@ -25,6 +34,9 @@ class Q1Instrument:
     verbose = False
     concurrent_communication = True
     ignore_acq_binning_done = False
+    stream_max_fetches = 4
+    '''Maximum number of times the bins are retrieved by `stream_acquisition_bins`
+    while the sequencer is running.'''
 
     # Postpone error checking till the end to save communication overhead.
     # System errors are only reported for SCPI errors. It's higly unlikely to
@@ -34,7 +46,7 @@ class Q1Instrument:
 
     _exception_on_overload = True
 
-    def __init__(self, path=None, add_traceback=True):
+    def __init__(self, path=None, add_traceback=True, add_comments=True):
         check_qblox_instrument_version()
         if path:
             self.path = path
@@ -50,7 +62,15 @@ class Q1Instrument:
         self.readouts: dict[int, Sequencer] = {}
         self._loaded_q1asm: dict[str, dict] = {}
         self._loaded_program_uuid = None
+        self._t_start = time.perf_counter()
+        self._expected_duration = 0.0
+        self._repetitions_averaged = False
+        self.poll_statistics = PollStatistics()
+        '''Statistics of the status polling of the last `wait_stopped`.'''
+        self._executor: ThreadPoolExecutor | None = None
+        self._reduction_executor: ThreadPoolExecutor | None = None
         SequenceBuilder.add_traceback_to_instructions = add_traceback
+        SequenceBuilder.add_comments = add_comments
 
     def add_qcm(self, module):
         logger.info(f"Add {module.name}")
@@ -155,128 +175,162 @@ class Q1Instrument:
                 # Errors will be checked before start of the sequence.
                 instrument._debug = 2
 
-        sequencers = {**self.controllers, **self.readouts}
+        sequencers = self._sequencers_per_instrument({**self.controllers, **self.readouts})
+        self._run_per_instrument(self._upload, sequencers, program)
 
-        # sort on (seq_num, slot)
-        sequencers = dict(sorted(sequencers.items(),
-                                 key=lambda kv: (kv[1].seq_nr, self.modules[kv[1].module_name].slot_idx)))
+        # TODO @@@@ Check errors? This gives some delay!
+
+        t = (time.perf_counter() - t_start) * 1000
+        logger.info(f"Duration (async) upload: ({t:5.3f}ms)")
+
+        self._loaded_program_uuid = program.uuid
 
+    def _upload(self, instrument, sequencers: dict[str, Sequencer], program):
         for name, seq in sequencers.items():
             module = self.modules[seq.module_name]
-            with DelayedKeyboardInterrupt("upload sequences"):
+            with DelayedKeyboardInterrupt("upload sequences"), profiler.span("upload", name):
                 q1asm = program.q1asm(name)
                 self._loaded_q1asm[name] = q1asm
                 if q1asm is None:
                     continue
                 module.upload(seq.seq_nr, q1asm)
 
-        # TODO @@@@ Check errors? This gives some delay!
-
-        t = (time.perf_counter() - t_start) * 1000
-        logger.info(f"Duration (async) upload: ({t:5.3f}ms)")
-
-        self._loaded_program_uuid = program.uuid
-
     def start_program(self, program):
         if program.uuid != self._loaded_program_uuid:
             self.load_program(program)
 
         t_start = time.perf_counter()
 
-        for instrument in self.root_instruments:
-            with DelayedKeyboardInterrupt("check status"):
-                check_instrument_status(instrument)
-
-        instruments_with_sequence = set()
-        sequencers = {**self.controllers, **self.readouts}
-        n_configured = 0
-
-        # sort on (seq_num, slot)
-        sequencers = dict(sorted(sequencers.items(),
-                                 key=lambda kv: (kv[1].seq_nr, self.modules[kv[1].module_name].slot_idx)))
-
-        for name, seq in sequencers.items():
-            t_start_seq = time.perf_counter()
-            module = self.modules[seq.module_name]
-            with DelayedKeyboardInterrupt("configure sequencers"):
-                q1asm = program.q1asm(name)
-                self._loaded_q1asm[name] = q1asm
-                if q1asm is None:
-                    module.disable_seq(seq)
-                    module.set_awg_offsets(seq.seq_nr, 0.0, 0.0)
-                    logger.debug(f"Sequencer {name} no sequence")
-                    continue
-                n_configured += 1
-                instruments_with_sequence.add(module.root_instrument)
-                module.set_label(seq.seq_nr, name)
-                # module.upload(seq.seq_nr, q1asm) @@@ Already loaded.
-                module.invalidate_cache(seq.seq_nr, "offset_awg_path0")
-                module.invalidate_cache(seq.seq_nr, "offset_awg_path1")
-                module.enable_seq(seq)
-                prog_seq = program[name]
-                module.set_nco(seq.seq_nr, prog_seq.nco_frequency)
-                if prog_seq.modifies_frequency:
-                    module.invalidate_cache(seq.seq_nr, "nco_freq")
-                if prog_seq.mixer_gain_ratio is not None:
-                    module.set_mixer_gain_ratio(seq.seq_nr, prog_seq.mixer_gain_ratio)
-                if prog_seq.mixer_phase_offset_degree is not None:
-                    module.set_mixer_phase_offset_degree(seq.seq_nr, prog_seq.mixer_phase_offset_degree)
-                # configure trigger counters
-                for counter in prog_seq.trigger_counters:
-                    module.configure_trigger_counter(seq.seq_nr, counter.trigger.address,
-                                                     counter.threshold, counter.invert)
-            if Q1Instrument.verbose:
-                duration = time.perf_counter() - t_start_seq
-                logger.debug(f"Configured {name} in {duration*1000.0:3.1f} ms")
+        sequencers = self._sequencers_per_instrument({**self.controllers, **self.readouts})
+        # All instruments are configured and armed before the first sequencer is started.
+        self._run_per_instrument(self._configure_instrument, sequencers, program)
+        self._start_instruments(list(sequencers))
+        self._expected_duration = program.duration * 1e-9
+        self._repetitions_averaged = program.repetitions > 1 and program.average_repetitions
 
-        for name, seq in self.readouts.items():
-            t_start_seq = time.perf_counter()
-            module = self.modules[seq.module_name]
-            if not module.enabled(seq.seq_nr):
-                continue
-            with DelayedKeyboardInterrupt("configure readout"):
-                readout = program[name]
-                module.thresholded_acq_rotation(seq.seq_nr, readout.thresholded_acq_rotation)
-                module.thresholded_acq_threshold(seq.seq_nr, readout.thresholded_acq_threshold)
-                module.integration_length_acq(seq.seq_nr, int(readout.integration_length_acq))
-                module.nco_prop_delay(seq.seq_nr, int(readout.nco_prop_delay))
-                module.delete_acquisition_data(seq.seq_nr)
-                trigger = readout.trigger
-                if trigger is not None:
-                    module.set_trigger(seq.seq_nr, trigger.address, trigger.invert)
-                else:
-                    module.set_trigger(seq.seq_nr, None)
-                module.set_ttl(
-                    seq.seq_nr,
-                    readout.ttl_acq_input_select,
-                    readout.ttl_acq_threshold,
-                    readout.ttl_acq_auto_bin_incr_en
-                    )
+        t = (time.perf_counter() - t_start) * 1000
+        logger.info(f"Duration upload/start: ({t:5.3f}ms)")
 
-            if Q1Instrument.verbose:
-                duration = time.perf_counter() - t_start_seq
-                logger.debug(f"Configured QRM {name} in {duration*1000.0:3.1f} ms")
+    def _set_start_time(self):
+        self._t_start = time.perf_counter()
 
-        with DelayedKeyboardInterrupt("arm and start"):
-            t_start_arm = time.perf_counter()
-            # Note: arm per sequencer. Arm on the cluster still gives red leds on the modules.
-            for module in self.modules.values():
-                module.arm_sequencers()
-            if Q1Instrument.verbose:
-                duration = time.perf_counter() - t_start_arm
-                logger.debug(f"Armed {n_configured} sequencers in {duration*1000.0:3.1f} ms")
+    def _configure_instrument(self, instrument, sequencers: dict[str, Sequencer], program):
+        """Configures and arms the sequencers of a root instrument."""
+        with DelayedKeyboardInterrupt("check status"):
+            check_instrument_status(instrument)
 
-            # Error check implicitly waits for the module to process all previous commands.
-            # Exclude CMM (slot=0)
-            self.check_system_errors(exclude=[0])
+        modules = self._instrument_modules(instrument)
+        n_configured = 0
 
-            for module in self.modules.values():
-                module.start_sequencers()
-            self.check_system_errors()
-            self._t_start = time.perf_counter()
+        # Commands are sent per module in a single operation before the first request.
+        with self._command_batch(instrument):
+            for name, seq in sequencers.items():
+                t_start_seq = time.perf_counter()
+                module = self.modules[seq.module_name]
+                with DelayedKeyboardInterrupt("configure sequencers"), profiler.span("configure", name):
+                    q1asm = program.q1asm(name)
+                    self._loaded_q1asm[name] = q1asm
+                    if q1asm is None:
+                        module.disable_seq(seq)
+                        module.set_awg_offsets(seq.seq_nr, 0.0, 0.0)
+                        logger.debug(f"Sequencer {name} no sequence")
+                        continue
+                    n_configured += 1
+                    module.set_label(seq.seq_nr, name)
+                    # module.upload(seq.seq_nr, q1asm) @@@ Already loaded.
+                    module.invalidate_cache(seq.seq_nr, "offset_awg_path0")
+                    module.invalidate_cache(seq.seq_nr, "offset_awg_path1")
+                    module.enable_seq(seq)
+                    prog_seq = program[name]
+                    module.set_nco(seq.seq_nr, prog_seq.nco_frequency)
+                    if prog_seq.modifies_frequency:
+                        module.invalidate_cache(seq.seq_nr, "nco_freq")
+                    if prog_seq.mixer_gain_ratio is not None:
+                        module.set_mixer_gain_ratio(seq.seq_nr, prog_seq.mixer_gain_ratio)
+                    if prog_seq.mixer_phase_offset_degree is not None:
+                        module.set_mixer_phase_offset_degree(seq.seq_nr, prog_seq.mixer_phase_offset_degree)
+                    # configure trigger counters
+                    for counter in prog_seq.trigger_counters:
+                        module.configure_trigger_counter(seq.seq_nr, counter.trigger.address,
+                                                         counter.threshold, counter.invert)
+                if Q1Instrument.verbose:
+                    duration = time.perf_counter() - t_start_seq
+                    logger.debug(f"Configured {name} in {duration*1000.0:3.1f} ms")
 
-        t = (time.perf_counter() - t_start) * 1000
-        logger.info(f"Duration upload/start: ({t:5.3f}ms)")
+            for name, seq in sequencers.items():
+                if name not in self.readouts:
+                    continue
+                t_start_seq = time.perf_counter()
+                module = self.modules[seq.module_name]
+                if not module.enabled(seq.seq_nr):
+                    continue
+                with DelayedKeyboardInterrupt("configure readout"), profiler.span("configure", name):
+                    readout = program[name]
+                    module.thresholded_acq_rotation(seq.seq_nr, readout.thresholded_acq_rotation)
+                    module.thresholded_acq_threshold(seq.seq_nr, readout.thresholded_acq_threshold)
+                    module.integration_length_acq(seq.seq_nr, int(readout.integration_length_acq))
+                    module.nco_prop_delay(seq.seq_nr, int(readout.nco_prop_delay))
+                    module.delete_acquisition_data(seq.seq_nr)
+                    trigger = readout.trigger
+                    if trigger is not None:
+                        module.set_trigger(seq.seq_nr, trigger.address, trigger.invert)
+                    else:
+                        module.set_trigger(seq.seq_nr, None)
+                    module.set_ttl(
+                        seq.seq_nr,
+                        readout.ttl_acq_input_select,
+                        readout.ttl_acq_threshold,
+                        readout.ttl_acq_auto_bin_incr_en
+                        )
+
+                if Q1Instrument.verbose:
+                    duration = time.perf_counter() - t_start_seq
+                    logger.debug(f"Configured QRM {name} in {duration*1000.0:3.1f} ms")
+
+            with DelayedKeyboardInterrupt("arm"):
+                with profiler.span("arm", instrument=instrument.name):
+                    t_start_arm = time.perf_counter()
+                    # Note: arm per sequencer. Arm on the cluster still gives red leds on the modules.
+                    for module in modules:
+                        module.arm_sequencers()
+                    if Q1Instrument.verbose:
+                        duration = time.perf_counter() - t_start_arm
+                        logger.debug(f"Armed {n_configured} sequencers in {duration*1000.0:3.1f} ms")
+
+                    # Error check implicitly waits for the module to process all previous commands.
+                    # Exclude CMM (slot=0)
+                    self._raise_system_errors(self._get_system_errors(instrument, exclude=[0]))
+
+    def _start_instruments(self, instruments: list):
+        """Starts the sequencers of all instruments.
+        The start time of the program is recorded when the first sequencer is started.
+        """
+        if self._runs_in_parallel(len(instruments)):
+            # The threads wait on the barrier to start the instruments at the same time.
+            start_barrier = threading.Barrier(len(instruments), action=self._set_start_time)
+            self._run_per_instrument(self._start_instrument, {instrument: () for instrument in instruments},
+                                     start_barrier)
+            return
+
+        with DelayedKeyboardInterrupt("start"):
+            self._set_start_time()
+            for instrument in instruments:
+                with profiler.span("start", instrument=instrument.name):
+                    for module in self._instrument_modules(instrument):
+                        module.start_sequencers()
+            for instrument in instruments:
+                self._raise_system_errors(self._get_system_errors(instrument))
+
+    def _start_instrument(self, instrument, start_barrier: threading.Barrier):
+        with DelayedKeyboardInterrupt("start"):
+            start_barrier.wait()
+            with profiler.span("start", instrument=instrument.name):
+                for module in self._instrument_modules(instrument):
+                    module.start_sequencers()
+            self._raise_system_errors(self._get_system_errors(instrument))
+
+    def _instrument_modules(self, instrument) -> list[QbloxModule]:
+        return [module for module in self.modules.values() if module.root_instrument is instrument]
 
     def wait_stopped(self, timeout_minutes: float = 1):
         try:
@@ -292,7 +346,34 @@ class Q1Instrument:
                     continue
                 active_sequencers.append((module, seq))
 
-            statuses = self._get_sequencer_status_multiple(active_sequencers, timeout_minutes)
+            instrument_sequencers: dict[Any, tuple[list[tuple[QbloxModule, Sequencer]], PollScheduler]] = {}
+            for module, seq in active_sequencers:
+                if module.root_instrument not in instrument_sequencers:
+                    poll_scheduler = PollScheduler(self._t_start, self._expected_duration, timeout_minutes*60.0)
+                    instrument_sequencers[module.root_instrument] = ([], poll_scheduler)
+                instrument_sequencers[module.root_instrument][0].append((module, seq))
+            poll_schedulers = [poll_scheduler for _, poll_scheduler in instrument_sequencers.values()]
+
+            def abort_polling():
+                for poll_scheduler in poll_schedulers:
+                    poll_scheduler.abort()
+
+            def poll(instrument, active_sequencers, poll_scheduler):
+                with profiler.span("poll", instrument=instrument.name):
+                    return self._get_sequencer_status_multiple(active_sequencers, poll_scheduler)
+
+            results = self._run_per_instrument(
+                poll,
+                instrument_sequencers,
+                on_abort=abort_polling,
+                )
+            self.poll_statistics = PollStatistics.combine([poll_scheduler.statistics
+                                                           for poll_scheduler in poll_schedulers])
+            active_sequencers = []
+            statuses = []
+            for instrument, (instrument_active_sequencers, _) in instrument_sequencers.items():
+                active_sequencers += instrument_active_sequencers
+                statuses += results[instrument]
             for (module, seq), status in zip(active_sequencers, statuses):
                 # status = self._get_sequencer_status(module, seq.seq_nr, timeout_minutes)
                 if "ACQ BINNING DONE" in status.debug_msgs:
@@ -319,6 +400,8 @@ class Q1Instrument:
                 raise Exception(f"Q1 failures (see logging):\n {errors}")
             duration = time.perf_counter() - self._t_start
             logger.debug(f"Ready after {duration*1000:.1f} ms")
+            if Q1Instrument.verbose:
+                logger.debug(f"Status polling: {self.poll_statistics}")
         except Exception:
             logger.error("Exception", exc_info=True)
             raise
@@ -330,39 +413,34 @@ class Q1Instrument:
                 for module in self.modules.values():
                     module.stop_sequencers()
 
-    def _get_sequencer_status(self, module, seq_nr, timeout_minutes):
+    def _get_sequencer_status(self, module, seq_nr, poll_scheduler):
         """Get sequencer status in a interrupt safe way.
         Only intercept the keyboard interrupt during communication,
         not when sleeping.
         """
-        expiration_time = time.perf_counter() + timeout_minutes*60.0
-        # timeout_poll_res = 0.001
+        not_ready = ["ARMED", "RUNNING", "Q1_STOPPED"]
         with DelayedKeyboardInterrupt("check status"):
             status = module.get_sequencer_status(seq_nr, 0.0)
-        while (status.state == "RUNNING"
-                or status.state == "Q1_STOPPED"
-                or status.state == "ARMED"
-               ) and time.perf_counter() < expiration_time:
-            # time.sleep(timeout_poll_res)
+        while status.state in not_ready and not poll_scheduler.expired:
+            poll_scheduler.polled(ready=False)
             with DelayedKeyboardInterrupt("check status"):
                 status = module.get_sequencer_status(seq_nr, 0.0)
+        poll_scheduler.polled(ready=status.state not in not_ready)
         return status
 
     def _get_sequencer_status_multiple(
             self,
             active_sequencers: list[tuple[QbloxModule, SequenceBuilder]],
-            timeout_minutes):
+            poll_scheduler: PollScheduler):
         """Get sequencer status in a interrupt safe way.
         Only intercept the keyboard interrupt during communication,
         not when sleeping.
         """
         not_ready = ["ARMED", "RUNNING", "Q1_STOPPED"]
         statuses = []
-        expiration_time = time.perf_counter() + timeout_minutes*60.0
-        # timeout_poll_res = 0.001
         if not Q1Instrument.concurrent_communication:
             for module, seq in active_sequencers:
-                statuses.append(self._get_sequencer_status(module, seq.seq_nr, timeout_minutes))
+                statuses.append(self._get_sequencer_status(module, seq.seq_nr, poll_scheduler))
         else:
             statuses = [None]*len(active_sequencers)
             # reverse lookup in statuses
@@ -373,7 +451,7 @@ class Q1Instrument:
             for idx, (module, seq) in enumerate(active_sequencers):
                 instrument = module.root_instrument
                 if not isinstance(instrument, TurboCluster):
-                    statuses[idx] = self._get_sequencer_status(module, seq.seq_nr, timeout_minutes)
+                    statuses[idx] = self._get_sequencer_status(module, seq.seq_nr, poll_scheduler)
                 else:
                     module_sequencers = turbo_sequencers.setdefault(instrument, defaultdict(list))
                     module_sequencers[module].append(seq.seq_nr)
@@ -395,47 +473,140 @@ class Q1Instrument:
                     try:
                         res = None
                         with DelayedKeyboardInterrupt("check status"):
-                            res = instrument.get_sequencer_status_multiple(sequencers)
+                            res = instrument.get_sequencer_status_multiple(sequencers, parse_sequencer_status)
                     except KeyboardInterrupt:
                         logger.info(f"Interrupted during get_sequencer_status_multiple. Statusses: {res}")
                         raise
 
                     for slot, seq_num, status in res:
-                        status = translate_seq_status(status)
                         statuses[index[(instrument, slot, seq_num)]] = status
-                if time.perf_counter() > expiration_time:
+                ready = all(status.state not in not_ready for status in statuses)
+                # polled does not sleep when the scheduler has expired.
+                poll_scheduler.polled(ready)
+                if poll_scheduler.expired:
                     break
-                # if any(status.state in not_ready for status in statuses):
-                #     time.sleep(timeout_poll_res)
 
         return statuses
 
     def check_system_errors(self, exclude: list[int] = []):
         t_start_check = time.perf_counter()
-        errors = []
 
-        for instrument in self.root_instruments:
-            if Q1Instrument.concurrent_communication and isinstance(instrument, TurboCluster):
-                errors += instrument.get_system_errors(exclude)
-            else:
-                while instrument.get_num_system_error() != 0:
-                    errors.append(instrument.get_system_error())
+        with profiler.span("check_errors"):
+            errors = self._run_per_instrument(
+                self._get_system_errors,
+                {instrument: (exclude,) for instrument in self.root_instruments},
+                )
+        self._raise_system_errors(sum(errors.values(), []))
+
+        if Q1Instrument.verbose:
+            duration = time.perf_counter() - t_start_check
+            logger.debug(f"Checked errors in {duration*1000.0:3.1f} ms")
+
+    def _get_system_errors(self, instrument, exclude: list[int] = []) -> list[str]:
+        errors = []
+        if Q1Instrument.concurrent_communication and isinstance(instrument, TurboCluster):
+            errors += instrument.get_system_errors(exclude)
+        else:
+            while instrument.get_num_system_error() != 0:
+                errors.append(instrument.get_system_error())
 
         if not Q1Instrument.concurrent_communication:
             for module in self.modules.values():
+                if module.root_instrument is not instrument:
+                    continue
                 while module.get_num_system_error() != 0:
                     errors.append(module.get_system_error())
+        return [f"{instrument.name}:{error}" for error in errors]
 
+    def _raise_system_errors(self, errors: list[str]):
         if len(errors) > 0:
             if Q1Instrument._i_feel_lucky:
                 logger.error("You're not lucky. One of the previous calls failed...")
-            msg = instrument.name + ":" + "\n".join(errors)
+            msg = "\n".join(errors)
             logger.error(msg)
             raise RuntimeError(msg)
 
-        if Q1Instrument.verbose:
-            duration = time.perf_counter() - t_start_check
-            logger.debug(f"Checked errors in {duration*1000.0:3.1f} ms")
+    def _sequencers_per_instrument(self, sequencers: dict[str, Sequencer]) -> dict[Any, tuple[dict[str, Sequencer]]]:
+        """Groups sequencers per root instrument sorted on (seq_num, slot).
+        The result contains all root instruments.
+        """
+        sequencers = dict(sorted(sequencers.items(),
+                                 key=lambda kv: (kv[1].seq_nr, self.modules[kv[1].module_name].slot_idx)))
+        result = {instrument: ({},) for instrument in self.root_instruments}
+        for name, seq in sequencers.items():
+            instrument = self.modules[seq.module_name].root_instrument
+            result[instrument][0][name] = seq
+        return result
+
+    def _run_per_instrument(self, func, args_per_instrument: dict[Any, tuple], *args, on_abort=None) -> dict:
+        """Calls `func(instrument, *instrument_args, *args)` for every instrument in args_per_instrument.
+
+        With multiple root instruments the calls run in parallel with a thread per instrument.
+        If an exception occurs, then all calls are completed before the exception is raised.
+        `on_abort` is called when the main thread is interrupted while waiting.
+
+        Returns:
+            result of func per instrument.
+        """
+        if not self._runs_in_parallel(len(args_per_instrument)):
+            return {
+                instrument: func(instrument, *instrument_args, *args)
+                for instrument, instrument_args in args_per_instrument.items()
+                }
+
+        executor = self._get_executor()
+        futures = {
+            instrument: executor.submit(func, instrument, *instrument_args, *args)
+            for instrument, instrument_args in args_per_instrument.items()
+            }
+        try:
+            concurrent.futures.wait(futures.values())
+        except BaseException:
+            # Keyboard interrupt. Wait till the instruments have completed the communication.
+            if on_abort is not None:
+                on_abort()
+            with DelayedKeyboardInterrupt("wait for instruments"):
+                concurrent.futures.wait(futures.values())
+            raise
+        exceptions = [future.exception() for future in futures.values() if future.exception() is not None]
+        if exceptions:
+            # Instruments waiting on a barrier raise BrokenBarrierError. Raise the original exception.
+            exceptions.sort(key=lambda ex: isinstance(ex, threading.BrokenBarrierError))
+            raise exceptions[0]
+        return {instrument: future.result() for instrument, future in futures.items()}
+
+    def _runs_in_parallel(self, n_instruments: int) -> bool:
+        return n_instruments > 1 and Q1Instrument.concurrent_communication
+
+    def _command_batch(self, instrument):
+        if Q1Instrument.concurrent_communication and isinstance(instrument, TurboCluster):
+            return instrument.batch()
+        return contextlib.nullcontext()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        n_workers = len(self.root_instruments)
+        if self._executor is None or self._executor._max_workers != n_workers:
+            if self._executor is not None:
+                self._executor.shutdown()
+            self._executor = ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="Q1Instrument")
+        return self._executor
+
+    def _get_reduction_executor(self) -> ThreadPoolExecutor:
+        # NumPy releases the GIL in the reductions of large arrays.
+        if self._reduction_executor is None:
+            self._reduction_executor = ThreadPoolExecutor(thread_name_prefix="Q1Reduce")
+        return self._reduction_executor
+
+    def close(self):
+        """Stops the worker threads of the instrument.
+        The threads are started again when the instrument is used after close.
+        The modules are not closed.
+        """
+        for executor in [self._executor, self._reduction_executor]:
+            if executor is not None:
+                executor.shutdown()
+        self._executor = None
+        self._reduction_executor = None
 
     def get_acquisition_bins(self, sequencer_name, acq_name):
         acq_data = self._get_acquisitions(sequencer_name, acq_name)
@@ -449,12 +620,212 @@ class Q1Instrument:
             return None
         return acq_data["acquisition"]["scope"]
 
-    def _get_acquisitions(self, sequencer_name, acq_name):
+    def get_all_acquisitions(
+            self,
+            names: dict[str, list[str]] | None = None,
+            ) -> dict[str, dict[str, np.ndarray]]:
+        """Returns the binned data of the acquisitions of multiple readout sequencers.
+        The data of all acquisitions on a TurboCluster is requested concurrently.
+
+        Args:
+            names: per readout sequencer the names of the acquisitions.
+                If None, all acquisitions of all readout sequencers with a loaded program are returned.
+
+        Returns:
+            Per sequencer per acquisition a structured array with fields
+            "path0", "path1", "threshold" and "avg_cnt".
+        """
+        if names is None:
+            names = {
+                name: list(q1asm["acquisitions"])
+                for name, q1asm in self._loaded_q1asm.items()
+                if name in self.readouts and q1asm is not None
+                }
+        result = {}
+        turbo_acquisitions: dict[TurboCluster, list[tuple[int, int, str]]] = {}
+        turbo_keys: dict[TurboCluster, list[tuple[str, str]]] = {}
+        for sequencer_name, acq_names in names.items():
+            result[sequencer_name] = {}
+            q1asm = self._loaded_q1asm[sequencer_name]
+            if q1asm is None or len(q1asm["acquisitions"]) == 0:
+                logger.warning(f"No acquisitions for {sequencer_name}")
+                continue
+            self._check_acquisition_ready(sequencer_name)
+            seq = self.readouts[sequencer_name]
+            module = self.modules[seq.module_name]
+            instrument = module.root_instrument
+            if Q1Instrument.concurrent_communication and isinstance(instrument, TurboCluster):
+                for acq_name in acq_names:
+                    turbo_acquisitions.setdefault(instrument, []).append((module.slot_idx, seq.seq_nr, acq_name))
+                    turbo_keys.setdefault(instrument, []).append((sequencer_name, acq_name))
+            else:
+                with DelayedKeyboardInterrupt("get_acquisitions"), profiler.span("fetch", sequencer_name):
+                    result[sequencer_name] = module.get_acquisition_bins(seq.seq_nr, acq_names)
+
+        for instrument, acquisitions in turbo_acquisitions.items():
+            with (DelayedKeyboardInterrupt("get_acquisitions"),
+                  profiler.span("fetch", instrument=instrument.name, n_acquisitions=len(acquisitions))):
+                data = instrument.get_acquisitions_multiple(acquisitions)
+            for (sequencer_name, acq_name), bins in zip(turbo_keys[instrument], data):
+                result[sequencer_name][acq_name] = bins
+        return result
+
+    def get_reduced_acquisitions(
+            self,
+            loops,
+            names: dict[str, list[str]] | None = None,
+            average: bool = True,
+            threshold: float | None = None,
+            rotation: float = 0.0,
+            ) -> dict[str, dict[str, np.ndarray]]:
+        """Returns the acquisitions of multiple readout sequencers reshaped to the loops
+        of the program, averaged over the repetitions and optionally thresholded.
+        The acquisitions are reduced in parallel in a thread pool.
+        See `reduce_bins` for the reduction.
+
+        Example:
+            with p.loop_range(10) as i:
+                with p.loop_linspace(-0.5, 0.5, 20) as v:
+                    ...
+            instrument.run_program(p)
+            data = instrument.get_reduced_acquisitions([i, v])
+            # data["R1"]["default"] has shape (10, 20).
+
+        Args:
+            loops: loop variables, loops or numbers of iterations of the acquisitions.
+                Outer loop first.
+            names: per readout sequencer the names of the acquisitions.
+                If None, all acquisitions of all readout sequencers with a loaded program are returned.
+            average: if True average over the repetitions.
+            threshold: if not None the fraction of bins with the rotated path0 >= threshold is returned.
+            rotation: rotation of path data in degrees before thresholding.
+
+        Returns:
+            Per sequencer per acquisition a complex array with path0 + 1j*path1,
+            or a float array with the thresholded data.
+        """
+        acquisitions = self.get_all_acquisitions(names)
+        executor = self._get_reduction_executor()
+        futures = {
+            (sequencer_name, acq_name): executor.submit(
+                self._reduce_bins, sequencer_name, bins, loops, average, threshold, rotation)
+            for sequencer_name, acq_bins in acquisitions.items()
+            for acq_name, bins in acq_bins.items()
+            }
+        result = {sequencer_name: {} for sequencer_name in acquisitions}
+        for (sequencer_name, acq_name), future in futures.items():
+            result[sequencer_name][acq_name] = future.result()
+        return result
+
+    @staticmethod
+    def _reduce_bins(sequencer_name, bins, loops, average, threshold, rotation):
+        with profiler.span("reduce", sequencer_name):
+            return reduce_bins(bins, loops, average=average, threshold=threshold, rotation=rotation)
+
+    def stream_acquisition_bins(
+            self,
+            sequencer_name: str,
+            acq_name: str,
+            chunk_size: int = 1024,
+            poll_interval: float = 0.01,
+            ) -> Iterator[np.ndarray]:
+        """Yields the bins of an acquisition in chunks while the sequencer is running.
+        A chunk is yielded as soon as `chunk_size` consecutive bins are valid.
+        The remaining bins are yielded when the sequencer has stopped.
+        The chunks are structured arrays with fields "path0", "path1", "threshold" and "avg_cnt".
+
+        Bins that are averaged in the QRM are only complete when the sequencer
+        has stopped. If the program averages the repetitions in the bins, or
+        a bin with more than 1 average is retrieved while running, then a warning
+        is logged and the bins are only yielded when the sequencer has stopped.
+
+        Example:
+            instrument.start_program(p)
+            for chunk in instrument.stream_acquisition_bins("R1", "default"):
+                process(chunk)
+            instrument.wait_stopped()
+
+        Note:
+            Streaming only overlaps the transfer of the bins with the run of the program.
+            It does not reduce the transferred data. The QRM can only return all
+            bins of an acquisition. So every fetch retrieves all bins and only the new
+            chunks are kept. To limit the transferred data the bins are retrieved at
+            most `Q1Instrument.stream_max_fetches` times while the sequencer is running,
+            when the next part of the bins is expected to be complete according to
+            the expected duration of the program. In total at most
+            `stream_max_fetches` + 1 times the size of the acquisition is transferred.
+            The status of the sequencer is polled every `poll_interval` seconds.
+        """
+        not_ready = ["ARMED", "RUNNING", "Q1_STOPPED"]
+        q1asm = self._loaded_q1asm[sequencer_name]
+        n_bins = q1asm["acquisitions"][acq_name]["num_bins"]
         seq = self.readouts[sequencer_name]
+        module = self.modules[seq.module_name]
+        averaged = self._repetitions_averaged
+        if averaged:
+            logger.warning(f"Bins of {sequencer_name}:{acq_name} are averaged over the repetitions. "
+                           "The bins are yielded when the sequencer has stopped.")
+        n_yielded = 0
+        n_fetches = 0
+        # Every fetch retrieves all bins. Fetch when a part of the bins is complete.
+        fetch_step = max(chunk_size, -(-n_bins // Q1Instrument.stream_max_fetches))
+        t_next = self._t_start + self._expected_duration * (fetch_step + 1) / n_bins
+        running = True
+        while running and n_yielded < n_bins:
+            with DelayedKeyboardInterrupt("check status"):
+                status = module.get_sequencer_status(seq.seq_nr)
+            running = status.state in not_ready
+            if running:
+                if averaged or n_fetches >= Q1Instrument.stream_max_fetches:
+                    time.sleep(poll_interval)
+                    continue
+                t_sleep = t_next - time.perf_counter()
+                if t_sleep > 0:
+                    time.sleep(max(min(t_sleep, PollScheduler.max_sleep), poll_interval))
+                    continue
+                n_fetches += 1
+            else:
+                self._check_acquisition_ready(sequencer_name)
+            with DelayedKeyboardInterrupt("get_acquisitions"), profiler.span("fetch", sequencer_name):
+                bins = module.get_acquisition_bins(seq.seq_nr, [acq_name])[acq_name]
+            if running:
+                if np.any(bins["avg_cnt"] > 1):
+                    logger.warning(f"Bins of {sequencer_name}:{acq_name} are averaged. "
+                                   "The remaining bins are yielded when the sequencer has stopped.")
+                    averaged = True
+                    continue
+                invalid = np.flatnonzero(bins["avg_cnt"][n_yielded:] == 0)
+                # the last valid bin could still be updated.
+                n_valid = n_yielded + invalid[0] - 1 if len(invalid) else len(bins)
+                # only yield full chunks while running
+                n_valid = n_yielded + (n_valid - n_yielded) // chunk_size * chunk_size
+            else:
+                n_valid = len(bins)
+            for start in range(n_yielded, n_valid, chunk_size):
+                # copy chunk to release the memory of the retrieved bins
+                yield bins[start:min(start+chunk_size, n_valid)].copy()
+            n_yielded = max(n_yielded, n_valid)
+            del bins
+            if running:
+                # the next part of the bins is expected to be complete at t_next.
+                # Wait at least the expected duration of a part, if the program is behind schedule.
+                t_part = self._expected_duration * fetch_step / n_bins
+                t_next = max(self._t_start + t_part + self._expected_duration * (n_yielded + 1) / n_bins,
+                             time.perf_counter() + t_part)
+
+    def _get_acquisitions(self, sequencer_name, acq_name):
         q1asm = self._loaded_q1asm[sequencer_name]
         if q1asm is None or len(q1asm["acquisitions"]) == 0:
             logger.warning(f"No acquisitions for {sequencer_name}")
             return None
+        self._check_acquisition_ready(sequencer_name)
+        seq = self.readouts[sequencer_name]
+        module = self.modules[seq.module_name]
+        with DelayedKeyboardInterrupt("get_acquisitions"), profiler.span("fetch", sequencer_name):
+            return module.get_acquisitions(seq.seq_nr, acq_name)
+
+    def _check_acquisition_ready(self, sequencer_name):
+        seq = self.readouts[sequencer_name]
         module = self.modules[seq.module_name]
         if self.ignore_acq_binning_done:
             finished = module.get_acquisition_status(seq.seq_nr, 0)
@@ -466,8 +837,6 @@ class Q1Instrument:
             finished = module.get_acquisition_status(seq.seq_nr, timeout)
             if not finished:
                 logger.error("Acquisition not finished (according to QRM)")
-        with DelayedKeyboardInterrupt("get_acquisitions"):
-            return module.get_acquisitions(seq.seq_nr, acq_name)
 
     def get_input_ranges(self, sequencer_name):
         """ Returns input range for both channels of sequencer.
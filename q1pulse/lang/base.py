@@ -7,3 +7,20 @@ class Statement(ABC):
     def write_instruction(self, generator):
         pass
 
+
+
+class Comment:
+    '''
+    Comment line in a sequence.
+    The text is only formatted when the comment is written or described.
+    '''
+    __slots__ = ['fmt', 'args']
+
+    def __init__(self, fmt, args):
+        self.fmt = fmt
+        self.args = args
+
+    def __str__(self):
+        return self.fmt.format(*self.args)
+
+    __repr__ = __str__
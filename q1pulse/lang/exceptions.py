@@ -77,3 +77,10 @@ class Q1InputOverloaded(Q1Exception):
     Raised when the input of QRM is overloaded during acquisition.
     Exception can be suppressed with `q1pulse.set_exception_on_overload(False)`.
     '''
+
+
+class Q1ExecutionError(Q1Exception):
+    '''
+    Raised when the execution of a compiled program fails,
+    e.g. on an illegal instruction.
+    '''
@@ -118,3 +118,50 @@ class EndArrayLoopStatement(TimedStatement):
             # jump to loop start
             generator.jmp('@'+self._label)
         # NOTE: last jump will end here at the end of loop.
+
+
+class Subroutine:
+    def __init__(self, name, sequence):
+        self.name = name
+        self.sequence = sequence
+        self.duration = 0
+        self.last_time = 0
+
+    def close(self, last_timed_statement):
+        '''
+        Sets the duration of the subroutine and the time of the last statement.
+        '''
+        self.duration = self.sequence.timeline.end_time
+        if last_timed_statement is not None:
+            self.last_time = last_timed_statement.time
+
+    def __repr__(self):
+        return f'subroutine {self.name}'
+
+
+class CallStatement(TimedStatement):
+    def __init__(self, time, subroutine):
+        super().__init__(time)
+        self._subroutine = subroutine
+
+    def __repr__(self):
+        return f'call {self._subroutine.name}'
+
+    def write_instruction(self, generator):
+        generator.call_subroutine(self.time, self._subroutine.name)
+
+
+class EndCallStatement(TimedStatement):
+    '''
+    Time of the last statement in the called subroutine.
+    Used to check the time of the next statement. Does not add an instruction.
+    '''
+    def __init__(self, time, subroutine):
+        super().__init__(time)
+        self._subroutine = subroutine
+
+    def __repr__(self):
+        return f'end call {self._subroutine.name}'
+
+    def write_instruction(self, generator):
+        pass
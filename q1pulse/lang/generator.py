@@ -13,6 +13,16 @@ class GeneratorBase(ABC):
     def repetitions(self, value):
         pass
 
+    @property
+    @abstractmethod
+    def average_repetitions(self):
+        pass
+
+    @average_repetitions.setter
+    @abstractmethod
+    def average_repetitions(self, value):
+        pass
+
     @abstractmethod
     def start_main(self):
         pass
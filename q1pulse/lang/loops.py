@@ -9,6 +9,10 @@ class LoopVar(Register):
         super().__init__(name, **kwargs)
         self._loop = loop
 
+    @property
+    def loop(self):
+        return self._loop
+
 
 class Loop:
     def __init__(self, loop_number, n, var_type=None, local=False):
@@ -35,6 +35,17 @@ class Registers:
         super().__setattr__(name, register)
         return register
 
+    def _fork(self, builder):
+        '''
+        Returns a copy of the registers for builder.
+        The registers are shared. New registers are only added to the copy.
+        '''
+        registers = Registers(builder, self._local)
+        for name, register in self._registers.items():
+            registers._registers[name] = register
+            super(Registers, registers).__setattr__(name, register)
+        return registers
+
     def init(self, name, default=0):
         # Note: used for acquire with 'increment'
         if name not in self._registers:
@@ -1,20 +1,57 @@
+from copy import copy
+
+from .base import Comment
 from .timed_statements import TimedStatement, MultiBranchStatement
-from .flow_statements import BranchStatement
+from .flow_statements import (
+        BranchStatement,
+        LoopStatement, ArrayLoopStatement,
+        EndLoopStatement, EndArrayLoopStatement,
+        LoopDurationStatement,
+        )
 from .exceptions import Q1Exception, Q1SequenceError
+from ..util import statement_profiler
 
 
 class Sequence:
     def __init__(self, timeline):
         self.timeline = timeline
         self._statements = []
+        self._shared = False
 
     def add(self, statement):
+        if self._shared:
+            self._unshare()
         self._statements.append(statement)
 
+    def extend(self, statements):
+        if self._shared:
+            self._unshare()
+        self._statements.extend(statements)
+
+    def fork(self, timeline):
+        '''
+        Returns a copy of the sequence with the new timeline.
+        The list of statements is shared till a statement is added
+        to one of the sequences.
+        Statements in nested sequences are shared and should not be changed.
+        '''
+        self._shared = True
+        sequence = copy(self)
+        sequence.timeline = timeline
+        return sequence
+
+    @property
+    def statements(self):
+        return self._statements
+
+    def _unshare(self):
+        self._statements = list(self._statements)
+        self._shared = False
+
     def describe(self, lines, indent=0, init_section=False):
         white = '    ' * indent
         for statement in self._statements:
-            is_comment = isinstance(statement, str)
+            is_comment = isinstance(statement, (str, Comment))
             statement_str = str(statement)
             if statement_str == 'endloop':
                 continue
@@ -34,7 +71,29 @@ class Sequence:
                 for branch in statement.branches:
                     branch.describe(lines, indent+1)
 
+    def repeated_loop_time(self):
+        '''
+        Returns the time of the 2nd and further iterations of the loops
+        in this sequence. This time is not included in the timeline.
+        '''
+        t = 0
+        for statement in self._statements:
+            if not isinstance(statement, (LoopStatement, ArrayLoopStatement)):
+                continue
+            n = statement._loop.n
+            body = statement.sequence
+            t_body = n * body.repeated_loop_time()
+            # Local repeat loops already added the duration of all iterations to the timeline.
+            if not any(isinstance(s, LoopDurationStatement) for s in body._statements):
+                t_end = max((s.time for s in body._statements
+                             if isinstance(s, (EndLoopStatement, EndArrayLoopStatement))),
+                            default=statement.time)
+                t_body += (n-1) * (t_end - statement.time)
+            t += t_body
+        return t
+
     def compile(self, generator, annotate=False):
+        profiler = statement_profiler.active_profiler()
         for statement in self._statements:
             if annotate:
                 s = str(statement)
@@ -45,7 +104,13 @@ class Sequence:
                 if not annotate:
                     generator.add_comment(statement)
                 continue
+            if isinstance(statement, Comment):
+                if not annotate and generator.add_comments:
+                    generator.add_comment(str(statement))
+                continue
             try:
+                if profiler is not None:
+                    profiler.start(statement, generator)
                 if not isinstance(statement, BranchStatement):
                     statement.write_instruction(generator)
                 else:
@@ -56,6 +121,8 @@ class Sequence:
                         statement.sequence.compile(generator, annotate)
                         generator.block_end()
                         generator.block_start()
+                if profiler is not None:
+                    profiler.stop(statement, generator)
             except Q1SequenceError:
                 raise
             except Q1Exception as ex:
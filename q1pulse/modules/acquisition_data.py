@@ -0,0 +1,156 @@
+import math
+import warnings
+
+import numpy as np
+
+from q1pulse.lang.exceptions import Q1ValueError
+
+
+BINNED_ACQUISITION_BIT_WIDTH = 12
+_BIN_SCALE = float(2**(BINNED_ACQUISITION_BIT_WIDTH-1))**2
+
+RAW_BINS_DTYPE = np.dtype([
+    ("valid", np.uint64),
+    ("path0", np.int64),
+    ("path1", np.int64),
+    ("thres_raw", np.uint32),
+    ("avg_cnt", np.uint32),
+    ])
+"""Layout of the binned acquisition data as sent by the QRM."""
+
+ACQ_BINS_DTYPE = np.dtype([
+    ("path0", np.float64),
+    ("path1", np.float64),
+    ("threshold", np.float64),
+    ("avg_cnt", np.uint32),
+    ])
+"""Layout of the normalized binned acquisition data returned by Q1Pulse."""
+
+
+def convert_raw_bins(raw: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """Normalizes the raw binned acquisition data of the QRM.
+
+    The conversion is identical to qblox-instruments: path data is divided by the
+    average count and scaled to the range -1.0 to 1.0. Invalid bins are set to NaN.
+
+    Args:
+        raw: binned data with dtype RAW_BINS_DTYPE.
+        out: optional preallocated array with dtype ACQ_BINS_DTYPE.
+
+    Returns:
+        structured array with dtype ACQ_BINS_DTYPE.
+    """
+    if out is None:
+        out = np.empty(len(raw), ACQ_BINS_DTYPE)
+    avg_cnt = out["avg_cnt"]
+    avg_cnt[:] = raw["avg_cnt"]
+    divisor = np.maximum(avg_cnt, 1).astype(np.float64)
+    np.divide(raw["thres_raw"], divisor, out=out["threshold"])
+    divisor *= _BIN_SCALE
+    np.divide(raw["path0"], divisor, out=out["path0"])
+    np.divide(raw["path1"], divisor, out=out["path1"])
+    invalid = raw["valid"] == 0
+    if invalid.any():
+        out["path0"][invalid] = np.nan
+        out["path1"][invalid] = np.nan
+        out["threshold"][invalid] = np.nan
+        avg_cnt[invalid] = 0
+    return out
+
+
+def bins_from_dict(bins: dict) -> np.ndarray:
+    """Converts the bins dictionary of qblox-instruments `get_acquisitions`
+    to a structured array with dtype ACQ_BINS_DTYPE.
+    """
+    path0 = bins["integration"]["path0"]
+    out = np.empty(len(path0), ACQ_BINS_DTYPE)
+    out["path0"] = path0
+    out["path1"] = bins["integration"]["path1"]
+    out["threshold"] = bins["threshold"]
+    out["avg_cnt"] = bins["avg_cnt"]
+    # invalid bins have NaN values and avg_cnt 0.
+    out["avg_cnt"][np.isnan(out["path0"])] = 0
+    return out
+
+
+def loop_shape(loops) -> tuple[int, ...]:
+    """Returns the shape of the data of nested loops.
+
+    Args:
+        loops: sequence of loop variables of `loop_range`, `loop_linspace` and
+            `loop_array`, loops or numbers of iterations. Outer loop first.
+    """
+    shape = []
+    for loop in loops:
+        if hasattr(loop, "loop"):
+            loop = loop.loop
+        shape.append(int(getattr(loop, "n", loop)))
+    return tuple(shape)
+
+
+def reduce_bins(
+        bins: np.ndarray,
+        loops=(),
+        average: bool = True,
+        threshold: float | None = None,
+        rotation: float = 0.0,
+        ) -> np.ndarray:
+    """Reshapes, averages and optionally thresholds binned acquisition data.
+
+    The bins are reshaped to (n_repetitions, *shape) with the shape of the loops.
+    n_repetitions is the number of bins divided by the number of loop iterations.
+    The path data is returned as complex values path0 + 1j*path1.
+
+    The path data is not copied if possible. The thresholded data is written in
+    a new array. The bins are not modified.
+
+    Args:
+        bins: structured array with dtype ACQ_BINS_DTYPE.
+        loops: loops of the acquisition, see `loop_shape`.
+        average: if True average over the repetitions. Invalid bins are
+            excluded from the average. A point without valid bins is NaN.
+        threshold: if not None the bins are thresholded: 1.0 if
+            path0*cos(rotation) - path1*sin(rotation) >= threshold, else 0.0.
+            Invalid bins are NaN.
+        rotation: rotation of path data in degrees before thresholding.
+
+    Returns:
+        complex array with path data or float array with thresholded data.
+        The shape is (n_repetitions, *shape), or shape if averaged.
+    """
+    shape = loop_shape(loops)
+    n_points = math.prod(shape)
+    if n_points == 0 or len(bins) % n_points:
+        raise Q1ValueError(f"Number of bins ({len(bins)}) is not a multiple of loop shape {shape}")
+    if not bins.flags.c_contiguous:
+        bins = np.ascontiguousarray(bins)
+    if threshold is None:
+        # path0 and path1 are adjacent float64 fields: view them as complex.
+        data = np.ndarray(len(bins), np.complex128, bins,
+                          offset=ACQ_BINS_DTYPE.fields["path0"][1],
+                          strides=bins.strides)
+    else:
+        if rotation:
+            phi = np.deg2rad(rotation)
+            data = bins["path0"] * np.cos(phi)
+            data -= np.sin(phi) * bins["path1"]
+            np.greater_equal(data, threshold, out=data)
+        else:
+            data = np.empty(len(bins))
+            np.greater_equal(bins["path0"], threshold, out=data)
+    invalid = bins["avg_cnt"] == 0
+    has_invalid = invalid.any()
+    if threshold is not None and has_invalid:
+        data[invalid] = np.nan
+    data = data.reshape((len(bins) // n_points, *shape))
+    if average and len(data) > 1:
+        if has_invalid:
+            with warnings.catch_warnings():
+                # points without valid bins are NaN.
+                warnings.simplefilter("ignore", RuntimeWarning)
+                data = np.nanmean(data, axis=0)
+        else:
+            data = data.mean(axis=0)
+    elif average:
+        data = data[0]
+    return data
@@ -2,12 +2,15 @@ import logging
 import time
 from dataclasses import dataclass
 
+import numpy as np
+
 from q1pulse.lang.exceptions import Q1MemoryError
 from q1pulse.turbo_cluster import TurboCluster
 from q1pulse.util.delayedkeyboardinterrupt import DelayedKeyboardInterrupt
 from q1pulse.util.q1configuration import Q1Configuration
 from q1pulse.util.qblox_version import qblox_version, Version
 
+from .acquisition_data import bins_from_dict
 from .sequencer_states import translate_seq_status
 
 
@@ -435,6 +438,21 @@ class QrmModule(QbloxModule):
         else:
             return self.pulsar.get_acquisitions(seq_nr)[acq_name]
 
+    def get_acquisition_bins(self, seq_nr: int, acq_names: list[str]) -> dict[str, np.ndarray]:
+        """Returns the bins of the acquisitions as structured arrays with dtype ACQ_BINS_DTYPE."""
+        if isinstance(self.root_instrument, TurboCluster):
+            acquisitions = [(self.slot_idx, seq_nr, name) for name in acq_names]
+            bins = self.root_instrument.get_acquisitions_multiple(acquisitions)
+            return dict(zip(acq_names, bins))
+        if qblox_version >= Version("0.18"):
+            acquisitions = self.pulsar.get_acquisitions(seq_nr, as_numpy=True)
+        else:
+            acquisitions = self.pulsar.get_acquisitions(seq_nr)
+        return {
+            name: bins_from_dict(acquisitions[name]["acquisition"]["bins"])
+            for name in acq_names
+            }
+
     def get_scope_data(self, seq_nr: int, acq_name: str):
         if qblox_version >= Version("0.18"):
             return self.pulsar.get_acquisitions(seq_nr, as_numpy=True)[acq_name]["acquisition"]["scope"]
@@ -1,4 +1,5 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from functools import lru_cache
 from logging import DEBUG, INFO, WARNING, ERROR
 import logging
 
@@ -35,55 +36,92 @@ _flag_map = {
     }
 
 
-@dataclass
+@dataclass(frozen=True)
 class SequencerStatus:
+    """Immutable sequencer status.
+    Instances are cached and shared. Use `dataclasses.replace` to modify.
+    """
     state: str
     # field status added in qblox version 0.12
     status: str = 'OKAY'
     level: int = 10
-    errors: list[str] = field(default_factory=list)
-    warnings: list[str] = field(default_factory=list)
-    info_msgs: list[str] = field(default_factory=list)
-    debug_msgs: list[str] = field(default_factory=list)
+    errors: tuple[str, ...] = ()
+    warnings: tuple[str, ...] = ()
+    info_msgs: tuple[str, ...] = ()
+    debug_msgs: tuple[str, ...] = ()
     input_overloaded: bool = False
 
-    def __post_init__(self):
-        self.msg_list = {
-            ERROR: self.errors,
-            WARNING: self.warnings,
-            INFO: self.info_msgs,
-            DEBUG: self.debug_msgs,
-            }
-
     def __str__(self):
         result = f'status:{self.status}, state:{self.state}'
         if len(self.errors):
-            result += f', errors:{self.errors}'
+            result += f', errors:{list(self.errors)}'
         if len(self.warnings):
-            result += f', warnings:{self.warnings}'
+            result += f', warnings:{list(self.warnings)}'
         if len(self.info_msgs+self.debug_msgs):
-            result += f', info:{self.info_msgs+self.debug_msgs}'
+            result += f', info:{list(self.info_msgs+self.debug_msgs)}'
         return result
 
-    def add_flags(self, flags):
-        for flag in flags:
-            flag_str = str(flag).replace('_', ' ')
-            if flag_str not in _flag_map:
-                logger.error(f'Unknown flag {flag_str} in sequencer state')
-                self.errors.append(flag_str)
-                self.level = ERROR
-            else:
-                level = _flag_map[flag_str]
-                if 'OUT OF RANGE' in flag_str:
-                    self.input_overloaded = True
-                self.level = max(level, self.level)
-                self.msg_list[level].append(flag_str)
+
+@lru_cache(maxsize=256)
+def _create_status(state: str, status: str, flags: tuple[str, ...]) -> SequencerStatus:
+    msg_list = {
+        ERROR: [],
+        WARNING: [],
+        INFO: [],
+        DEBUG: [],
+        }
+    max_level = DEBUG
+    input_overloaded = False
+    for flag_str in flags:
+        # qblox-instruments uses '_' and SCPI responses use ' ' or '-' as separator.
+        flag_str = flag_str.replace('_', ' ').replace('-', ' ')
+        if flag_str not in _flag_map:
+            logger.error(f'Unknown flag {flag_str} in sequencer state')
+            level = ERROR
+        else:
+            level = _flag_map[flag_str]
+            if 'OUT OF RANGE' in flag_str:
+                input_overloaded = True
+        max_level = max(level, max_level)
+        msg_list[level].append(flag_str)
+    return SequencerStatus(
+        state, status, max_level,
+        tuple(msg_list[ERROR]),
+        tuple(msg_list[WARNING]),
+        tuple(msg_list[INFO]),
+        tuple(msg_list[DEBUG]),
+        input_overloaded,
+        )
+
+
+def translate_seq_status(seq_status) -> SequencerStatus:
+    """Translates the SequencerStatus of qblox-instruments."""
+    flags = tuple(
+        str(flag)
+        for flags in [seq_status.info_flags, seq_status.warn_flags, seq_status.err_flags]
+        for flag in flags
+        )
+    return _create_status(str(seq_status.state), str(seq_status.status), flags)
 
 
-def translate_seq_status(seq_status):
-    status = SequencerStatus(seq_status.state, seq_status.status)
-    status.add_flags(seq_status.info_flags)
-    status.add_flags(seq_status.warn_flags)
-    status.add_flags(seq_status.err_flags)
+@lru_cache(maxsize=256)
+def parse_sequencer_status(status_str: str) -> SequencerStatus:
+    """Parses the SCPI response to `SEQuencer{n}:STATE?`.
+    The result is cached, because the same responses are received many times during polling.
 
-    return status
+    Args:
+        status_str: response 'STATUS;STATE;INFO_FLAGS;WARN_FLAGS;ERR_FLAGS;LOG'.
+            Flags are terminated with ','.
+    """
+    # LOG is not used.
+    status, state, info_flags, warn_flags, err_flags = status_str.split(';')[:5]
+    flags = tuple(
+        flag
+        for flag_list in [info_flags, warn_flags, err_flags]
+        for flag in flag_list.split(',')
+        if flag
+        )
+    return _create_status(
+        state.replace(' ', '_').replace('-', '_'),
+        status.replace(' ', '_').replace('-', '_'),
+        flags)
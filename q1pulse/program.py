@@ -3,10 +3,13 @@ import time
 import logging
 import uuid
 from contextlib import contextmanager
+from copy import copy
 from numbers import Number
 
+import numpy as np
+
 from .lang.conditions import CounterFlags
-from .lang.exceptions import Q1InternalError, Q1ValueError
+from .lang.exceptions import Q1InternalError, Q1ValueError, Q1StateError
 from .lang.triggers import TriggerCounter, Trigger
 from .lang.math_expressions import Expression
 from .lang.timeline import Timeline
@@ -15,6 +18,8 @@ from .lang.register import Register
 from .lang.register_statements import RegisterAssignment
 from .lang.loops import RangeLoop, LinspaceLoop, ArrayLoop
 from .assembler.generator import Q1asmGenerator
+from .assembler.statistics import ProgramStatistics
+from .util import profiler
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +33,12 @@ class Program:
         self.path = path if path is not None else os.path.join("q1", "_prog")
         self.R = Registers(self, local=False)
         self.repetitions = 1
+        # If True the acquisition bins with 'increment' are reset at the start
+        # of every repetition and the repetitions are averaged in the bins.
+        # Note: the hardware bin counter of acquire_ttl is not reset.
+        self.average_repetitions = False
         self._q1asm = {}
+        self._statistics = {}
         self._loop_cnt = 0
         self._triggers = []
         # shared timeline for all sequencers
@@ -40,6 +50,39 @@ class Program:
         setattr(self, name, sequence_builder)
         sequence_builder.start_sequence(self, self._timeline)
 
+    def clone(self, path=None):
+        '''
+        Returns a copy of the program that shares the statements, waveforms,
+        acquisitions and registers added till now.
+        Statements added after cloning are only added to one of the programs.
+        This makes it cheap to build a common part once and add the
+        distinct part per measurement point to a clone.
+
+        The program can only be cloned outside loops, conditional blocks
+        and parallel sections.
+
+        Args:
+            path: directory for the compiled sequences of the clone.
+                Default is the path of this program.
+        '''
+        if not self._timeline.is_running:
+            raise Q1StateError('Program cannot be cloned in a parallel section')
+        program = copy(self)
+        program.uuid = uuid.uuid4()
+        if path is not None:
+            program.path = path
+        program.R = self.R._fork(program)
+        program._q1asm = {}
+        program._statistics = {}
+        program._triggers = list(self._triggers)
+        program._timeline = copy(self._timeline)
+        program.sequence_builders = {}
+        for name, builder in self.sequence_builders.items():
+            builder = builder.fork(program, program._timeline)
+            program.sequence_builders[name] = builder
+            setattr(program, name, builder)
+        return program
+
     def __getitem__(self, item):
         if item not in self.sequence_builders:
             raise Exception(f"no sequencer named {item}")
@@ -57,30 +100,54 @@ class Program:
                 listing=False, json=True, optimize=1):
         # store compiled sequences
         self._q1asm = {}
+        self._statistics = {}
 
         start_compile = time.perf_counter()
         for builder in self.sequence_builders.values():
             g = Q1asmGenerator(add_comments=add_comments,
                                optimize=optimize)
             g.repetitions = self.repetitions
+            g.average_repetitions = self.average_repetitions
             start = time.perf_counter()
-            builder.compile(g, annotate=annotate)
+            with profiler.span("compile", builder.name):
+                builder.compile(g, annotate=annotate)
             end = time.perf_counter()
             d1 = (end-start)*1000
             start = end
             filename = self.seq_filename(builder.name) if listing or json else None
-            g.assemble(listing=listing, json_output=json, filename=filename)
+            with profiler.span("assemble", builder.name):
+                g.assemble(listing=listing, json_output=json, filename=filename)
             self._q1asm[builder.name] = g.q1asm
+            self._statistics[builder.name] = g.statistics
+            for violation in g.statistics.rt_budget_violations:
+                logger.warning(f"{builder.name}: risk of RT EXEC COMMAND UNDERFLOW in {violation}")
             end = time.perf_counter()
             d2 = (end-start)*1000
             if Program.verbose:
                 logger.debug(f"compile {builder.name} {d1:5.2f} {d2:5.2f} ms")
+                logger.debug(f"{builder.name} {g.statistics}")
         duration = time.perf_counter() - start_compile
         logger.debug(f"Total compilation {duration*1000:5.2f} ms")
 
+    @property
+    def duration(self):
+        '''
+        Expected duration of the program in ns including loops and repetitions.
+        Waits with a time in a register are not included.
+        '''
+        duration = max((builder.duration for builder in self.sequence_builders.values()), default=0)
+        # start_main waits 100 ns before the first repetition.
+        return 100 + self.repetitions * duration
+
     def q1asm(self, name):
         return self._q1asm[name]
 
+    def statistics(self, name) -> ProgramStatistics:
+        '''
+        Size and resource usage of the compiled program of the sequencer.
+        '''
+        return self._statistics[name]
+
     def _add_statement(self, statement, init_section=False):
         if not isinstance(statement, RegisterAssignment):
             raise Q1InternalError(f"Illegal statement for program {statement}")
@@ -154,9 +221,9 @@ class Program:
         for s in self.sequence_builders.values():
             s.latch_reset(t_offset=t_offset)
 
-    def add_comment(self, comment):
+    def add_comment(self, comment, *args):
         for s in self.sequence_builders.values():
-            s.add_comment(comment)
+            s.add_comment(comment, *args)
 
     def wait(self, t):
         if isinstance(t, Number):
@@ -182,6 +249,36 @@ class Program:
             self.wait(duration)
             self.set_offsets(sequencers, [0.0]*len(sequencers), t_offset=0)
 
+    def block_pulses(self, times, channels, amplitudes, durations, sequencers=None, t_offset=0):
+        '''
+        Adds block pulses on multiple sequencers in one pass.
+
+        Args:
+            times (array[int]): start times of the pulses relative to current time + t_offset.
+            channels (array): sequencer name per pulse, or index in `sequencers`.
+            amplitudes (array[float]): amplitudes of the pulses.
+            durations (array[int]): durations of the pulses.
+            sequencers (list[str] | None): sequencer names for channel indices.
+
+        See `ControlBuilder.block_pulses` for the timing constraints.
+        '''
+        times = np.asarray(times)
+        channels = np.asarray(channels)
+        amplitudes = np.asarray(amplitudes)
+        durations = np.asarray(durations)
+        if not (times.shape == channels.shape == amplitudes.shape == durations.shape):
+            raise Q1ValueError("times, channels, amplitudes and durations must have equal length")
+        channel_ids, inverse = np.unique(channels, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(channel_ids)+1))
+        self._timeline.disable_update()
+        for i, channel in enumerate(channel_ids.tolist()):
+            s = self[sequencers[channel] if sequencers is not None else channel]
+            selection = order[bounds[i]:bounds[i+1]]
+            s.block_pulses(times[selection], amplitudes[selection], durations[selection],
+                           t_offset=t_offset)
+        self._timeline.enable_update()
+
     def ramp(self, duration, sequencers, v_start, v_stop, t_offset=0):
         self._timeline.disable_update()
         for s, v1, v2 in zip(sequencers, v_start, v_stop):
@@ -3,7 +3,7 @@ import numpy as np
 
 from .sequencer import SequenceBuilder
 from .sequencer_data import Wave, WaveCollection
-from q1pulse.lang.exceptions import Q1ValueError, Q1TypeError
+from q1pulse.lang.exceptions import Q1ValueError, Q1TypeError, Q1TimingError
 from q1pulse.lang.math_expressions import Expression
 from q1pulse.lang.register import Register
 from q1pulse.lang.timed_statements import (
@@ -29,6 +29,11 @@ class ControlBuilder(SequenceBuilder):
         self._mixer_gain_ratio = None
         self._mixer_phase_offset_degree = None
 
+    def fork(self, program, timeline):
+        builder = super().fork(program, timeline)
+        builder._waves = self._waves.copy()
+        return builder
+
     @property
     def enabled_paths(self):
         return self._enabled_paths
@@ -136,7 +141,7 @@ class ControlBuilder(SequenceBuilder):
         self._add_statement(SetPhaseStatement(t1, phase, hires_reg))
 
     def block_pulse(self, duration, amplitude0, amplitude1=None, t_offset=0):
-        self.add_comment(f'block_pulse({duration}, {amplitude0}, {amplitude1})')
+        self.add_comment('block_pulse({}, {}, {})', duration, amplitude0, amplitude1)
         if not isinstance(duration, (Register, Expression)):
             with self._local_timeline(t_offset=t_offset, duration=duration):
                 self.set_offset(amplitude0, amplitude1)
@@ -150,6 +155,67 @@ class ControlBuilder(SequenceBuilder):
             self._program.wait(duration)
             self.set_offset(0.0, None)
 
+    def block_pulses(self, times, amplitudes, durations, t_offset=0):
+        '''
+        Adds block pulses on path 0 in one pass.
+
+        Args:
+            times (array[int]): start times of the pulses relative to current time + t_offset.
+            amplitudes (array[float]): amplitudes of the pulses.
+            durations (array[int]): durations of the pulses.
+
+        The pulses may not overlap. The time between the end of a pulse and the
+        start of the next pulse must be 0 or at least 4 ns. Adjacent pulses are
+        merged into one change of the offset.
+        '''
+        times = np.asarray(times, dtype=np.int64)
+        amplitudes = np.asarray(amplitudes, dtype=float)
+        durations = np.asarray(durations, dtype=np.int64)
+        if not (times.shape == amplitudes.shape == durations.shape) or times.ndim != 1:
+            raise Q1ValueError('times, amplitudes and durations must be 1D arrays with equal length')
+        if len(times) == 0:
+            return
+        if self._local_time_active:
+            raise Q1ValueError('block_pulses cannot be used in a local timeline')
+        if np.any(durations < SequenceBuilder.MIN_DURATION):
+            raise Q1TimingError(f'Pulse duration must be at least {SequenceBuilder.MIN_DURATION} ns')
+        if np.any((amplitudes < -1.0) | (amplitudes > 1.0)):
+            raise Q1ValueError(f'channel {self.name} amplitude out of range: '
+                               f'({np.min(amplitudes)}, {np.max(amplitudes)})')
+        if np.any(times < 0):
+            raise Q1TimingError('Pulse time must be positive')
+
+        order = np.argsort(times, kind='stable')
+        starts = times[order] + (self.current_time + t_offset)
+        ends = starts + durations[order]
+        amplitudes = amplitudes[order]
+        gaps = starts[1:] - ends[:-1]
+        if np.any(gaps < 0):
+            i = int(np.argmax(gaps < 0))
+            raise Q1TimingError(f'Overlapping pulses at t={starts[i]} and t={starts[i+1]}')
+        if np.any((gaps > 0) & (gaps < SequenceBuilder.MIN_DURATION)):
+            i = int(np.argmax((gaps > 0) & (gaps < SequenceBuilder.MIN_DURATION)))
+            raise Q1TimingError(f'Time between pulses must be at least 4 ns: '
+                                f'pulse ends at t={ends[i]}, next starts at t={starts[i+1]}')
+
+        # offset changes: start of every pulse and end of pulse if not followed directly by next pulse.
+        n = len(starts)
+        change_times = np.empty(2*n, dtype=np.int64)
+        change_times[0::2] = starts
+        change_times[1::2] = ends
+        values = np.zeros(2*n)
+        values[0::2] = amplitudes
+        keep = np.ones(2*n, dtype=bool)
+        keep[1:-1:2] = gaps > 0
+
+        self.add_comment('block_pulses({} pulses, t={}-{})', n, starts[0], ends[-1])
+        statements = [
+            AwgDcOffsetStatement(t, value, None)
+            for t, value in zip(change_times[keep].tolist(), values[keep].tolist())
+            ]
+        self._add_timed_statements(statements)
+        self.set_pulse_end(int(ends[-1]))
+
     def shaped_pulse(self, wave0, amplitude0=None, wave1=None, amplitude1=None, t_offset=0):
         '''
         When amplitude is None, it is assumed that the gain has already been set to
@@ -159,7 +225,7 @@ class ControlBuilder(SequenceBuilder):
         wave1 = self._translate_wave(wave1)
         wave0_name = wave0.name if wave0 is not None else None
         wave1_name = wave1.name if wave1 is not None else None
-        self.add_comment(f'shaped_pulse({wave0_name}, {amplitude0}, {wave1_name}, {amplitude1})')
+        self.add_comment('shaped_pulse({}, {}, {}, {})', wave0_name, amplitude0, wave1_name, amplitude1)
 
         duration = max(
                 len(wave0.data) if wave0 is not None else 0,
@@ -177,7 +243,7 @@ class ControlBuilder(SequenceBuilder):
                               'Unroll loop using Python for-loop.')
 
         ramp_loop_time = 100
-        self.add_comment(f'ramp({duration}, {v_start}, {v_end})')
+        self.add_comment('ramp({}, {}, {})', duration, v_start, v_end)
         with self._local_timeline(t_offset=t_offset, duration=duration):
             if duration <= ramp_loop_time:
                 # w_ramp is a wave from 0 to 1.0
@@ -300,7 +366,7 @@ class ControlBuilder(SequenceBuilder):
         if duration < SequenceBuilder.MIN_DURATION:
             raise Q1ValueError(f"Chirp duration of {duration} ns is too short. Minimum is 4 ns.")
 
-        self.add_comment(f'chirp({duration}, {amplitude}, {f_start/1e6:7.3f}, {f_end/1e6:7.3f} MHz)')
+        self.add_comment('chirp({}, {}, {:7.3f}, {:7.3f} MHz)', duration, amplitude, f_start/1e6, f_end/1e6)
         with self._local_timeline(t_offset=t_offset, duration=duration):
             f_step = (f_end - f_start) * chirp_loop_time / duration
             # Note: For the loop we need an integer frequency step. This could add a small
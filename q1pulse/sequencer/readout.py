@@ -24,6 +24,12 @@ class ReadoutBuilder(ControlBuilder):
         self._ttl_acq_auto_bin_incr_en = None
         self._ttl_acq_threshold = None
 
+    def fork(self, program, timeline):
+        builder = super().fork(program, timeline)
+        builder._acquisitions = self._acquisitions.copy()
+        builder._weights = self._weights.copy()
+        return builder
+
     @property
     def thresholded_acq_rotation(self):
         return self._thresholded_acq_rotation
@@ -95,7 +101,7 @@ class ReadoutBuilder(ControlBuilder):
         return self._weights.add_weight(name, data)
 
     def acquire(self, acquisition, bin_index='increment', t_offset=0):
-        self.add_comment(f'acquire({acquisition}, {bin_index})')
+        self.add_comment('acquire({}, {})', acquisition, bin_index)
         acquisition = self._translate_acquisition(acquisition)
         t1 = self.current_time + t_offset
         self.set_pulse_end(t1)
@@ -109,7 +115,7 @@ class ReadoutBuilder(ControlBuilder):
             self._add_statement(AcquireStatement(t1, acquisition, bin_index))
 
     def acquire_weighed(self, acquisition, bin_index, weight0, weight1=None, t_offset=0):
-        self.add_comment(f'acquire_weighed({acquisition}, {bin_index})')
+        self.add_comment('acquire_weighed({}, {})', acquisition, bin_index)
         if weight1 is None:
             weight1 = weight0
         acquisition = self._translate_acquisition(acquisition)
@@ -128,7 +134,7 @@ class ReadoutBuilder(ControlBuilder):
             self._add_statement(st)
 
     def acquire_ttl(self, acquisition, bin_index, enable, t_offset=0):
-        self.add_comment(f'acquire_ttl({acquisition}, {bin_index}, {enable})')
+        self.add_comment('acquire_ttl({}, {}, {})', acquisition, bin_index, enable)
         acquisition = self._translate_acquisition(acquisition)
         t1 = self.current_time + t_offset
         self.set_pulse_end(t1)
@@ -144,7 +150,7 @@ class ReadoutBuilder(ControlBuilder):
             self._add_statement(AcquireTtlStatement(t1, acquisition, bin_index, enable))
 
     def repeated_acquire(self, n, period, acquisition, bin_index='increment', t_offset=0):
-        self.add_comment(f'repeated_acquire({n}, {period}, {acquisition}, {bin_index})')
+        self.add_comment('repeated_acquire({}, {}, {}, {})', n, period, acquisition, bin_index)
         if period < ReadoutBuilder.MIN_ACQUISITION_INTERVAL:
             raise Q1ValueError(f'Acquisition period ({period} ns) too small. '
                                f'Minimum is {ReadoutBuilder.MIN_ACQUISITION_INTERVAL} ns')
@@ -181,7 +187,8 @@ class ReadoutBuilder(ControlBuilder):
             Experimentally it is determined that the nco_prop_delay should be 146 ns + delay in lines (~ 4 ns/m),
             and acq_delay should be nco_prop_delay + 4 ns.
         """
-        self.add_comment(f'acquire_frequency_sweep({n}, {period}, {f_start}, {f_stop} {acquisition}, {bin_index})')
+        self.add_comment('acquire_frequency_sweep({}, {}, {}, {} {}, {})',
+                         n, period, f_start, f_stop, acquisition, bin_index)
         if period < ReadoutBuilder.MIN_ACQUISITION_INTERVAL:
             raise Q1ValueError(f'Acquisition period ({period} ns) too small. '
                                f'Minimum is {ReadoutBuilder.MIN_ACQUISITION_INTERVAL} ns')
@@ -213,7 +220,7 @@ class ReadoutBuilder(ControlBuilder):
 
     def repeated_acquire_weighed(self, n, period, acquisition, bin_index,
                                  weight0, weight1=None, t_offset=0):
-        self.add_comment(f'repeated_acquire_weighed({n}, {period}, {acquisition}, {bin_index})')
+        self.add_comment('repeated_acquire_weighed({}, {}, {}, {})', n, period, acquisition, bin_index)
         if period < ReadoutBuilder.MIN_ACQUISITION_INTERVAL:
             raise Q1ValueError(f'Acquisition period ({period} ns) too small. '
                                f'Minimum is {ReadoutBuilder.MIN_ACQUISITION_INTERVAL} ns')
@@ -11,17 +11,22 @@ from ..lang.exceptions import (
         Q1StateError, Q1Exception,
         Q1InternalError, Q1SequenceError,
         Q1TimingError, Q1SyntaxError,
+        Q1NameError,
         )
+from ..lang.base import Comment
 from ..lang.sequence import Sequence
 from ..lang.loops import Loop
 from ..lang.registers import Registers
+from ..lang.register_statements import RegisterAssignment
 from ..lang.timed_statements import WaitRegStatement, TimedStatement
 from ..lang.flow_statements import (
         LoopDurationStatement,
         LoopStatement, EndLoopStatement,
         ArrayLoopStatement, EndArrayLoopStatement,
+        Subroutine, CallStatement, EndCallStatement,
         )
 from ..lang.loops import LinspaceLoop, RangeLoop, ArrayLoop
+from ..lang.timeline import Timeline
 from ..lang.simulator_statements import LogStatement
 from ..lang.conditions import (
         LatchEnableStatement, LatchResetStatement,
@@ -40,6 +45,14 @@ class SequenceBuilder(BuilderBase):
     Q1Instrument can suppress the traceback.
     '''
 
+    add_comments = True
+    '''
+    Adds comments describing the pulses to the sequence.
+    The comments are only used in the listing and describe. Disabling the
+    comments saves build time for large programs.
+    Q1Instrument can suppress the comments.
+    '''
+
     MIN_DURATION = 4
 
     def __init__(self, name):
@@ -56,12 +69,35 @@ class SequenceBuilder(BuilderBase):
         self._conditional_block = None
         self._in_condition = False
         self._trigger_counters = []
+        self._subroutines = {}
+        self._subroutine = None
 
     def start_sequence(self, program, timeline):
         self._program = program
         self._timeline = timeline
         self._sequence_push(Sequence(self._timeline))
 
+    def fork(self, program, timeline):
+        '''
+        Returns a copy of this builder for program.
+        The statements added till now are shared with the copy. Statements
+        added after the fork are only added to one of the builders.
+        '''
+        if (len(self._sequence_stack) > 1 or self._local_time_active
+                or self._conditional_block or self._subroutine):
+            raise Q1StateError('Sequence can only be forked outside loops, conditional blocks and subroutines')
+        builder = copy(self)
+        builder.Rs = self.Rs._fork(builder)
+        builder._trigger_counters = list(self._trigger_counters)
+        builder._subroutines = dict(self._subroutines)
+        builder._init_sequence = self._init_sequence.fork(None)
+        builder._compiled = False
+        builder._program = program
+        builder._timeline = timeline
+        builder._sequence_stack = []
+        builder._sequence_push(self._sequence_stack[0].fork(timeline))
+        return builder
+
     def _sequence_push(self, sequence):
         self._sequence_stack.append(sequence)
         self.sequence = sequence
@@ -72,7 +108,7 @@ class SequenceBuilder(BuilderBase):
 
     def _add_statement(self, statement, init_section=False):
         self._check_time(statement)
-        if SequenceBuilder.add_traceback_to_instructions and not isinstance(statement, str):
+        if SequenceBuilder.add_traceback_to_instructions and not isinstance(statement, (str, Comment)):
             self._add_traceback(statement)
         if self._compiled:
             raise Q1StateError('Program cannot be changed after compilation')
@@ -81,6 +117,25 @@ class SequenceBuilder(BuilderBase):
         else:
             self.sequence.add(statement)
 
+    def _add_timed_statements(self, statements):
+        '''
+        Adds a list of timed statements sorted on time.
+        The spacing of the statements must have been validated by the caller.
+        The statements share the traceback of the caller.
+        '''
+        if not statements:
+            return
+        if self._compiled:
+            raise Q1StateError('Program cannot be changed after compilation')
+        self._check_time(statements[0])
+        if SequenceBuilder.add_traceback_to_instructions:
+            self._add_traceback(statements[0])
+            tb = statements[0].tb
+            for statement in statements:
+                statement.tb = tb
+        self.sequence.extend(statements)
+        self._last_timed_statement = statements[-1]
+
     def _check_time(self, statement):
         # TODO: Distinguish parameter operations vs RT IO / RT control instructions.
         if not isinstance(statement, TimedStatement):
@@ -126,7 +181,16 @@ class SequenceBuilder(BuilderBase):
     def wait(self, t):
         self.set_pulse_end(self.current_time + t)
 
-    def add_comment(self, comment):
+    def add_comment(self, comment, *args):
+        '''
+        Adds a comment to the sequence.
+        If args are passed, then comment is a format string that is only
+        formatted when the comment is used.
+        '''
+        if not SequenceBuilder.add_comments:
+            return
+        if args:
+            comment = Comment(comment, args)
         self._add_statement(comment)
 
     def log(self, msg, var=None, time=False):
@@ -142,15 +206,36 @@ class SequenceBuilder(BuilderBase):
         lines = []
         self._init_sequence.describe(init, init_section=True)
         self._sequence_stack[0].describe(lines)
+        for subroutine in self._subroutines.values():
+            lines.append(f'{repr(subroutine)} ({subroutine.duration} ns):')
+            subroutine.sequence.describe(lines, indent=1)
         fp.write(f'Sequence:{self.name}\n')
         for line in init + lines:
             fp.write(line+'\n')
         fp.write('\n')
 
+    def _reset_init_registers(self, generator):
+        '''
+        Assigns the initial values to the registers of the init section again.
+        The registers are allocated in the init section, which is compiled
+        before the subroutines, because the subroutines can use them.
+        '''
+        for statement in self._init_sequence.statements:
+            if isinstance(statement, RegisterAssignment):
+                RegisterAssignment(statement.destination, statement.value_or_expression).write_instruction(generator)
+
     def compile(self, generator, annotate=False):
         try:
             self._init_sequence.compile(generator, annotate)
+            for subroutine in self._subroutines.values():
+                generator.start_subroutine(subroutine.name)
+                subroutine.sequence.compile(generator, annotate)
+                generator.end_subroutine(subroutine.name, subroutine.duration)
             generator.start_main()
+            if generator.average_repetitions:
+                # Reset the acquisition bin registers at the start of every
+                # repetition. The acquisitions are averaged in the bins.
+                self._reset_init_registers(generator)
             self._sequence_stack[0].compile(generator, annotate)
             generator.end_main(self.end_time)
             self.modifies_frequency = generator.modifies_frequency
@@ -220,6 +305,14 @@ class SequenceBuilder(BuilderBase):
     def end_time(self):
         return self.sequence.timeline.end_time
 
+    @property
+    def duration(self):
+        '''
+        Expected duration of the sequence in ns including all loop iterations.
+        Waits with a time in a register are not included.
+        '''
+        return self.end_time + self._sequence_stack[0].repeated_loop_time()
+
     def enter_loop(self, loop):
         loop_sequence = Sequence(self._timeline)
         if isinstance(loop, (RangeLoop, LinspaceLoop)):
@@ -266,6 +359,61 @@ class SequenceBuilder(BuilderBase):
             self._sequence_pop()
             self.set_pulse_end(t_start + n * t_loop)
 
+    @contextmanager
+    def subroutine(self, name):
+        '''
+        Defines a subroutine that is compiled once and executed with `call`.
+        The time in the subroutine starts at 0. The duration of the subroutine
+        is the end time of the statements in the subroutine.
+        Subroutines can call subroutines that have been defined before.
+        Registers used in a subroutine must be assigned in the subroutine.
+        Loops with a register counter are not supported in a subroutine.
+
+        Example:
+            with P1.subroutine('x90'):
+                P1.block_pulse(20, 0.5)
+            P1.call('x90')
+        '''
+        if self._subroutine is not None:
+            raise Q1SyntaxError('Subroutine definitions cannot be nested')
+        if self._local_time_active:
+            raise Q1SyntaxError('Subroutine cannot be defined in a local timeline')
+        if name in self._subroutines:
+            raise Q1NameError(f'Subroutine {name} already defined')
+        if not name.isidentifier():
+            raise Q1NameError(f'Invalid subroutine name {name}')
+        subroutine = Subroutine(name, Sequence(Timeline()))
+        timeline = self._timeline
+        last_timed_statement = self._last_timed_statement
+        self._timeline = subroutine.sequence.timeline
+        self._last_timed_statement = None
+        self._subroutine = subroutine
+        self._sequence_push(subroutine.sequence)
+
+        yield
+
+        if subroutine.sequence.repeated_loop_time() > 0:
+            raise Q1SyntaxError(f'Loops are not supported in subroutine {name}')
+        self._sequence_pop()
+        subroutine.close(self._last_timed_statement)
+        self._timeline = timeline
+        self._last_timed_statement = last_timed_statement
+        self._subroutine = None
+        self._subroutines[name] = subroutine
+
+    def call(self, name, t_offset=0):
+        '''
+        Executes the subroutine at current time + t_offset.
+        '''
+        try:
+            subroutine = self._subroutines[name]
+        except KeyError:
+            raise Q1NameError(f'Subroutine {name} not defined') from None
+        t1 = self.current_time + t_offset
+        self._add_statement(CallStatement(t1, subroutine))
+        self._add_statement(EndCallStatement(t1 + subroutine.last_time, subroutine))
+        self.set_pulse_end(t1 + subroutine.duration)
+
     def _add_reg_wait(self, reg):
         self._add_statement(WaitRegStatement(self.end_time, reg))
 
@@ -337,7 +485,7 @@ class SequenceBuilder(BuilderBase):
     def exit_condition(self, end_time=None):
         if end_time is None:
             end_time = self.end_time
-        self.add_comment(f'Condition end time: {end_time}')
+        self.add_comment('Condition end time: {}', end_time)
         self._conditional_block.set_end_time(end_time)
         self._in_condition = False
         self._sequence_pop()
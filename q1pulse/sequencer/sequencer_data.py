@@ -14,6 +14,11 @@ class WaveCollection:
     def __init__(self):
         self._waves = {}
 
+    def copy(self):
+        collection = WaveCollection()
+        collection._waves = dict(self._waves)
+        return collection
+
     def __getitem__(self, name):
         return self.get_wave(name)
 
@@ -74,6 +79,11 @@ class AcquisitionCollection:
     def __init__(self):
         self._acquisitions = {}
 
+    def copy(self):
+        collection = AcquisitionCollection()
+        collection._acquisitions = dict(self._acquisitions)
+        return collection
+
     def __getitem__(self, name):
         return self._get_acquisition(name)
 
@@ -104,6 +114,11 @@ class WeightCollection:
     def __init__(self):
         self._weights = {}
 
+    def copy(self):
+        collection = WeightCollection()
+        collection._weights = dict(self._weights)
+        return collection
+
     def __getitem__(self, name):
         return self.get_weight(name)
 
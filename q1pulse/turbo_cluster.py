@@ -1,15 +1,24 @@
-import io
 import json
 import logging
+import os
 import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, ExitStack
+from dataclasses import dataclass
 from functools import partial
-from typing import Any
+from pathlib import Path
+from typing import Any, Callable, Iterator
 
+import numpy as np
 from qblox_instruments import Cluster
 from qblox_instruments.scpi import Cluster as ClusterScpi
 from qblox_instruments.ieee488_2 import Ieee488_2, IpTransport
 from qblox_instruments.pnp import resolve
 from q1pulse.util.qblox_version import check_qblox_instrument_version
+from q1pulse.modules.acquisition_data import RAW_BINS_DTYPE, convert_raw_bins
+from q1pulse.util.frozen_json import freeze, cow_copy
 
 from qblox_instruments import (
     SequencerStatus,
@@ -40,6 +49,11 @@ class TurboCluster(Cluster):
         * Using a TCP/IP connection per module allowing commands to be sent to multiple modules concurrently.
         * Sending batches of commands and requests to a module and then read the batch of responses.
         * Caching module and sequencer configuration.
+
+    TurboCluster is thread-safe. Every module connection has a lock that is held for the
+    complete transaction of requests and responses. Binned acquisition data is read via
+    separate bulk connections, so a large transfer does not block the status polling of
+    other threads. `get_connection_statistics()` returns the contention statistics.
     """
 
     use_configuration_cache = True
@@ -47,6 +61,19 @@ class TurboCluster(Cluster):
     faster, but could fail in scenarios where other Cluster objects can modify the configuration.
     """
 
+    configuration_cache_dir: str | None = None
+    """Directory for the persistent configuration cache. If not None, the cached configurations
+    are stored on `close()` and `save_configuration_cache()`.
+    The configurations in the cache are read from the modules at connect with one request
+    per module. Only modules with unchanged serial number and firmware are read.
+    """
+
+    n_bulk_connections = 1
+    """Maximum number of additional connections per module for bulk reads of acquisition data.
+    The connections are opened on first use. If 0, acquisition data is read via the
+    main connection of the module.
+    """
+
     def __init__(
             self,
             name: str,
@@ -63,54 +90,80 @@ class TurboCluster(Cluster):
                 f"Use qblox-pnp tool to rectify; serial number is {addr_info.address}"
             )
         self._ip_address = addr_info.address
-        self._connections: dict[int, Ieee488_2] = {}
+        # Connections are opened concurrently when the modules are known, or on first use.
+        self._connections = LazyConnections(self._create_connection)
         self._needs_check: dict[int, bool] = {}
+        # slot 0 is the CMM
+        self._slot_locks = {slot: SlotLock() for slot in range(0, 21)}
+        self._bulk_pools: dict[int, ConnectionPool] = {}
+        self._batch_state = _BatchState()
         self._clear_cache()
         for slot in range(1, 21):
-            ip_config = resolve(f"{self._ip_address}/{slot}")
-            transport = IpTransport(ip_config.address, ip_config.scpi_port, timeout=5.0)
-            self._connections[slot] = Ieee488_2(transport)
+            self._bulk_pools[slot] = ConnectionPool(
+                partial(self._create_connection, slot),
+                TurboCluster.n_bulk_connections)
         super().__init__(name, identifier, port, debug=debug)
-        for slot in range(1, 21):
+        # NOTE: module.present() queries the CMM. The module handles contain the present modules.
+        for slot in self._mod_handles:
             module = self.modules[slot-1]
-            if module.present():
-                for seq_nr in range(6):
-                    seq = module.sequencers[seq_nr]
-                    # TODO: this might not be needed anymore for version >= 0.18
-                    # disable slow validators
-                    seq.sequence._vals = []
-        # SCPI transaction map is added in v0.18 and used for commands with multiple reads like get_acquistion_data
-        if hasattr(self, "_scpi_transaction_connection_map"):
-            from qblox_instruments.native.helpers import Ieee488_2Connection
-            for slot, conn in self._connections.items():
-                self._scpi_transaction_connection_map[slot] = Ieee488_2Connection(conn)
+            for seq_nr in range(6):
+                seq = module.sequencers[seq_nr]
+                # TODO: this might not be needed anymore for version >= 0.18
+                # disable slow validators
+                seq.sequence._vals = []
         # Disable continuous error checking
         self._debug = 2
         self._init_configuration_cache()
 
+    def _create_connection(self, slot: int) -> Ieee488_2:
+        ip_config = resolve(f"{self._ip_address}/{slot}")
+        transport = BufferedIpTransport(ip_config.address, ip_config.scpi_port, timeout=5.0)
+        return Ieee488_2(transport)
+
+    def _create_mod_handles(self, slot: int | None = None) -> None:
+        # Called by qblox-instruments (v0.18+) when the modules in the cluster are known.
+        # Connect to these modules in parallel.
+        super()._create_mod_handles(slot)
+        self._connections.connect_async(self._mod_handles)
+
     def _write(self, cmd_str):
-        conn, cmd = self._get_connection_and_remove_slot(cmd_str)
-        conn._write(cmd)
+        conn, cmd, slot = self._get_connection_and_remove_slot(cmd_str)
+        batch = self._batch_state.commands
+        if batch is not None and slot:
+            batch.setdefault(slot, []).append(cmd)
+            return
+        self._flush_batch(slot)
+        with self._slot_locks[slot]:
+            conn._write(cmd)
         # logger.debug(f"write {cmd_str}")
 
     def _write_bin(self, cmd_str, bin_block):
-        conn, cmd = self._get_connection_and_remove_slot(cmd_str)
-        conn._write_bin(cmd, bin_block)
+        conn, cmd, slot = self._get_connection_and_remove_slot(cmd_str)
+        self._flush_batch(slot)
+        with self._slot_locks[slot]:
+            conn._write_bin(cmd, bin_block)
         # logger.debug(f"write_bin {cmd_str}")
 
     def _read_bin(self, cmd_str, flush_line_end=True):
-        conn, cmd = self._get_connection_and_remove_slot(cmd_str)
-        res = conn._read_bin(cmd, flush_line_end)
+        conn, cmd, slot = self._get_connection_and_remove_slot(cmd_str)
+        self._flush_batch(slot)
+        with self._slot_locks[slot]:
+            res = conn._read_bin(cmd, flush_line_end)
         # logger.debug(f"read_bin {cmd_str}")
         return res
 
     def _read(self, cmd_str: str) -> str:
-        conn, cmd = self._get_connection_and_remove_slot(cmd_str)
-        res = conn._read(cmd)
+        conn, cmd, slot = self._get_connection_and_remove_slot(cmd_str)
+        self._flush_batch(slot)
+        with self._slot_locks[slot]:
+            res = conn._read(cmd)
         # logger.debug(f"read {cmd_str}")
         return res
 
-    def _get_connection_and_remove_slot(self, cmd: str) -> tuple[Ieee488_2, str]:
+    def _get_connection_and_remove_slot(self, cmd: str) -> tuple[Ieee488_2, str, int]:
+        """Returns the connection, the command without slot prefix and the slot.
+        Slot 0 is returned for commands for the CMM.
+        """
         if cmd.startswith("SLOT"):
             slot_str, module_cmd = cmd.split(":", maxsplit=1)
             if len(slot_str) > 4:
@@ -119,8 +172,111 @@ class TurboCluster(Cluster):
                 except ValueError:
                     raise Exception(f"Connect extract slot index from '{cmd}'")
                 self._needs_check[slot] = True
-                return self._connections[slot], module_cmd
-        return super(), cmd
+                return self._connections[slot], module_cmd, slot
+        return super(), cmd, 0
+
+    # ------------------------------------------------------------------
+    # Configuration of a sequencer results in many small commands.
+    # In a batch the commands are collected per module and sent with a single
+    # socket operation. The batch is per thread.
+    # Commands for the CMM are not batched. They are sent after the pending
+    # commands for the modules.
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Collects the commands written in the context and sends them per module
+        in a single operation at the end of the context.
+        Pending commands for a module are sent before a request is sent to the module.
+        All pending commands are sent before a command or request is sent to the CMM.
+        Nested batches are merged with the outer batch.
+
+        Example:
+            with cluster.batch():
+                cluster.module2.sequencer0.offset_awg_path0(0.1)
+                cluster.module2.sequencer0.offset_awg_path1(0.1)
+                cluster.module2.arm_sequencer(0)
+        """
+        if self._batch_state.commands is not None:
+            yield
+            return
+        self._batch_state.commands = {}
+        try:
+            yield
+        finally:
+            try:
+                self._flush_batch()
+            finally:
+                self._batch_state.commands = None
+
+    def _flush_batch(self, slot: int | None = None) -> None:
+        """Sends the pending commands of the batch for the slot, or for all slots if slot is None or 0.
+        All slots are flushed for slot 0, because commands for the CMM can affect all modules.
+        """
+        batch = self._batch_state.commands
+        if not batch:
+            return
+        if not slot:
+            slots = list(batch)
+        elif slot in batch:
+            slots = [slot]
+        else:
+            return
+        for slot in slots:
+            commands = batch.pop(slot)
+            with self._slot_locks[slot]:
+                self._connections[slot]._transport.write_lines(commands)
+
+    @contextmanager
+    def _lock_slots(self, slots) -> Iterator[None]:
+        """Holds the locks of the slots for a transaction on multiple connections.
+        The locks are acquired in slot order to prevent deadlocks.
+        """
+        with ExitStack() as stack:
+            for slot in sorted(set(slots)):
+                stack.enter_context(self._slot_locks[slot])
+            yield
+
+    @contextmanager
+    def scpi_transaction(self, slot: int, sequencer: int):
+        """
+        Holds the lock of the slot during the transaction of qblox-instruments.
+        See `Cluster.scpi_transaction`.
+        """
+        self._flush_batch(slot)
+        # SCPI transaction map is added in v0.18 and used for commands with multiple reads like get_acquistion_data
+        if slot not in self._scpi_transaction_connection_map:
+            from qblox_instruments.native.helpers import Ieee488_2Connection
+            self._scpi_transaction_connection_map[slot] = Ieee488_2Connection(self._connections[slot])
+        with self._slot_locks[slot]:
+            with super().scpi_transaction(slot, sequencer) as transaction:
+                yield transaction
+
+    def get_connection_statistics(self, bulk: bool = False) -> dict[int, "ConnectionStatistics"]:
+        """
+        Returns the usage and contention statistics per slot. Slot 0 is the CMM.
+
+        Parameters
+        ----------
+        bulk : bool
+            If True return the statistics of the bulk connections.
+        """
+        if bulk:
+            locks = self._bulk_pools
+        else:
+            locks = self._slot_locks
+        return {
+            slot: lock.statistics.copy()
+            for slot, lock in locks.items()
+            if lock.statistics.n_transactions
+            }
+
+    def reset_connection_statistics(self) -> None:
+        for lock in self._slot_locks.values():
+            lock.statistics = ConnectionStatistics()
+        for pool in self._bulk_pools.values():
+            pool.statistics = ConnectionStatistics()
 
     # ------------------------------------------------------------------
     # Versions <= v0.16 call arm_sequencer start_sequencer and stop_sequencer directly on the original
@@ -243,7 +399,9 @@ class TurboCluster(Cluster):
         if slot is None:
             return super().get_system_error()
         else:
-            return f"slot{slot}: " + self._connections[slot]._read("SYSTem:ERRor:NEXT?")
+            self._flush_batch(slot)
+            with self._slot_locks[slot]:
+                return f"slot{slot}: " + self._connections[slot]._read("SYSTem:ERRor:NEXT?")
 
     def get_num_system_error(self, slot: int | None = None) -> int:
         """
@@ -265,7 +423,9 @@ class TurboCluster(Cluster):
         else:
             if not self._needs_check.get(slot, False):
                 return 0
-            cnt = int(self._connections[slot]._read("SYSTem:ERRor:COUNt?"))
+            self._flush_batch(slot)
+            with self._slot_locks[slot]:
+                cnt = int(self._connections[slot]._read("SYSTem:ERRor:COUNt?"))
             if cnt == 0:
                 self._needs_check[slot] = False
             return cnt
@@ -275,6 +435,7 @@ class TurboCluster(Cluster):
         Returns all the system errors for all connections.
         Error counts are requested simultaneously on all connections to speed up communication.
         Error messages are requested sequentially, because there is no need to hurry when there are errors.
+        The bulk connections that are not in use are checked as well.
 
         Note:
             The simultaneous requests save ~1 ms per module
@@ -289,23 +450,29 @@ class TurboCluster(Cluster):
                 pass
         err_count_request = "SYSTem:ERRor:COUNt?"
         get_error = "SYSTem:ERRor:NEXT?"
+        self._flush_batch()
+
+        with self._lock_slots(slots):
+            # write all requests
+            for slot in slots:
+                conn = self._connections[slot] if slot else self
+                conn._write(err_count_request)
+            # read all responses
+            for slot in slots:
+                conn = self._connections[slot] if slot else self
+                # read without writing command.
+                response = conn._transport.readline().rstrip()
+                num_err = int(response)
+                for _ in range(num_err):
+                    error = conn._read(get_error)
+                    if slot:
+                        error = f"slot {slot}: " + error
+                    errors.append(error)
+                self._needs_check[slot] = False
 
-        # write all requests
-        for slot in slots:
-            conn = self._connections.get(slot, self)
-            conn._write(err_count_request)
-        # read all responses
-        for slot in slots:
-            conn = self._connections.get(slot, self)
-            # read without writing command.
-            response = conn._transport.readline().rstrip()
-            num_err = int(response)
-            for _ in range(num_err):
-                error = conn._read(get_error)
-                if slot:
-                    error = f"slot {slot}: " + error
-                errors.append(error)
-            self._needs_check[slot] = False
+        for slot, pool in self._bulk_pools.items():
+            if slot not in exclude:
+                errors += [f"slot {slot}: " + error for error in pool.get_system_errors()]
 
         return errors
 
@@ -313,44 +480,129 @@ class TurboCluster(Cluster):
     # Polling the sequencer status for every sequencer in a sequential way takes a lot of time.
     # The method below sends all the status requests for all the sequencers and
     # then reads all the responses.
-    # Note that the implementation uses a local implementation of `readline` that can
-    # read a sequence of responses in a safe way without losing data.
-    # socket.makefile creates a buffer. So all responses should be read using the
-    # same buffer.
+    # The module connections use BufferedIpTransport. All responses, text and binary,
+    # are read via the receive buffer of the connection. So no data is lost
+    # when multiple responses are received at once.
     # ----------------------------------------------------------------
 
-    def get_sequencer_status_multiple(self, sequencers: dict[int, list[int]]) -> tuple[int, int, object]:
+    def get_sequencer_status_multiple(
+            self,
+            sequencers: dict[int, list[int]],
+            parser: Callable[[str], Any] | None = None,
+            ) -> list[tuple[int, int, object]]:
         """
         Returns the status for multiple sequencers using parallel requests.
         Parameters
         ----------
         sequencers : dict[int, list[int]]
             Per slot a list with sequencers to request status from.
+        parser : Callable[[str], Any] | None
+            Function to convert the status response string.
+            If None the response is converted to qblox-instruments SequencerStatus.
 
         Note:
             The simultaneous requests save ~1 ms per sequencer
         """
+        if parser is None:
+            parser = _convert_sequencer_status
+        sequencers = {slot: seq_nums for slot, seq_nums in sequencers.items() if len(seq_nums)}
         results = []
-        # write all requests
-        for slot, seq_nums in sequencers.items():
-            if len(seq_nums) == 0:
-                continue
-            conn = self._connections[slot]
-            for sequencer in seq_nums:
-                conn._write(f"SEQuencer{sequencer}:STATE?")
-
-        # read all responses
-        for slot, seq_nums in sequencers.items():
-            conn = self._connections[slot]
-            filereader = conn._transport._socket.makefile()
-
-            for sequencer in seq_nums:
-                status_str = filereader.readline()
-                status = _convert_sequencer_status(status_str)
-                results.append((slot, sequencer, status))
-            filereader.close()
+        self._flush_batch()
+        with self._lock_slots(sequencers):
+            # write all requests
+            for slot, seq_nums in sequencers.items():
+                conn = self._connections[slot]
+                for sequencer in seq_nums:
+                    conn._write(f"SEQuencer{sequencer}:STATE?")
+
+            # read all responses
+            for slot, seq_nums in sequencers.items():
+                conn = self._connections[slot]
+                status_strs = conn._transport.readlines(len(seq_nums))
+                for sequencer, status_str in zip(seq_nums, status_strs):
+                    status = parser(status_str.rstrip())
+                    results.append((slot, sequencer, status))
         return results
 
+    # ----------------------------------------------------------------
+    # The acquisition data is requested for all acquisitions before the first
+    # response is read. The modules prepare the data in parallel.
+    # The binary blocks are received directly in NumPy arrays.
+    # The data is transferred via a bulk connection of the module, if available.
+    # Multiple threads can read acquisition data from the same module
+    # concurrently, each via its own bulk connection.
+    # ----------------------------------------------------------------
+
+    def get_acquisitions_multiple(self, acquisitions: list[tuple[int, int, str]]) -> list[np.ndarray]:
+        """
+        Returns the binned data of multiple acquisitions using parallel requests.
+        The data is normalized like `get_acquisitions` of qblox-instruments.
+
+        Parameters
+        ----------
+        acquisitions : list[tuple[int, int, str]]
+            List with slot, sequencer and acquisition name.
+
+        Returns
+        -------
+        list[np.ndarray]
+            Per acquisition a structured array with fields
+            "path0", "path1", "threshold" and "avg_cnt".
+
+        Note:
+            The scope data is part of every response. It is read in a
+            scratch buffer and discarded.
+        """
+        slots = sorted(set(slot for slot, _, _ in acquisitions))
+        self._flush_batch()
+        with self._bulk_connections(slots) as connections:
+            # write all requests
+            for slot, sequencer, name in acquisitions:
+                connections[slot]._write(f'SEQuencer{sequencer}:ACQ:ALISt:ACQuisition:DATA? "{name}"')
+
+            # read all responses
+            results = []
+            scratch = np.empty(0, np.uint8)
+            for slot, sequencer, name in acquisitions:
+                transport = connections[slot]._transport
+                # skip scope data, out-of-range and average count of all paths
+                for _ in range(3 * self._n_scope_paths(slot)):
+                    data = _read_bin_block(transport, np.uint8, scratch)
+                    if len(data) > len(scratch):
+                        scratch = data
+                raw_bins = _read_bin_block(transport, RAW_BINS_DTYPE)
+                transport.read_binary(2)  # Consume <CR><LF>
+                results.append(convert_raw_bins(raw_bins))
+        return results
+
+    @contextmanager
+    def _bulk_connections(self, slots: list[int]) -> Iterator[dict[int, Ieee488_2]]:
+        """Acquires a bulk connection for every slot. Slots must be sorted.
+        Uses the locked main connection when bulk connections are disabled.
+        """
+        if TurboCluster.n_bulk_connections == 0:
+            with self._lock_slots(slots):
+                for slot in slots:
+                    self._needs_check[slot] = True
+                yield {slot: self._connections[slot] for slot in slots}
+            return
+        connections = {}
+        failed = True
+        try:
+            for slot in slots:
+                connections[slot] = self._bulk_pools[slot].acquire()
+            yield connections
+            failed = False
+        finally:
+            # a connection with an incomplete response cannot be reused.
+            for slot, conn in connections.items():
+                self._bulk_pools[slot].release(conn, discard=failed)
+
+    def _n_scope_paths(self, slot: int) -> int:
+        if hasattr(self, "_is_qrc_type") and self._is_qrc_type(slot):
+            return 4
+        return 2
+
     # --------------------------------------------------------------------------------
     # The following methods are added to cache the sequencer configuration and
     # reduce the amount of configuration requests every time a setting is changed.
@@ -383,15 +635,161 @@ class TurboCluster(Cluster):
                             func_refs.register(partial(getattr(self, name), slot_id), name)
                             # logger.debug(f"Registered {slot_id}: {name}")
         self._clear_cache()
+        if TurboCluster.use_configuration_cache and TurboCluster.configuration_cache_dir is not None:
+            try:
+                self._load_configuration_cache()
+            except Exception:
+                logger.warning("Failed to load configuration cache", exc_info=True)
+                self._clear_cache()
 
     def reset(self):
         self._clear_cache()
         super().reset()
 
+    def close(self):
+        # NOTE: close can be called multiple times. QCoDeS removes all attributes on close.
+        if (TurboCluster.use_configuration_cache
+                and TurboCluster.configuration_cache_dir is not None
+                and hasattr(self, "_sequencer_config_cache")):
+            try:
+                self.save_configuration_cache()
+            except Exception:
+                logger.warning("Failed to save configuration cache", exc_info=True)
+        if hasattr(self, "_connections"):
+            for pool in self._bulk_pools.values():
+                pool.close()
+            self._connections.close()
+        super().close()
+
+    # --------------------------------------------------------------------------------
+    # The configuration cache can be stored on disk to speed up the start of a new process.
+    # There is no configuration version or checksum on the modules. So the cached values
+    # cannot be validated without reading them. The file only stores which configurations
+    # were used by the previous process. At connect these configurations are requested
+    # from all modules before the first response is read. This costs one round trip per
+    # module, instead of one per configuration on first use.
+    # The module serial number and firmware are checked first, because a request
+    # for a configuration that does not exist on the module does not get a response.
+    # --------------------------------------------------------------------------------
+
+    _configuration_queries = {
+        "sequencer_config": "SEQuencer{}:CONFiguration?",
+        "channel_map": "SEQuencer{}:CHANnelmap?",
+        "pre_distortion_config": "PREDISTortion:CONFiguration?",
+        }
+
+    def _configuration_cache_path(self, description: dict[str, Any]) -> Path:
+        serial = description.get("ser", self._ip_address)
+        return Path(TurboCluster.configuration_cache_dir) / f"q1pulse_cluster_{serial}.json"
+
+    @staticmethod
+    def _module_signature(description: dict[str, Any], slot: int) -> dict[str, Any]:
+        info = description["modules"][str(slot)]
+        return {
+            "serial": info.get("ser"),
+            "fw": info.get("fw"),
+            "sw": info.get("sw"),
+            }
+
+    def save_configuration_cache(self) -> None:
+        """Stores the cached configurations in `TurboCluster.configuration_cache_dir`."""
+        description = self.get_json_description()
+        slots = {}
+
+        def slot_entry(slot):
+            if slot not in slots:
+                slots[slot] = {
+                    "module": self._module_signature(description, slot),
+                    "sequencer_config": [],
+                    "channel_map": [],
+                    "pre_distortion_config": False,
+                    }
+            return slots[slot]
+
+        # copy the dicts, because other threads can modify them.
+        for slot, seq_nr in sorted(dict(self._sequencer_config_cache)):
+            slot_entry(slot)["sequencer_config"].append(seq_nr)
+        for slot, seq_nr in sorted(dict(self._channel_map_cache)):
+            slot_entry(slot)["channel_map"].append(seq_nr)
+        for slot in dict(self._slot_predistortion_cache):
+            slot_entry(slot)["pre_distortion_config"] = True
+
+        path = self._configuration_cache_path(description)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as fp:
+            json.dump({"version": 3, "slots": slots}, fp)
+        os.replace(tmp_path, path)
+
+    def _load_configuration_cache(self) -> None:
+        description = self.get_json_description()
+        path = self._configuration_cache_path(description)
+        if not path.exists():
+            return
+        with open(path) as fp:
+            data = json.load(fp)
+        if data.get("version") != 3:
+            return
+        modules = description.get("modules") or {}
+        queries: dict[int, list[tuple[str, int | None]]] = {}
+        for slot_str, entry in data["slots"].items():
+            slot = int(slot_str)
+            if slot_str not in modules or entry["module"] != self._module_signature(description, slot):
+                logger.info(f"Configuration cache of slot {slot} discarded: module changed")
+                continue
+            queries[slot] = (
+                [("sequencer_config", seq_nr) for seq_nr in entry["sequencer_config"]]
+                + [("channel_map", seq_nr) for seq_nr in entry["channel_map"]]
+                + ([("pre_distortion_config", None)] if entry["pre_distortion_config"] else [])
+                )
+
+        for slot, name, seq_nr, value in self._read_configurations(queries):
+            if name == "sequencer_config":
+                self._sequencer_config_cache[(slot, seq_nr)] = freeze(value)
+            elif name == "channel_map":
+                self._channel_map_cache[(slot, seq_nr)] = freeze(value)
+            else:
+                self._slot_predistortion_cache[slot] = freeze(value)
+
+    def _read_configurations(
+            self,
+            queries: dict[int, list[tuple[str, int | None]]],
+            ) -> list[tuple[int, str, int | None, Any]]:
+        """Reads the configurations with one transaction per module.
+        All requests are written before the first response is read.
+
+        Args:
+            queries: per slot a list with configuration name and sequencer.
+
+        Returns:
+            list with slot, configuration name, sequencer and value.
+        """
+        queries = {slot: slot_queries for slot, slot_queries in queries.items() if slot_queries}
+        results = []
+        self._flush_batch()
+        with self._lock_slots(queries):
+            # write all requests
+            for slot, slot_queries in queries.items():
+                transport = self._connections[slot]._transport
+                transport.write_lines([
+                    self._configuration_queries[name].format(seq_nr)
+                    for name, seq_nr in slot_queries
+                    ])
+
+            # read all responses
+            for slot, slot_queries in queries.items():
+                transport = self._connections[slot]._transport
+                for name, seq_nr in slot_queries:
+                    data = _read_bin_block(transport, np.uint8)
+                    transport.read_binary(2)  # Consume <CR><LF>
+                    results.append((slot, name, seq_nr, json.loads(data.tobytes().decode("utf-8"))))
+        return results
+
     def _clear_cache(self):
-        self._channel_map_cache: dict[tuple[int, int], str] = {}
-        self._sequencer_config_cache: dict[tuple[int, int], str] = {}
-        self._slot_predistortion_cache: dict[int, str] = {}
+        # The cached values are frozen. The getters return a copy-on-write copy.
+        self._channel_map_cache: dict[tuple[int, int], Any] = {}
+        self._sequencer_config_cache: dict[tuple[int, int], Any] = {}
+        self._slot_predistortion_cache: dict[int, Any] = {}
 
     def _set_sequencer_channel_map(
         self, slot: int, sequencer: int, sequencer_channel_map: Any
@@ -424,7 +822,7 @@ class TurboCluster(Cluster):
             All errors are read from system error and listed in the exception.
         """
         if TurboCluster.use_configuration_cache:
-            self._channel_map_cache[(slot, sequencer)] = json.dumps(sequencer_channel_map)
+            self._channel_map_cache[(slot, sequencer)] = freeze(sequencer_channel_map)
         ClusterScpi._set_sequencer_channel_map(self, slot, sequencer, sequencer_channel_map)
 
     def _get_sequencer_channel_map(self, slot: int, sequencer: int) -> Any:
@@ -456,14 +854,13 @@ class TurboCluster(Cluster):
         """
         if TurboCluster.use_configuration_cache:
             try:
-                cached_str = self._channel_map_cache[(slot, sequencer)]
-                return json.loads(cached_str)
+                return cow_copy(self._channel_map_cache[(slot, sequencer)])
             except KeyError:
                 logger.info(f"cache miss channel_map {slot}, {sequencer}")
                 pass
-            result = ClusterScpi._get_sequencer_channel_map(self, slot, sequencer)
-            self._channel_map_cache[(slot, sequencer)] = json.dumps(result)
-            return result
+            result = freeze(ClusterScpi._get_sequencer_channel_map(self, slot, sequencer))
+            self._channel_map_cache[(slot, sequencer)] = result
+            return cow_copy(result)
         else:
             return ClusterScpi._get_sequencer_channel_map(self, slot, sequencer)
 
@@ -497,7 +894,7 @@ class TurboCluster(Cluster):
         """
 
         if TurboCluster.use_configuration_cache:
-            self._sequencer_config_cache[(slot, sequencer)] = json.dumps(sequencer_config)
+            self._sequencer_config_cache[(slot, sequencer)] = freeze(sequencer_config)
         ClusterScpi._set_sequencer_config(self, slot, sequencer, sequencer_config)
 
     def _get_sequencer_config(self, slot: int, sequencer: int) -> Any:
@@ -527,14 +924,13 @@ class TurboCluster(Cluster):
         """
         if TurboCluster.use_configuration_cache:
             try:
-                cached_str = self._sequencer_config_cache[(slot, sequencer)]
-                return json.loads(cached_str)
+                return cow_copy(self._sequencer_config_cache[(slot, sequencer)])
             except KeyError:
                 logger.info(f"cache miss sequencer_config {slot}, {sequencer}")
                 pass
-            result = ClusterScpi._get_sequencer_config(self, slot, sequencer)
-            self._sequencer_config_cache[(slot, sequencer)] = json.dumps(result)
-            return result
+            result = freeze(ClusterScpi._get_sequencer_config(self, slot, sequencer))
+            self._sequencer_config_cache[(slot, sequencer)] = result
+            return cow_copy(result)
         else:
             return ClusterScpi._get_sequencer_config(self, slot, sequencer)
 
@@ -563,7 +959,7 @@ class TurboCluster(Cluster):
             All errors are read from system error and listed in the exception.
         """
         if TurboCluster.use_configuration_cache:
-            self._slot_predistortion_cache[slot] = json.dumps(pre_distortion_config)
+            self._slot_predistortion_cache[slot] = freeze(pre_distortion_config)
         ClusterScpi._set_pre_distortion_config(self, slot, pre_distortion_config)
 
     def _get_pre_distortion_config(self, slot: int) -> Any:
@@ -591,36 +987,310 @@ class TurboCluster(Cluster):
         """
         if TurboCluster.use_configuration_cache:
             try:
-                cached_str = self._slot_predistortion_cache[slot]
-                return json.loads(cached_str)
+                return cow_copy(self._slot_predistortion_cache[slot])
             except KeyError:
                 logger.info(f"cache miss predistortion {slot}")
                 pass
-            result = ClusterScpi._get_pre_distortion_config(self, slot)
-            self._slot_predistortion_cache[slot] = json.dumps(result)
-            return result
+            result = freeze(ClusterScpi._get_pre_distortion_config(self, slot))
+            self._slot_predistortion_cache[slot] = result
+            return cow_copy(result)
         else:
             return ClusterScpi._get_pre_distortion_config(self, slot)
 
 
-def readline(conn) -> str:
-    """Safe implementation of readline on socket without buffering.
+class LazyConnections(dict):
+    """Module connections per slot that are opened on first use.
 
-    The trivial solution `socket.makefile().readline()` is wrong, because
-    it uses a buffer. If there is more data available on the socket, then
-    some if it will be loaded into the buffer and discarded after the statement.
-    Dataloss is likely with `makefile` combined with binary reads on the socket.
+    `connect_async` opens connections in background threads. A connection
+    that is being opened is returned when the connect has completed.
     """
 
-    socket = conn._transport._socket
-    buffer = io.BytesIO()
-    b = None
-    while True:
-        b = socket.recv(1)
-        buffer.write(b)
-        if b == b'\n':
-            break
-    return buffer.getvalue().decode().rstrip()
+    def __init__(self, create_connection: Callable[[int], Ieee488_2]):
+        super().__init__()
+        self._create_connection = create_connection
+        self._futures: dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+    def connect_async(self, slots) -> None:
+        with self._lock:
+            slots = [slot for slot in slots if slot not in self and slot not in self._futures]
+            if not slots:
+                return
+            executor = ThreadPoolExecutor(max_workers=len(slots), thread_name_prefix="TurboCluster-connect")
+            for slot in slots:
+                self._futures[slot] = executor.submit(self._create_connection, slot)
+            # threads stop when the connections have been opened.
+            executor.shutdown(wait=False)
+
+    def __missing__(self, slot: int) -> Ieee488_2:
+        with self._lock:
+            if slot in self:
+                return dict.__getitem__(self, slot)
+            future = self._futures.pop(slot, None)
+            if future is not None:
+                conn = future.result()
+            else:
+                conn = self._create_connection(slot)
+            self[slot] = conn
+            return conn
+
+    def close(self) -> None:
+        """Closes all connections, including the connections that are being opened."""
+        with self._lock:
+            connections = list(self.values())
+            for future in self._futures.values():
+                try:
+                    connections.append(future.result())
+                except Exception:
+                    pass
+            self._futures = {}
+            self.clear()
+        for conn in connections:
+            conn._transport.close()
+
+
+class _BatchState(threading.local):
+    commands: dict[int, list[str]] | None = None
+
+
+@dataclass
+class ConnectionStatistics:
+    n_transactions: int = 0
+    """Number of times the connection was acquired."""
+    n_contended: int = 0
+    """Number of times a thread had to wait for the connection."""
+    wait_time: float = 0.0
+    """Total time threads waited for the connection [s]."""
+
+    def copy(self) -> "ConnectionStatistics":
+        return ConnectionStatistics(self.n_transactions, self.n_contended, self.wait_time)
+
+    def __str__(self):
+        return (f"transactions:{self.n_transactions}, contended:{self.n_contended}, "
+                f"wait:{self.wait_time*1000:.1f} ms")
+
+
+class SlotLock:
+    """Reentrant lock of a module connection with contention statistics."""
+
+    __slots__ = ["_lock", "statistics"]
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.statistics = ConnectionStatistics()
+
+    def __enter__(self):
+        if not self._lock.acquire(blocking=False):
+            t_start = time.perf_counter()
+            self._lock.acquire()
+            self.statistics.n_contended += 1
+            self.statistics.wait_time += time.perf_counter() - t_start
+        self.statistics.n_transactions += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._lock.release()
+
+
+class ConnectionPool:
+    """Pool of connections to a module for concurrent bulk reads.
+
+    Connections are created on first use up to `size`. A connection is used by
+    one thread at a time. Connections that have been used are checked for system
+    errors by `get_system_errors`.
+    """
+
+    def __init__(self, create_connection: Callable[[], Ieee488_2], size: int):
+        self._create_connection = create_connection
+        self._size = max(1, size)
+        self._n_connections = 0
+        self._free: list[Ieee488_2] = []
+        self._needs_check: set[Ieee488_2] = set()
+        self._condition = threading.Condition()
+        self.statistics = ConnectionStatistics()
+
+    def acquire(self) -> Ieee488_2:
+        with self._condition:
+            if not self._free and self._n_connections >= self._size:
+                t_start = time.perf_counter()
+                self._condition.wait_for(lambda: self._free or self._n_connections < self._size)
+                self.statistics.n_contended += 1
+                self.statistics.wait_time += time.perf_counter() - t_start
+            self.statistics.n_transactions += 1
+            if self._free:
+                return self._free.pop()
+            self._n_connections += 1
+        # Connect outside the lock. It takes some time.
+        try:
+            return self._create_connection()
+        except BaseException:
+            with self._condition:
+                self._n_connections -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, conn: Ieee488_2, discard: bool = False, needs_check: bool = True) -> None:
+        with self._condition:
+            if discard:
+                self._n_connections -= 1
+                self._needs_check.discard(conn)
+                conn._transport.close()
+            else:
+                if needs_check:
+                    self._needs_check.add(conn)
+                self._free.append(conn)
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Closes the connections that are not in use."""
+        with self._condition:
+            connections = self._free
+            self._free = []
+            self._n_connections -= len(connections)
+            self._needs_check.difference_update(connections)
+        for conn in connections:
+            conn._transport.close()
+
+    def get_system_errors(self) -> list[str]:
+        """Returns the system errors of the connections that are not in use."""
+        with self._condition:
+            connections = [conn for conn in self._free if conn in self._needs_check]
+            for conn in connections:
+                self._free.remove(conn)
+                self._needs_check.discard(conn)
+        errors = []
+        try:
+            for conn in connections:
+                num_err = int(conn._read("SYSTem:ERRor:COUNt?"))
+                for _ in range(num_err):
+                    errors.append(conn._read("SYSTem:ERRor:NEXT?"))
+        finally:
+            for conn in connections:
+                self.release(conn, needs_check=False)
+        return errors
+
+
+class BufferedIpTransport(IpTransport):
+    """IpTransport with a receive buffer for text and binary responses.
+
+    `IpTransport.readline` uses `socket.makefile().readline()`. This is wrong,
+    because the file object has its own buffer. If there is more data available
+    on the socket, then some of it will be loaded into the buffer and discarded
+    after the statement. Dataloss is likely when multiple responses are requested
+    at once or when text and binary reads are combined.
+
+    BufferedIpTransport receives data in large chunks in a single buffer that
+    is used for all reads. Large binary blocks are received directly
+    in the destination buffer.
+    """
+
+    __slots__ = ["_rx_buffer", "_rx_pos"]
+
+    recv_size = 65536
+    """Number of bytes to request from the socket when the buffer is empty."""
+
+    def __init__(self, host: str, port: int = 5025, timeout: float = 60.0,
+                 snd_buf_size: int = 512 * 1024):
+        super().__init__(host, port, timeout, snd_buf_size)
+        self._rx_buffer = bytearray()
+        self._rx_pos = 0
+
+    def _receive(self):
+        data = self._socket.recv(self.recv_size)
+        if not data:
+            raise ConnectionError("Connection closed by instrument")
+        if self._rx_pos:
+            # remove data that has been read
+            del self._rx_buffer[:self._rx_pos]
+            self._rx_pos = 0
+        self._rx_buffer += data
+
+    def write_lines(self, commands: list[str]) -> None:
+        """Writes the commands with a single socket operation."""
+        self._socket.sendall(("\n".join(commands) + "\n").encode("ascii"))
+
+    def readline(self) -> str:
+        """Reads a line including line end."""
+        buffer = self._rx_buffer
+        while (end := buffer.find(b"\n", self._rx_pos)) < 0:
+            self._receive()
+            buffer = self._rx_buffer
+        line = buffer[self._rx_pos:end+1].decode("utf-8", errors="replace")
+        self._rx_pos = end + 1
+        return line
+
+    def readlines(self, n: int) -> list[str]:
+        """Reads n lines. The lines are decoded in one operation.
+
+        Returns:
+            list with lines without line end.
+        """
+        if n == 0:
+            return []
+        while self._rx_buffer.count(b"\n", self._rx_pos) < n:
+            self._receive()
+        buffer = self._rx_buffer
+        end = self._rx_pos
+        for _ in range(n):
+            end = buffer.index(b"\n", end) + 1
+        lines = buffer[self._rx_pos:end-1].decode("utf-8", errors="replace").split("\n")
+        self._rx_pos = end
+        return lines
+
+    def read_binary(self, size: int) -> bytes:
+        if size >= self.recv_size:
+            data = bytearray(size)
+            self.read_into(memoryview(data))
+            return bytes(data)
+        while len(self._rx_buffer) - self._rx_pos < size:
+            self._receive()
+        start = self._rx_pos
+        self._rx_pos += size
+        return bytes(self._rx_buffer[start:self._rx_pos])
+
+    def read_into(self, view: memoryview) -> None:
+        """Reads len(view) bytes into view.
+        Data that is not yet in the buffer is received directly in view.
+        """
+        size = len(view)
+        n = min(size, len(self._rx_buffer) - self._rx_pos)
+        view[:n] = self._rx_buffer[self._rx_pos:self._rx_pos+n]
+        self._rx_pos += n
+        while n < size:
+            n_bytes = self._socket.recv_into(view[n:], size - n)
+            if n_bytes == 0:
+                raise ConnectionError("Connection closed by instrument")
+            n += n_bytes
+
+
+def _read_bin_block(transport, dtype, buffer: np.ndarray | None = None) -> np.ndarray:
+    """Reads an IEEE488.2 binary block from the socket into a NumPy array.
+
+    Args:
+        transport: BufferedIpTransport of the connection.
+        dtype: dtype of the data in the block.
+        buffer: optional array to reuse if it is large enough.
+
+    Returns:
+        array with the data of the binary block.
+    """
+    header = transport.read_binary(2)  # Read '#N'
+    # character ',' is a valid delimiter and we need to discard it
+    if header[:1] == b",":
+        header = header[1:] + transport.read_binary(1)
+    if header[:1] != b"#":
+        raise RuntimeError(f"Header error: received {header}")
+    digit_cnt = int(header[1:2])
+    byte_cnt = int(transport.read_binary(digit_cnt))
+
+    dtype = np.dtype(dtype)
+    n = byte_cnt // dtype.itemsize
+    if buffer is not None and buffer.dtype == dtype and len(buffer) >= n:
+        data = buffer[:n]
+    else:
+        data = np.empty(n, dtype)
+    transport.read_into(memoryview(data.view(np.uint8)))
+    return data
 
 
 def _convert_sequencer_status(state_str: str):
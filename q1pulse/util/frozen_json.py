@@ -0,0 +1,131 @@
+"""
+Immutable JSON data with copy-on-write access.
+
+The configuration cache of TurboCluster stores the JSON configuration of the
+modules as a tree of FrozenDict and FrozenList. The frozen tree is never modified
+and can be shared by the cache and the returned values.
+
+`cow_copy` returns a mutable dict that shares the frozen values. Nested values are
+copied when they are accessed with `[]` or `get`. So, the copy can be modified
+like a normal dict without modifying the cache, while a read only copies the
+nodes on the path to the value.
+
+`freeze` converts a modified copy to a frozen tree. Frozen nodes of the copy
+are reused. Only modified or accessed nodes are copied.
+"""
+from typing import Any
+
+
+class FrozenDict(dict):
+    """Read-only dict. It is a dict subclass so it can be serialized with json."""
+
+    __slots__ = []
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenDict is read-only")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class FrozenList(list):
+    """Read-only list. It is a list subclass so it can be serialized with json."""
+
+    __slots__ = []
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenList is read-only")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __iadd__ = _readonly
+    __imul__ = _readonly
+    append = _readonly
+    clear = _readonly
+    extend = _readonly
+    insert = _readonly
+    pop = _readonly
+    remove = _readonly
+    reverse = _readonly
+    sort = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class CowDict(dict):
+    """Mutable dict with frozen values that are copied on access."""
+
+    __slots__ = []
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        value_type = type(value)
+        if value_type is FrozenDict:
+            value = CowDict(value)
+            dict.__setitem__(self, key, value)
+        elif value_type is FrozenList:
+            value = CowList(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+
+class CowList(list):
+    """Mutable list with frozen values that are copied on access."""
+
+    __slots__ = []
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        value = list.__getitem__(self, index)
+        value_type = type(value)
+        if value_type is FrozenDict:
+            value = CowDict(value)
+            list.__setitem__(self, index, value)
+        elif value_type is FrozenList:
+            value = CowList(value)
+            list.__setitem__(self, index, value)
+        return value
+
+
+def freeze(data: Any) -> Any:
+    """Returns a frozen copy of JSON data. Frozen nodes are shared, not copied."""
+    data_type = type(data)
+    if data_type is FrozenDict or data_type is FrozenList:
+        return data
+    if isinstance(data, dict):
+        return FrozenDict({key: freeze(value) for key, value in dict.items(data)})
+    if isinstance(data, (list, tuple)):
+        return FrozenList([freeze(value) for value in data])
+    return data
+
+
+def cow_copy(data: Any) -> Any:
+    """Returns a mutable copy of frozen JSON data. Nested values are copied on access."""
+    data_type = type(data)
+    if data_type is FrozenDict:
+        return CowDict(data)
+    if data_type is FrozenList:
+        return CowList(data)
+    return data
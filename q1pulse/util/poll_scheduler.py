@@ -0,0 +1,111 @@
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class PollStatistics:
+    n_polls: int = 0
+    """Total number of status polls."""
+    n_wasted_polls: int = 0
+    """Number of polls that returned sequencers that were still running."""
+    sleep_time: float = 0.0
+    """Total time in seconds spent sleeping between polls."""
+    expected_duration: float = 0.0
+    """Predicted duration of the program in seconds."""
+    actual_duration: float = 0.0
+    """Duration from start of the program till the final poll in seconds."""
+
+    @staticmethod
+    def combine(statistics: list["PollStatistics"]) -> "PollStatistics":
+        """Combines the statistics of instruments that are polled in parallel."""
+        result = PollStatistics()
+        for stats in statistics:
+            result.n_polls += stats.n_polls
+            result.n_wasted_polls += stats.n_wasted_polls
+            result.sleep_time += stats.sleep_time
+            result.expected_duration = max(result.expected_duration, stats.expected_duration)
+            result.actual_duration = max(result.actual_duration, stats.actual_duration)
+        return result
+
+    def __str__(self):
+        return (f"polls:{self.n_polls} (wasted:{self.n_wasted_polls}), "
+                f"slept:{self.sleep_time*1000:.1f} ms, "
+                f"expected:{self.expected_duration*1000:.1f} ms, "
+                f"actual:{self.actual_duration*1000:.1f} ms")
+
+
+class PollScheduler:
+    """Schedules the status polls while waiting for a program to complete.
+
+    The first poll is done immediately to detect errors and programs that
+    are already finished. After that the scheduler sleeps until shortly before
+    the predicted end of the program and then polls with an exponentially
+    increasing interval, starting at `min_interval` and limited to `max_interval`.
+    Long sleeps are split in steps of `max_sleep` to detect programs that stop
+    earlier than predicted, e.g. due to an error.
+    It never sleeps beyond the timeout.
+    """
+
+    lead_time = 0.001
+    """Time in seconds before the predicted end to start polling."""
+    min_interval = 0.0002
+    """Initial poll interval in seconds after predicted end."""
+    max_interval = 0.010
+    """Maximum poll interval in seconds."""
+    backoff = 2.0
+    """Factor to increase poll interval after every wasted poll."""
+    max_sleep = 0.1
+    """Maximum time in seconds to sleep before the predicted end."""
+
+    def __init__(self, t_start: float, expected_duration: float, timeout: float,
+                 clock: Callable[[], float] = time.perf_counter,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            t_start: start time of the program (`time.perf_counter()`).
+            expected_duration: predicted duration of the program in seconds.
+            timeout: maximum time to wait from now in seconds.
+            clock: function returning the current time in seconds.
+            sleep: function to sleep the specified number of seconds.
+        """
+        self._clock = clock
+        self._sleep = sleep
+        self._t_start = t_start
+        self._t_expected_end = t_start + expected_duration
+        self.expiration_time = clock() + timeout
+        self._interval = PollScheduler.min_interval
+        self.statistics = PollStatistics(expected_duration=expected_duration)
+
+    @property
+    def expired(self):
+        return self._clock() > self.expiration_time
+
+    def abort(self):
+        """Stops polling at the next poll."""
+        self.expiration_time = 0.0
+
+    def polled(self, ready: bool):
+        """Registers a poll and sleeps before the next poll if not ready.
+
+        Args:
+            ready: True if all polled sequencers are ready.
+        """
+        stats = self.statistics
+        stats.n_polls += 1
+        t_now = self._clock()
+        stats.actual_duration = t_now - self._t_start
+        if ready:
+            return
+        stats.n_wasted_polls += 1
+        t_wait = self._t_expected_end - PollScheduler.lead_time - t_now
+        if t_wait <= 0:
+            t_wait = self._interval
+            self._interval = min(self._interval * PollScheduler.backoff,
+                                 PollScheduler.max_interval)
+        else:
+            t_wait = min(t_wait, PollScheduler.max_sleep)
+        t_wait = min(t_wait, self.expiration_time - t_now)
+        if t_wait > 0:
+            self._sleep(t_wait)
+            stats.sleep_time += t_wait
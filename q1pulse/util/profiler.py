@@ -0,0 +1,156 @@
+"""
+Structured timing of compilation and program execution.
+
+The phases of a program run are recorded as spans with a start time and
+duration per sequencer: compile, assemble, serialize, upload, configure,
+arm, start, poll, fetch, reduce. Spans are only recorded while a Profiler is active.
+
+Example:
+    with Profiler() as profiler:
+        p.compile()
+        instrument.run_program(p)
+    print(profiler.summary())
+    profiler.save_chrome_trace("q1pulse_trace.json")
+
+The trace can be viewed in chrome://tracing or https://ui.perfetto.dev.
+"""
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+@dataclass
+class Span:
+    phase: str
+    """Phase of the program run, e.g. 'compile' or 'upload'."""
+    sequencer: str | None
+    """Name of the sequencer or None if the span is not specific for a sequencer."""
+    t_start: float
+    """Start time in seconds (`time.perf_counter()`)."""
+    duration: float = 0.0
+    """Duration in seconds."""
+    thread_name: str = ""
+    args: dict[str, Any] = field(default_factory=dict)
+    """Additional information for the trace."""
+
+
+class Profiler:
+    """Records the spans of the phases of compilation and program execution.
+
+    The profiler is active within its context. Multiple profilers can be active
+    at the same time. Spans of all threads are recorded.
+
+    Args:
+        callback: function called with every recorded span.
+    """
+
+    def __init__(self, callback: Callable[[Span], None] | None = None):
+        self.callback = callback
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with _lock:
+            _active_profilers.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with _lock:
+            _active_profilers.remove(self)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans = []
+
+    def add_span(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+        if self.callback is not None:
+            self.callback(span)
+
+    def summary(self) -> dict[str, tuple[int, float]]:
+        """Returns per phase the number of spans and the total duration in seconds."""
+        result = defaultdict(lambda: [0, 0.0])
+        for span in self.spans:
+            entry = result[span.phase]
+            entry[0] += 1
+            entry[1] += span.duration
+        return {phase: tuple(entry) for phase, entry in result.items()}
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Returns the spans in Chrome trace event format.
+        Every sequencer is shown as a separate track. Spans that are not specific
+        for a sequencer are shown on the track of the thread.
+        """
+        if not self.spans:
+            return {"traceEvents": []}
+        t0 = min(span.t_start for span in self.spans)
+        tracks: dict[str, int] = {}
+        events = []
+        for span in self.spans:
+            track = span.sequencer if span.sequencer is not None else f"[{span.thread_name}]"
+            tid = tracks.setdefault(track, len(tracks) + 1)
+            events.append({
+                "name": span.phase if span.sequencer is None else f"{span.phase} {span.sequencer}",
+                "cat": span.phase,
+                "ph": "X",
+                "ts": (span.t_start - t0) * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": 1,
+                "tid": tid,
+                "args": span.args,
+                })
+        events.append({"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "q1pulse"}})
+        for track, tid in tracks.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": track}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, filename: str) -> None:
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+
+
+class _SpanContext:
+    __slots__ = ["span"]
+
+    def __init__(self, phase: str, sequencer: str | None, args: dict[str, Any]):
+        self.span = Span(phase, sequencer, 0.0, args=args)
+
+    def __enter__(self):
+        span = self.span
+        stack = _thread_state.__dict__.setdefault("stack", [])
+        if span.sequencer is None and stack:
+            span.sequencer = stack[-1].sequencer
+        stack.append(span)
+        span.thread_name = threading.current_thread().name
+        span.t_start = time.perf_counter()
+        return span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        span = self.span
+        span.duration = time.perf_counter() - span.t_start
+        _thread_state.stack.pop()
+        if exc_type is not None:
+            span.args["exception"] = exc_type.__name__
+        for profiler in list(_active_profilers):
+            profiler.add_span(span)
+
+
+def span(phase: str, sequencer: str | None = None, **args):
+    """Returns a context that records a span in the active profilers.
+    A nested span without sequencer gets the sequencer of the enclosing span.
+    The context does nothing when no profiler is active.
+    """
+    if not _active_profilers:
+        return _null_context
+    return _SpanContext(phase, sequencer, args)
+
+
+_lock = threading.Lock()
+_active_profilers: list[Profiler] = []
+_thread_state = threading.local()
+_null_context = nullcontext()
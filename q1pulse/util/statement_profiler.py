@@ -0,0 +1,181 @@
+"""
+Profiling of the compilation per statement class and per call site.
+
+The profiler records for every compiled statement the compile time and the
+number of emitted Q1 instructions. The results are accumulated per statement
+class and per call site of the statement in the user code. The call site is the
+deepest frame of the statement traceback outside q1pulse and the Python standard
+library, e.g. a line in a pulse library. Statements without traceback are
+recorded with call site '<unknown>'. See `SequenceBuilder.add_traceback_to_instructions`.
+
+The times and instruction counts are exclusive, i.e. the statements in the
+body of a loop or conditional block are not included in the loop statement.
+The executed instructions are estimated with the number of iterations of the
+enclosing loops. Repetitions of the program are not included.
+
+Example:
+    with StatementProfiler() as profiler:
+        p.compile()
+    print(profiler.report(10))
+"""
+import os
+import re
+import sysconfig
+import time
+from dataclasses import dataclass
+
+from ..lang.flow_statements import LoopStatement, ArrayLoopStatement
+
+
+@dataclass
+class StatementStats:
+    n: int = 0
+    """Number of compiled statements."""
+    time: float = 0.0
+    """Compile time in seconds."""
+    n_instructions: int = 0
+    """Number of emitted Q1 instructions."""
+    n_rt_instructions: int = 0
+    """Number of emitted real-time instructions."""
+    n_executed: int = 0
+    """Estimated number of executed Q1 instructions."""
+
+    def add(self, time: float, n_instructions: int, n_rt_instructions: int, multiplier: int):
+        self.n += 1
+        self.time += time
+        self.n_instructions += n_instructions
+        self.n_rt_instructions += n_rt_instructions
+        self.n_executed += n_instructions * multiplier
+
+
+class _Frame:
+    __slots__ = ["t_start", "n_instructions", "n_rt_instructions",
+                 "multiplier", "child_multiplier",
+                 "child_time", "child_instructions", "child_rt_instructions"]
+
+    def __init__(self, generator, multiplier, child_multiplier):
+        self.multiplier = multiplier
+        self.child_multiplier = child_multiplier
+        self.child_time = 0.0
+        self.child_instructions = 0
+        self.child_rt_instructions = 0
+        self.n_instructions = generator._n_q1_instructions
+        self.n_rt_instructions = generator._n_rt_instructions
+        self.t_start = time.perf_counter()
+
+
+class StatementProfiler:
+    """Accumulates compile time and emitted instructions per statement class
+    and per call site. The profiler is active within its context.
+    """
+
+    def __init__(self):
+        self.per_class: dict[str, StatementStats] = {}
+        self.per_call_site: dict[str, StatementStats] = {}
+        self._stack: list[_Frame] = []
+        self._previous = None
+        self._call_sites: dict[tuple[str, ...], str] = {}
+
+    def __enter__(self):
+        global _active_profiler
+        self._previous = _active_profiler
+        _active_profiler = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active_profiler
+        _active_profiler = self._previous
+        self._stack = []
+
+    def clear(self) -> None:
+        self.per_class = {}
+        self.per_call_site = {}
+
+    def start(self, statement, generator) -> None:
+        """Starts measurement of the statement. Called by Sequence.compile."""
+        multiplier = self._stack[-1].child_multiplier if self._stack else 1
+        if isinstance(statement, (LoopStatement, ArrayLoopStatement)):
+            # the statements in the loop body are executed n times.
+            child_multiplier = multiplier * statement._loop.n
+        else:
+            child_multiplier = multiplier
+        self._stack.append(_Frame(generator, multiplier, child_multiplier))
+
+    def stop(self, statement, generator) -> None:
+        """Stops measurement of the statement and adds it to the statistics."""
+        frame = self._stack.pop()
+        duration = time.perf_counter() - frame.t_start
+        n_instructions = generator._n_q1_instructions - frame.n_instructions
+        n_rt_instructions = generator._n_rt_instructions - frame.n_rt_instructions
+        if self._stack:
+            parent = self._stack[-1]
+            parent.child_time += duration
+            parent.child_instructions += n_instructions
+            parent.child_rt_instructions += n_rt_instructions
+        args = (duration - frame.child_time,
+                n_instructions - frame.child_instructions,
+                n_rt_instructions - frame.child_rt_instructions,
+                frame.multiplier)
+        name = type(statement).__name__
+        stats = self.per_class.get(name)
+        if stats is None:
+            stats = self.per_class[name] = StatementStats()
+        stats.add(*args)
+        call_site = self._call_site(getattr(statement, 'tb', None))
+        stats = self.per_call_site.get(call_site)
+        if stats is None:
+            stats = self.per_call_site[call_site] = StatementStats()
+        stats.add(*args)
+
+    def top(self, n: int = 10, key: str = "time", per: str = "call_site") -> list[tuple[str, StatementStats]]:
+        """Returns the n most expensive statement classes or call sites.
+
+        Args:
+            n: number of entries.
+            key: attribute of StatementStats to sort on, e.g. 'time' or 'n_executed'.
+            per: 'call_site' or 'class'.
+        """
+        entries = self.per_call_site if per == "call_site" else self.per_class
+        return sorted(entries.items(), key=lambda item: getattr(item[1], key), reverse=True)[:n]
+
+    def report(self, n: int = 10, key: str = "time") -> str:
+        """Returns a table with the n most expensive statement classes and call sites."""
+        lines = []
+        for per in ["class", "call_site"]:
+            lines.append(f"{'statement' if per == 'class' else 'call site':60} {'n':>7} "
+                         f"{'time [ms]':>10} {'instr':>8} {'rt':>8} {'executed':>10}")
+            for name, stats in self.top(n, key, per):
+                if len(name) > 60:
+                    name = "..." + name[-57:]
+                lines.append(f"{name:60} {stats.n:7} {stats.time*1000:10.2f} "
+                             f"{stats.n_instructions:8} {stats.n_rt_instructions:8} {stats.n_executed:10}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def _call_site(self, tb: list[str] | None) -> str:
+        """Returns the deepest frame in the traceback outside q1pulse and the standard library."""
+        if not tb:
+            return "<unknown>"
+        tb_key = tuple(tb)
+        call_site = self._call_sites.get(tb_key)
+        if call_site is None:
+            call_site = "<unknown>"
+            for line in tb:
+                m = _file_pattern.match(line)
+                if m is not None and not m.group(1).startswith(_excluded_dirs):
+                    call_site = f"{m.group(1)}:{m.group(2)}"
+            self._call_sites[tb_key] = call_site
+        return call_site
+
+
+def active_profiler() -> StatementProfiler | None:
+    """Returns the active StatementProfiler or None."""
+    return _active_profiler
+
+
+_file_pattern = re.compile(r'\s*File "(.*)", line (\d+)')
+_excluded_dirs = (
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    sysconfig.get_paths()["stdlib"],
+    )
+_active_profiler: StatementProfiler | None = None
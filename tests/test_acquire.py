@@ -85,3 +85,11 @@ with np.printoptions(precision=2, threshold=1000):
     print('weighed')
     print(dw0)
     print(dw1)
+
+# bulk retrieval of all acquisitions as structured arrays
+acquisitions = instrument.get_all_acquisitions()
+for name, data in [('non-weighed', data_n), ('weighed', data_w)]:
+    bins = acquisitions['R1'][name]
+    np.testing.assert_array_equal(bins['path0'], data['integration']['path0'])
+    np.testing.assert_array_equal(bins['path1'], data['integration']['path1'])
+    np.testing.assert_array_equal(bins['avg_cnt'], data['avg_cnt'])
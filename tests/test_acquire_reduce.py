@@ -0,0 +1,97 @@
+import numpy as np
+
+from q1pulse.instrument import Q1Instrument
+from q1pulse.modules.acquisition_data import reduce_bins, ACQ_BINS_DTYPE
+
+from init_pulsars import qcm0, qrm1
+
+instrument = Q1Instrument('q1')
+instrument.add_qcm(qcm0)
+instrument.add_qrm(qrm1)
+instrument.add_control('P1', qcm0.name, [0])
+instrument.add_control('P2', qrm1.name, [0])
+instrument.add_readout('R1', qrm1.name, [])
+instrument.add_readout('R2', qrm1.name, [])
+
+# simulate all repetitions
+qrm1.config('render_repetitions', True)
+
+n_rep = 4
+N = 5
+
+p = instrument.new_program('acquire_reduce')
+p.repetitions = n_rep
+
+P1 = p.P1
+P2 = p.P2
+R1 = p.R1
+R2 = p.R2
+
+for R in [R1, R2]:
+    R.add_acquisition_bins('default', n_rep * 3 * N)
+    R.integration_length_acq = 100
+
+with p.loop_range(3) as i:
+    with p.loop_linspace(-0.5, 0.5, N) as v:
+        with p.parallel():
+            P1.block_pulse(500, v)
+            P2.block_pulse(500, v)
+            R1.acquire('default', 'increment', t_offset=160)
+            R2.acquire('default', 'increment', t_offset=160)
+        p.wait(500)
+
+p.compile(listing=True)
+
+instrument.run_program(p)
+
+bins = instrument.get_all_acquisitions()
+reference = {
+    name: (acquisitions['default']['path0'] + 1j*acquisitions['default']['path1']).reshape((n_rep, 3, N))
+    for name, acquisitions in bins.items()
+    }
+
+data = instrument.get_reduced_acquisitions([i, v])
+for name in ['R1', 'R2']:
+    assert data[name]['default'].shape == (3, N)
+    np.testing.assert_allclose(data[name]['default'], reference[name].mean(axis=0))
+
+data = instrument.get_reduced_acquisitions([3, N], names={'R1': ['default']}, average=False)
+assert list(data) == ['R1']
+np.testing.assert_array_equal(data['R1']['default'], reference['R1'])
+
+threshold = np.median(reference['R1'].real)
+data = instrument.get_reduced_acquisitions([i, v], threshold=threshold)
+np.testing.assert_allclose(data['R1']['default'], (reference['R1'].real >= threshold).mean(axis=0))
+
+data = instrument.get_reduced_acquisitions([i, v], threshold=0.0, rotation=90.0)
+np.testing.assert_allclose(data['R2']['default'], (-reference['R2'].imag >= 0.0).mean(axis=0), atol=1e-12)
+
+# thresholding does not modify the bins
+r1_bins = bins['R1']['default']
+r1_copy = r1_bins.copy()
+for rotation in [0.0, 30.0]:
+    reduce_bins(r1_bins, [i, v], threshold=threshold, rotation=rotation)
+    np.testing.assert_array_equal(r1_bins, r1_copy)
+
+# an invalid bin is excluded from the average. A point without valid bins is NaN.
+synthetic = np.zeros(6, ACQ_BINS_DTYPE)
+synthetic['path0'] = [0.1, 0.2, 0.3, 0.5, np.nan, np.nan]
+synthetic['path1'] = [0.0, 0.1, 0.2, 0.2, np.nan, np.nan]
+synthetic['avg_cnt'] = [1, 1, 1, 1, 0, 0]
+# 3 repetitions of 2 points
+np.testing.assert_allclose(reduce_bins(synthetic, [2]), [0.2+0.1j, 0.35+0.15j])
+np.testing.assert_allclose(reduce_bins(synthetic, [2], threshold=0.15), [0.5, 1.0])
+synthetic['avg_cnt'][3] = 0
+synthetic['path0'][3] = np.nan
+synthetic['path1'][3] = np.nan
+np.testing.assert_allclose(reduce_bins(synthetic, [2]), [0.2+0.1j, 0.2+0.1j])
+synthetic['avg_cnt'][1] = 0
+synthetic['path0'][1] = np.nan
+synthetic['path1'][1] = np.nan
+np.testing.assert_allclose(reduce_bins(synthetic, [2]), [0.2+0.1j, np.nan])
+np.testing.assert_allclose(reduce_bins(synthetic, [2], threshold=0.15), [0.5, np.nan])
+
+instrument.close()
+assert instrument._executor is None and instrument._reduction_executor is None
+
+qrm1.config('render_repetitions', False)
@@ -0,0 +1,113 @@
+import numpy as np
+
+from q1pulse.instrument import Q1Instrument
+from q1pulse.modules.sequencer_states import parse_sequencer_status
+
+from init_pulsars import qcm0, qrm1
+
+instrument = Q1Instrument('q1')
+instrument.add_qcm(qcm0)
+instrument.add_qrm(qrm1)
+instrument.add_control('P1', qrm1.name, [0])
+instrument.add_readout('R1', qrm1.name, [], in_channels=[0,1])
+
+p = instrument.new_program('acquire_stream')
+p.repetitions = 1
+
+P1 = p.P1
+R1 = p.R1
+
+N = 2000
+R1.add_acquisition_bins('default', N)
+R1.integration_length_acq = 100
+
+with p.loop_linspace(-0.5, 0.5, N) as v1:
+    with p.parallel():
+        P1.block_pulse(200, v1)
+        R1.acquire('default', 'increment', t_offset=160)
+    p.wait(100)
+
+p.compile(listing=True)
+
+instrument.start_program(p)
+chunks = []
+for chunk in instrument.stream_acquisition_bins('R1', 'default', chunk_size=256):
+    print(f'chunk {len(chunks)}: {len(chunk)} bins')
+    chunks.append(chunk)
+instrument.wait_stopped()
+
+data = np.concatenate(chunks)
+bins = instrument.get_acquisition_bins('R1', 'default')
+assert len(data) == N
+np.testing.assert_array_equal(data['path0'], bins['integration']['path0'])
+np.testing.assert_array_equal(data['path1'], bins['integration']['path1'])
+
+# While the sequencer is running the bins are retrieved at most stream_max_fetches times.
+# A running sequencer is emulated with a running status and bins that become valid per fetch.
+module = instrument.modules[qrm1.name]
+n_polls = 0
+fetches = []
+
+
+def running_status(seq_nr, timeout=0):
+    global n_polls
+    n_polls += 1
+    if n_polls <= 30:
+        return parse_sequencer_status('OKAY;RUNNING;;;;')
+    return type(module).get_sequencer_status(module, seq_nr, timeout)
+
+
+def partial_bins(seq_nr, acq_names):
+    result = type(module).get_acquisition_bins(module, seq_nr, acq_names)
+    fetches.append(n_polls)
+    if n_polls <= 30:
+        result['default']['avg_cnt'][len(fetches) * 300:] = 0
+    return result
+
+
+module.get_sequencer_status = running_status
+module.get_acquisition_bins = partial_bins
+instrument.start_program(p)
+chunks = list(instrument.stream_acquisition_bins('R1', 'default', chunk_size=100))
+instrument.wait_stopped()
+del module.get_sequencer_status
+del module.get_acquisition_bins
+
+n_running = sum(1 for n in fetches if n <= 30)
+assert 1 < n_running <= Q1Instrument.stream_max_fetches, fetches
+assert len(fetches) == n_running + 1
+assert len(chunks[0]) == 100
+np.testing.assert_array_equal(np.concatenate(chunks)['path0'], bins['integration']['path0'])
+
+# Bins averaged over repetitions are yielded when the sequencer has stopped.
+qrm1.config('render_repetitions', True)
+
+n_rep = 3
+N = 200
+p = instrument.new_program('acquire_stream_averaged')
+p.repetitions = n_rep
+p.average_repetitions = True
+
+P1 = p.P1
+R1 = p.R1
+
+R1.add_acquisition_bins('default', N)
+R1.integration_length_acq = 100
+
+with p.loop_linspace(-0.5, 0.5, N) as v1:
+    with p.parallel():
+        P1.block_pulse(200, v1)
+        R1.acquire('default', 'increment', t_offset=160)
+    p.wait(100)
+
+p.compile(listing=True)
+
+instrument.start_program(p)
+chunks = list(instrument.stream_acquisition_bins('R1', 'default', chunk_size=64))
+instrument.wait_stopped()
+
+data = np.concatenate(chunks)
+assert [len(chunk) for chunk in chunks] == [64, 64, 64, 8]
+np.testing.assert_array_equal(data['avg_cnt'], n_rep)
+
+qrm1.config('render_repetitions', False)
@@ -0,0 +1,84 @@
+import numpy as np
+
+from q1pulse.instrument import Q1Instrument
+
+from init_pulsars import qcm0, qrm1
+
+instrument = Q1Instrument('q1')
+instrument.add_qcm(qcm0)
+instrument.add_qrm(qrm1)
+instrument.add_control('P1', qcm0.name, [0])
+instrument.add_readout('R1', qrm1.name, [])
+
+# simulate all repetitions
+qrm1.config('render_repetitions', True)
+
+N = 5
+n_rep = 10
+results = {}
+
+for average in [False, True]:
+    p = instrument.new_program(f'average_repetitions_{average}')
+    p.repetitions = n_rep
+    p.average_repetitions = average
+
+    P1 = p.P1
+    R1 = p.R1
+
+    n_bins = N if average else N * n_rep
+    R1.add_acquisition_bins('default', n_bins)
+    R1.integration_length_acq = 100
+
+    with p.loop_linspace(-0.5, 0.5, N) as v1:
+        with p.parallel():
+            P1.block_pulse(500, v1)
+            R1.acquire('default', 'increment', t_offset=160)
+        p.wait(500)
+
+    p.compile(listing=True)
+
+    instrument.run_program(p)
+
+    bins = instrument.get_all_acquisitions()['R1']['default']
+    assert len(bins) == n_bins
+    expected_cnt = n_rep if average else 1
+    np.testing.assert_array_equal(bins['avg_cnt'], expected_cnt)
+    results[average] = bins
+
+# the hardware averaged bins equal the host side average of all repetitions
+for path in ['path0', 'path1']:
+    np.testing.assert_allclose(
+        results[True][path],
+        results[False][path].reshape((n_rep, N)).mean(axis=0))
+
+# acquire with 'increment' in a subroutine
+p = instrument.new_program('average_repetitions_subroutine')
+p.repetitions = n_rep
+p.average_repetitions = True
+
+P1 = p.P1
+R1 = p.R1
+
+R1.add_acquisition_bins('default', N)
+R1.integration_length_acq = 100
+
+with R1.subroutine('measure'):
+    R1.acquire('default', 'increment')
+    R1.wait(100)
+
+with p.loop_linspace(-0.5, 0.5, N) as v1:
+    with p.parallel():
+        P1.block_pulse(500, v1)
+        R1.call('measure', t_offset=160)
+    p.wait(500)
+
+p.compile(listing=True)
+
+instrument.run_program(p)
+
+bins = instrument.get_all_acquisitions()['R1']['default']
+np.testing.assert_array_equal(bins['avg_cnt'], n_rep)
+for path in ['path0', 'path1']:
+    np.testing.assert_allclose(bins[path], results[True][path])
+
+qrm1.config('render_repetitions', False)
@@ -0,0 +1,62 @@
+import numpy as np
+
+from q1pulse.instrument import Q1Instrument
+from q1pulse.lang.exceptions import Q1TimingError
+from q1pulse.assembler.renderer import render_program, first_difference
+
+from init_pulsars import qcm0
+
+instrument = Q1Instrument('q1')
+instrument.add_qcm(qcm0)
+instrument.add_control('P1', qcm0.name, [0])
+instrument.add_control('P2', qcm0.name, [1])
+
+N = 50
+rng = np.random.default_rng(1)
+durations = rng.integers(4, 40, size=N)
+gaps = rng.choice([0, 4, 8, 20], size=N)
+times_P1 = np.cumsum(durations + gaps) - durations - gaps
+amplitudes = rng.uniform(-0.5, 0.5, size=N)
+# P2 gets the same pulses in reversed order and scaled
+times = np.concatenate([times_P1, times_P1[::-1]])
+channels = np.array(['P1'] * N + ['P2'] * N)
+all_amplitudes = np.concatenate([amplitudes, -amplitudes[::-1]])
+all_durations = np.concatenate([durations, durations[::-1]])
+
+p_bulk = instrument.new_program('block_pulses')
+p_bulk.wait(100)
+p_bulk.block_pulses(times, channels, all_amplitudes, all_durations)
+p_bulk.wait(100)
+p_bulk.compile(json=False)
+
+p_ref = instrument.new_program('block_pulses_ref')
+p_ref.wait(100)
+with p_ref.parallel():
+    for t, a, d in zip(times_P1, amplitudes, durations):
+        p_ref.P1.block_pulse(int(d), a, t_offset=int(t))
+        p_ref.P2.block_pulse(int(d), -a, t_offset=int(t))
+p_ref.wait(100)
+p_ref.compile(json=False)
+
+assert p_bulk.duration == p_ref.duration, (p_bulk.duration, p_ref.duration)
+output_bulk = render_program(p_bulk)
+output_ref = render_program(p_ref)
+for name in ['P1', 'P2']:
+    assert first_difference(output_bulk[name], output_ref[name]) is None, name
+assert p_bulk.statistics('P1').n_instructions <= p_ref.statistics('P1').n_instructions
+
+# channel indices with list of sequencers
+p_index = instrument.new_program('block_pulses_index')
+p_index.block_pulses([0, 0, 100], [0, 1, 1], [0.1, 0.2, 0.3], [100, 40, 40], sequencers=['P1', 'P2'])
+p_index.compile(json=False)
+
+for t_start, spacing in [(0, 2), (0, -4)]:
+    p_error = instrument.new_program('block_pulses_error')
+    try:
+        p_error.block_pulses([t_start, 20 + spacing], ['P1', 'P1'], [0.1, 0.2], [20, 20])
+    except Q1TimingError as ex:
+        print(f'Expected error: {ex}')
+    else:
+        raise Exception(f'No error for spacing {spacing}')
+
+instrument.run_program(p_bulk)
@@ -0,0 +1,81 @@
+import numpy as np
+
+from q1pulse.instrument import Q1Instrument
+from q1pulse.lang.exceptions import Q1StateError
+from q1pulse.assembler.renderer import render_program, first_difference
+
+from init_pulsars import qcm0, qrm1
+
+instrument = Q1Instrument('q1')
+instrument.add_qcm(qcm0)
+instrument.add_qrm(qrm1)
+instrument.add_control('P1', qcm0.name, [0])
+instrument.add_control('P2', qcm0.name, [1])
+instrument.add_readout('R1', qrm1.name, [])
+
+N = 20
+
+
+def build_common(p):
+    p.R1.add_acquisition_bins('default', 2*N)
+    p.R1.integration_length_acq = 100
+    p.P1.add_wave('gauss', np.exp(-np.linspace(-2, 2, 100)**2))
+    p.R.amplitude = 0.1
+    with p.loop_linspace(-0.5, 0.5, N) as v:
+        with p.parallel():
+            p.P1.block_pulse(200, v)
+            p.R1.acquire('default', 'increment', t_offset=60)
+        p.P1.shaped_pulse('gauss', 0.4)
+        p.wait(100)
+
+
+def build_point(p, amplitude):
+    p.R.amplitude = amplitude
+    with p.loop_range(N):
+        with p.parallel():
+            p.P2.block_pulse(200, p.R.amplitude)
+            p.R1.acquire('default', 'increment', t_offset=60)
+        p.P1.shaped_pulse('gauss', amplitude)
+        p.wait(100)
+
+
+skeleton = instrument.new_program('clone_skeleton')
+build_common(skeleton)
+skeleton.compile(listing=True)
+skeleton_q1asm = {name: skeleton.q1asm(name) for name in skeleton.sequence_builders}
+
+programs = []
+for i, amplitude in enumerate([0.2, -0.3]):
+    p = skeleton.clone(path=f'q1/clone_{i}')
+    build_point(p, amplitude)
+    p.compile(listing=True)
+    programs.append(p)
+
+    p_ref = instrument.new_program(f'clone_ref_{i}')
+    build_common(p_ref)
+    build_point(p_ref, amplitude)
+    p_ref.compile(listing=True)
+    for name in p.sequence_builders:
+        assert p.q1asm(name) == p_ref.q1asm(name), name
+
+    output = render_program(p)
+    output_ref = render_program(p_ref)
+    for name in output:
+        assert first_difference(output[name], output_ref[name]) is None, name
+
+# skeleton is not changed by the clones
+assert skeleton.duration < programs[0].duration
+skeleton.compile(listing=True)
+for name in skeleton.sequence_builders:
+    assert skeleton.q1asm(name) == skeleton_q1asm[name], name
+
+p = skeleton.clone()
+try:
+    with p.loop_range(2):
+        p.clone()
+except Q1StateError as ex:
+    print(f'Expected error: {ex}')
+else:
+    raise Exception('No error for clone in loop')
+
+instrument.run_program(programs[1])
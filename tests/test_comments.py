@@ -0,0 +1,40 @@
+import os
+
+from q1pulse.instrument import Q1Instrument
+
+from init_pulsars import qcm0, qrm1
+
+
+def build(add_comments):
+    instrument = Q1Instrument('q1', add_comments=add_comments)
+    instrument.add_qcm(qcm0)
+    instrument.add_qrm(qrm1)
+    instrument.add_control('q1', qcm0.name, [0, 1], nco_frequency=0)
+    instrument.add_readout('R1', qrm1.name, [])
+
+    p = instrument.new_program(f'comments_{add_comments}')
+    p.R1.add_acquisition_bins('default', 10)
+    p.R1.integration_length_acq = 100
+    with p.loop_linspace(-0.5, 0.5, 10) as v:
+        p.q1.block_pulse(100, v)
+        p.q1.chirp(400, 0.5, 1e6, 10e6)
+        p.R1.acquire('default', 'increment')
+        p.wait(100)
+    p.add_comment('end of {} iterations', 10)
+    p.compile(listing=True)
+    with open(os.path.join(p.path, 'q1seq_q1.q1asm')) as fp:
+        listing = fp.read()
+    return p, instrument, listing
+
+
+p, instrument, listing = build(True)
+assert '# chirp(400, 0.5,   1.000,  10.000 MHz)' in listing, listing
+assert '# end of 10 iterations' in listing
+p.describe()
+
+p_no_comments, _, listing_no_comments = build(False)
+assert 'chirp(' not in listing_no_comments
+assert 'end of' not in listing_no_comments
+assert p.q1asm('q1')['program'] == p_no_comments.q1asm('q1')['program']
+
+instrument.run_program(p)
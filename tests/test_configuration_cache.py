@@ -0,0 +1,100 @@
+import json
+import os
+import sys
+import tempfile
+
+from qblox_instruments import ClusterType
+from qblox_instruments.ieee488_2 import IpTransport
+from qblox_instruments.scpi import Cluster as ClusterScpi
+from qblox_instruments.types import DebugLevel
+
+from q1pulse.turbo_cluster import TurboCluster, BufferedIpTransport
+
+# The SCPI emulator is in the benchmarks directory of the repository.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.scpi_emulator import ScpiEmulator  # noqa: E402
+
+
+HOST = "127.0.0.3"
+
+# Every write to a socket is followed by waiting for the response.
+# So the number of writes is the number of round trips.
+round_trips = []
+ip_transport_write = IpTransport.write
+buffered_write_lines = BufferedIpTransport.write_lines
+
+
+def counting_write(self, cmd_str):
+    round_trips.append([cmd_str])
+    ip_transport_write(self, cmd_str)
+
+
+def counting_write_lines(self, commands):
+    round_trips.append(commands)
+    buffered_write_lines(self, commands)
+
+
+def new_cluster():
+    return TurboCluster("configuration_cache", HOST, debug=DebugLevel.ERROR_CHECK)
+
+
+configuration_cache_dir = TurboCluster.configuration_cache_dir
+
+with (tempfile.TemporaryDirectory() as cache_dir,
+      ScpiEmulator({2: ClusterType.CLUSTER_QCM, 4: ClusterType.CLUSTER_QRM}, HOST)):
+    TurboCluster.configuration_cache_dir = cache_dir
+    try:
+        cluster = new_cluster()
+        for seq_nr in range(3):
+            cluster.module2.sequencers[seq_nr].offset_awg_path0(0.1 * seq_nr)
+            cluster.module4.sequencers[seq_nr].offset_awg_path0(0.1 * seq_nr)
+        cluster.module2.sequencer0.connect_out0("I")
+        cluster.close()
+
+        [filename] = os.listdir(cache_dir)
+        with open(os.path.join(cache_dir, filename)) as fp:
+            data = json.load(fp)
+        assert data["slots"]["2"]["sequencer_config"] == [0, 1, 2]
+
+        # warm cache: the configurations are read with one round trip per module
+        cluster = new_cluster()
+        cluster._clear_cache()
+        IpTransport.write = counting_write
+        BufferedIpTransport.write_lines = counting_write_lines
+        try:
+            cluster._load_configuration_cache()
+        finally:
+            IpTransport.write = ip_transport_write
+            BufferedIpTransport.write_lines = buffered_write_lines
+        # description of the cluster and 1 request per module
+        assert len(round_trips) == 3, round_trips
+        assert sorted(cluster._sequencer_config_cache) == [(2, 0), (2, 1), (2, 2), (4, 0), (4, 1), (4, 2)]
+        assert (2, 0) in cluster._channel_map_cache
+        assert cluster.module2.sequencer2.offset_awg_path0() == 0.2
+        assert cluster.module4.sequencer1.offset_awg_path0() == 0.1
+        assert cluster.get_system_errors() == []
+
+        # change the configuration of a sequencer without updating the cache
+        config = ClusterScpi._get_sequencer_config(cluster, 2, 2)
+        config["awg"][0]["offs_path"][0] = -0.3
+        ClusterScpi._set_sequencer_config(cluster, 2, 2, config)
+        cluster.close()
+
+        # the cached configurations are read from the module
+        cluster = new_cluster()
+        assert (2, 2) in cluster._sequencer_config_cache
+        assert cluster.module2.sequencer2.offset_awg_path0() == -0.3
+        assert cluster.module2.sequencer1.offset_awg_path0() == 0.1
+        assert cluster.get_system_errors() == []
+
+        # a slot with another module is not read
+        data["slots"]["2"]["module"]["serial"] = "other"
+        with open(os.path.join(cache_dir, filename), "w") as fp:
+            json.dump(data, fp)
+        cluster._clear_cache()
+        cluster._load_configuration_cache()
+        assert sorted(cluster._sequencer_config_cache) == [(4, 0), (4, 1), (4, 2)]
+        TurboCluster.configuration_cache_dir = None
+        cluster.close()
+    finally:
+        TurboCluster.configuration_cache_dir = configuration_cache_dir
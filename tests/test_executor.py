@@ -0,0 +1,59 @@
+import numpy as np
+
+from q1pulse.instrument import Q1Instrument
+from q1pulse.assembler.executor import execute_program, RtEvent
+
+from init_pulsars import qcm0, qrm1
+
+instrument = Q1Instrument('q1')
+instrument.add_qcm(qcm0)
+instrument.add_qrm(qrm1)
+instrument.add_control('P1', qcm0.name, [0])
+instrument.add_readout('R1', qrm1.name, [])
+
+p = instrument.new_program('executor')
+p.repetitions = 2
+
+P1 = p.P1
+R1 = p.R1
+
+N = 1000
+R1.add_acquisition_bins('default', N * p.repetitions)
+R1.integration_length_acq = 100
+
+with p.loop_linspace(-0.5, 0.5, N) as v1:
+    with p.parallel():
+        P1.set_markers(1)
+        P1.block_pulse(200, v1)
+        R1.acquire('default', 'increment', t_offset=60)
+    P1.set_markers(0)
+    p.wait(300)
+
+p.compile(listing=True)
+
+results = execute_program(p)
+
+# program starts after wait_sync of 100 ns.
+t_start = 100
+t_iteration = 500
+
+P1_result = results['P1']
+offsets = P1_result.select(RtEvent.OFFSET)
+t_pulse = t_start + np.arange(2 * N) * t_iteration
+np.testing.assert_array_equal(offsets['time'][0::2], t_pulse)
+np.testing.assert_array_equal(offsets['time'][1::2], t_pulse + 200)
+amplitudes = np.linspace(-0.5, 0.5, N)
+np.testing.assert_allclose(offsets['arg0'][0::2] / 32768, np.tile(amplitudes, 2), atol=1e-4)
+assert np.all(offsets['arg0'][1::2] == 0)
+
+markers = P1_result.select(RtEvent.MARKER)
+np.testing.assert_array_equal(markers['time'][0::2], t_pulse)
+np.testing.assert_array_equal(markers['arg0'], np.tile([1, 0], 2 * N))
+
+acquisitions = results['R1'].select(RtEvent.ACQUIRE)
+np.testing.assert_array_equal(acquisitions['time'], t_pulse + 60)
+np.testing.assert_array_equal(acquisitions['arg1'], np.arange(2 * N))
+
+assert P1_result.end_time == results['R1'].end_time
+print(f'P1: {P1_result.n_instructions} instructions, {len(P1_result.events)} events, '
+      f'end time {P1_result.end_time} ns')
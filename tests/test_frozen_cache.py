@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+
+from qblox_instruments import ClusterType
+from qblox_instruments.types import DebugLevel
+
+from q1pulse.turbo_cluster import TurboCluster
+from q1pulse.util.frozen_json import FrozenDict, FrozenList, freeze, cow_copy
+
+# The SCPI emulator is in the benchmarks directory of the repository.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.scpi_emulator import ScpiEmulator  # noqa: E402
+
+
+def assert_raises(exception_type, func, *args):
+    try:
+        func(*args)
+    except exception_type:
+        return
+    raise AssertionError(f"{exception_type.__name__} expected")
+
+
+config = {
+    "awg": [{"offs_path": [0.0, 0.0], "nco": {"freq_hz": 0.0}}],
+    "seq_proc": {"sync_en": False},
+    }
+frozen = freeze(config)
+assert type(frozen) is FrozenDict
+assert type(frozen["awg"]) is FrozenList
+assert frozen == config
+assert json.loads(json.dumps(frozen)) == config
+
+# frozen values cannot be modified
+assert_raises(TypeError, frozen.__setitem__, "seq_proc", {})
+assert_raises(TypeError, frozen.__delitem__, "seq_proc")
+assert_raises(TypeError, frozen.update, {"x": 1})
+assert_raises(TypeError, frozen.pop, "awg")
+assert_raises(TypeError, frozen.setdefault, "x", 1)
+assert_raises(TypeError, frozen["awg"].append, {})
+assert_raises(TypeError, frozen["awg"][0]["offs_path"].__setitem__, 0, 1.0)
+assert_raises(TypeError, frozen["seq_proc"].__setitem__, "sync_en", True)
+
+# a copy-on-write copy can be modified without modifying the frozen value
+copy = cow_copy(frozen)
+copy["awg"][0]["offs_path"][0] = 0.5
+copy["awg"][0]["nco"]["freq_hz"] = 1e6
+copy["seq_proc"]["sync_en"] = True
+copy["x"] = 1
+assert frozen == config
+assert copy["awg"][0]["offs_path"] == [0.5, 0.0]
+assert copy["awg"][0]["nco"]["freq_hz"] == 1e6
+# values that are not accessed with [] or get are not copied and are read-only
+assert_raises(TypeError, next(iter(cow_copy(frozen).values())).append, {})
+
+# freeze shares the nodes that were not accessed
+copy = cow_copy(frozen)
+copy["awg"][0]["offs_path"][1] = 0.5
+refrozen = freeze(copy)
+assert refrozen["seq_proc"] is frozen["seq_proc"]
+assert refrozen["awg"][0]["offs_path"] == [0.0, 0.5]
+assert frozen["awg"][0]["offs_path"] == [0.0, 0.0]
+
+
+# Configuration cache of TurboCluster
+HOST = "127.0.0.3"
+
+with ScpiEmulator({2: ClusterType.CLUSTER_QCM}, HOST):
+    cluster = TurboCluster("frozen_cache", HOST, debug=DebugLevel.ERROR_CHECK)
+    try:
+        assert TurboCluster.use_configuration_cache
+        sequencer = cluster.module2.sequencer0
+        sequencer.offset_awg_path0(0.25)
+        cached = cluster._sequencer_config_cache[(2, 0)]
+        assert type(cached) is FrozenDict
+
+        # modifying a returned configuration does not modify the cache
+        config = cluster._get_sequencer_config(2, 0)
+        config["awg"][0]["offs_path"][0] = -0.5
+        config["seq_proc"]["sync_en"] = True
+        assert cluster._sequencer_config_cache[(2, 0)] is cached
+        assert cluster._get_sequencer_config(2, 0)["awg"][0]["offs_path"][0] == 0.25
+        assert sequencer.offset_awg_path0() == 0.25
+        assert sequencer.sync_en() is False
+
+        # the cache cannot be modified via the frozen values
+        assert_raises(TypeError, cached["awg"][0]["offs_path"].__setitem__, 0, -0.5)
+
+        # channel map
+        channel_map = cluster._get_sequencer_channel_map(2, 0)
+        original = json.loads(json.dumps(channel_map))
+        channel_map[0].append(3)
+        assert cluster._get_sequencer_channel_map(2, 0) == original
+
+        assert cluster.get_system_errors() == []
+    finally:
+        cluster.close()
@@ -0,0 +1,74 @@
+import faulthandler
+
+import numpy as np
+
+from q1simulator import Cluster as SimCluster
+from q1pulse.instrument import Q1Instrument
+
+# Fail instead of hanging when the instruments wait for each other.
+faulthandler.dump_traceback_later(120, exit=True)
+
+cluster_a = SimCluster('Cluster_A', {2: 'QCM', 4: 'QRM'})
+cluster_b = SimCluster('Cluster_B', {2: 'QCM', 4: 'QRM'})
+
+instrument = Q1Instrument('q1')
+for cluster in [cluster_a, cluster_b]:
+    instrument.add_qcm(cluster.module2)
+    instrument.add_qrm(cluster.module4)
+instrument.add_control('P1', cluster_a.module2.name, [0])
+instrument.add_control('P2', cluster_b.module2.name, [0])
+instrument.add_readout('R1', cluster_a.module4.name, [])
+instrument.add_readout('R2', cluster_b.module4.name, [])
+assert len(instrument.root_instruments) == 2
+
+# Record the order of arm and start, and the number of times the start time is set.
+events = []
+
+
+def record(name, func):
+    def wrapper(*args, **kwargs):
+        events.append(name)
+        return func(*args, **kwargs)
+    return wrapper
+
+
+for module in instrument.modules.values():
+    module.arm_sequencers = record('arm', module.arm_sequencers)
+    module.start_sequencers = record('start', module.start_sequencers)
+instrument._set_start_time = record('t_start', instrument._set_start_time)
+
+N = 10
+
+for concurrent in [True, False]:
+    Q1Instrument.concurrent_communication = concurrent
+
+    p = instrument.new_program(f'multi_cluster_{concurrent}')
+    p.repetitions = 1
+
+    for R in [p.R1, p.R2]:
+        R.add_acquisition_bins('default', N)
+        R.integration_length_acq = 100
+
+    with p.loop_linspace(-0.5, 0.5, N) as v:
+        with p.parallel():
+            p.P1.block_pulse(200, v)
+            p.P2.block_pulse(200, -v)
+            p.R1.acquire('default', 'increment', t_offset=60)
+            p.R2.acquire('default', 'increment', t_offset=60)
+        p.wait(100)
+
+    p.compile(listing=True)
+
+    events.clear()
+    instrument.run_program(p)
+    # all modules are armed before the first start. The start time is set once.
+    assert events.count('t_start') == 1, events
+    events.remove('t_start')
+    assert events == ['arm'] * 4 + ['start'] * 4, events
+
+    acquisitions = instrument.get_all_acquisitions()
+    for name in ['R1', 'R2']:
+        np.testing.assert_array_equal(acquisitions[name]['default']['avg_cnt'], 1)
+
+Q1Instrument.concurrent_communication = True
+faulthandler.cancel_dump_traceback_later()
@@ -0,0 +1,81 @@
+from q1pulse.util.poll_scheduler import PollScheduler, PollStatistics
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.t
+
+    def sleep(self, t):
+        self.sleeps.append(t)
+        self.t += t
+
+
+def new_scheduler(expected_duration, timeout):
+    clock = FakeClock()
+    scheduler = PollScheduler(clock.t, expected_duration, timeout, clock=clock, sleep=clock.sleep)
+    return scheduler, clock
+
+
+# Sleep in steps of max_sleep till lead time before the predicted end of the program.
+scheduler, clock = new_scheduler(expected_duration=0.25, timeout=10.0)
+t_end = clock.t + 0.25
+while clock.t < t_end - PollScheduler.lead_time - 1e-9:
+    scheduler.polled(ready=False)
+assert all(t <= PollScheduler.max_sleep for t in clock.sleeps)
+assert abs(clock.t - (t_end - PollScheduler.lead_time)) < 1e-9, clock.t - t_end
+
+# After the predicted end poll with exponential backoff limited to max_interval.
+clock.sleeps = []
+for _ in range(10):
+    scheduler.polled(ready=False)
+expected = []
+interval = PollScheduler.min_interval
+for _ in range(10):
+    expected.append(interval)
+    interval = min(interval * PollScheduler.backoff, PollScheduler.max_interval)
+assert clock.sleeps == expected, clock.sleeps
+assert clock.sleeps[-1] == PollScheduler.max_interval
+
+# Ready poll does not sleep.
+n_sleeps = len(clock.sleeps)
+scheduler.polled(ready=True)
+assert len(clock.sleeps) == n_sleeps
+stats = scheduler.statistics
+assert stats.n_polls == stats.n_wasted_polls + 1
+assert abs(stats.sleep_time - (clock.t - 100.0)) < 1e-9
+assert abs(stats.actual_duration - (clock.t - 100.0)) < 1e-9
+assert stats.expected_duration == 0.25
+
+# Never sleep beyond the timeout.
+scheduler, clock = new_scheduler(expected_duration=10.0, timeout=0.15)
+for _ in range(10):
+    scheduler.polled(ready=False)
+assert len(clock.sleeps) == 2, clock.sleeps
+assert abs(sum(clock.sleeps) - 0.15) < 1e-9, clock.sleeps
+clock.t += 1e-6
+assert scheduler.expired
+
+# abort stops sleeping immediately.
+scheduler, clock = new_scheduler(expected_duration=10.0, timeout=60.0)
+scheduler.polled(ready=False)
+assert not scheduler.expired
+scheduler.abort()
+assert scheduler.expired
+scheduler.polled(ready=False)
+assert len(clock.sleeps) == 1
+
+# Combine statistics of instruments that were polled in parallel.
+combined = PollStatistics.combine([
+    PollStatistics(n_polls=3, n_wasted_polls=2, sleep_time=0.1, expected_duration=0.5, actual_duration=0.6),
+    PollStatistics(n_polls=5, n_wasted_polls=4, sleep_time=0.2, expected_duration=0.4, actual_duration=0.7),
+    ])
+assert combined.n_polls == 8
+assert combined.n_wasted_polls == 6
+assert abs(combined.sleep_time - 0.3) < 1e-12
+assert combined.expected_duration == 0.5
+assert combined.actual_duration == 0.7
+assert PollStatistics.combine([]) == PollStatistics()
@@ -0,0 +1,55 @@
+import json
+import os
+
+from q1pulse.instrument import Q1Instrument
+from q1pulse.util.profiler import Profiler
+
+from init_pulsars import qcm0, qrm1
+
+instrument = Q1Instrument('q1')
+instrument.add_qcm(qcm0)
+instrument.add_qrm(qrm1)
+instrument.add_control('P1', qcm0.name, [0])
+instrument.add_control('P2', qcm0.name, [1])
+instrument.add_readout('R1', qrm1.name, [], in_channels=[0,1])
+
+p = instrument.new_program('profiler')
+p.repetitions = 1
+
+P1 = p.P1
+P2 = p.P2
+R1 = p.R1
+
+N = 20
+R1.add_acquisition_bins('default', N)
+R1.integration_length_acq = 100
+
+with Profiler() as profiler:
+    with p.loop_linspace(-0.5, 0.5, N) as v1:
+        with p.parallel():
+            P1.block_pulse(200, v1)
+            P2.block_pulse(200, -v1)
+            R1.acquire('default', 'increment', t_offset=60)
+        p.wait(100)
+
+    p.compile(listing=True)
+
+    instrument.run_program(p)
+    instrument.get_all_acquisitions()
+
+for phase, (n, duration) in profiler.summary().items():
+    print(f'{phase:12} {n:3} {duration*1000:7.2f} ms')
+
+phases = {span.phase for span in profiler.spans}
+for phase in ['compile', 'assemble', 'serialize', 'upload', 'configure', 'arm', 'start', 'poll', 'fetch']:
+    assert phase in phases, phase
+assert {span.sequencer for span in profiler.spans if span.phase == 'compile'} == {'P1', 'P2', 'R1'}
+# serialize is nested in assemble and gets the sequencer of assemble
+assert {span.sequencer for span in profiler.spans if span.phase == 'serialize'} == {'P1', 'P2', 'R1'}
+
+filename = os.path.join(p.path, 'trace.json')
+profiler.save_chrome_trace(filename)
+with open(filename) as f:
+    trace = json.load(f)
+assert len([e for e in trace['traceEvents'] if e['ph'] == 'X']) == len(profiler.spans)
+os.remove(filename)
@@ -0,0 +1,97 @@
+import os
+import tempfile
+
+import numpy as np
+import scipy.signal as signal
+
+from q1pulse.instrument import Q1Instrument
+from q1pulse.assembler.renderer import render_program, first_difference
+
+from init_pulsars import qcm0, qrm1
+
+instrument = Q1Instrument('q1')
+instrument.add_qcm(qcm0)
+instrument.add_qrm(qrm1)
+instrument.add_control('P1', qcm0.name, [0])
+instrument.add_control('P2', qcm0.name, [1])
+instrument.add_readout('R1', qrm1.name, [])
+
+p = instrument.new_program('renderer')
+p.repetitions = 1
+
+P1 = p.P1
+P2 = p.P2
+R1 = p.R1
+
+tukey100 = P2.add_wave('tukey100', signal.windows.tukey(100, 0.5))
+
+N = 100
+R1.add_acquisition_bins('default', N)
+R1.integration_length_acq = 100
+
+with p.loop_linspace(-0.5, 0.5, N) as v1:
+    with p.parallel():
+        P1.set_markers(1)
+        P1.block_pulse(200, v1)
+        P2.shaped_pulse(tukey100, 0.5, t_offset=40)
+        R1.acquire('default', 'increment', t_offset=60)
+    P1.set_markers(0)
+    p.wait(300)
+
+p.compile(listing=True)
+
+# render in small chunks to test chunk boundaries.
+with tempfile.TemporaryDirectory() as directory:
+    outputs = render_program(p, directory=directory, chunk_size=777)
+    reference = render_program(p)
+    for name in ['P1', 'P2', 'R1']:
+        assert first_difference(outputs[name], reference[name]) is None, name
+    saved = np.load(os.path.join(directory, 'P1.npy'), mmap_mode='r')
+    assert first_difference(saved, reference['P1']) is None
+    del outputs, saved
+
+# program starts after wait_sync of 100 ns.
+t_start = 100
+t_iteration = 500
+out = reference['P1']
+assert len(out) == t_start + N * t_iteration + 4
+amplitudes = np.linspace(-0.5, 0.5, N)
+for i in [0, 1, N//2, N-1]:
+    t = t_start + i * t_iteration
+    pulse = out[t:t+200]
+    assert np.all(pulse['marker'] == 1)
+    np.testing.assert_allclose(pulse['path0'] / 32768, amplitudes[i], atol=1e-4)
+    assert np.all(out[t+200:t+t_iteration]['path0'] == 0)
+    assert np.all(out[t+200:t+t_iteration]['marker'] == 0)
+assert np.all(out['path1'] == 0)
+
+out = reference['P2']
+wave = (signal.windows.tukey(100, 0.5) * 2**15).astype(np.int32)
+expected = (16383 * wave) >> 15
+for i in [0, N-1]:
+    t = t_start + i * t_iteration + 40
+    np.testing.assert_array_equal(out[t:t+100]['path0'], expected)
+    assert np.all(out[t+100:t+t_iteration]['path0'] == 0)
+
+assert not np.any(reference['R1']['path0'])
+
+modified = reference['P1'].copy()
+modified['path0'][12345] += 1
+assert first_difference(modified, reference['P1']) == 12345
+assert first_difference(modified[:1000], reference['P1']) == 1000
+
+# offset plus full scale wave saturates instead of wrapping around.
+p = instrument.new_program('renderer_saturation')
+p.repetitions = 1
+P1 = p.P1
+ones = P1.add_wave('ones100', np.ones(100))
+P1.set_offset(0.5, -0.5)
+P1.shaped_pulse(ones, 1.0, ones, -1.0)
+P1.set_offset(0.0, 0.0)
+p.wait(100)
+p.compile()
+
+out = render_program(p)['P1']
+pulse = out[t_start:t_start+100]
+assert np.all(pulse['path0'] == 32767)
+assert np.all(pulse['path1'] == -32768)
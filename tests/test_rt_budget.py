@@ -0,0 +1,41 @@
+
+from q1pulse.instrument import Q1Instrument
+
+from init_pulsars import qcm0, qrm1
+
+instrument = Q1Instrument('q1')
+instrument.add_qcm(qcm0)
+instrument.add_qrm(qrm1)
+instrument.add_control('P1', qcm0.name, [0])
+instrument.add_control('P2', qcm0.name, [1])
+
+p = instrument.new_program('rt_budget')
+p.repetitions = 1
+
+P1 = p.P1
+P2 = p.P2
+
+# loop body takes 20 ns of Q1 instructions and 8 ns real-time.
+with p.loop_range(1000):
+    P1.block_pulse(8, 0.5)
+
+with p.loop_array([0.1, 0.2, 0.3]) as v:
+    P2.set_offset(v)
+    p.wait(4)
+
+# sufficient real-time for the Q1 instructions.
+with p.loop_range(1000):
+    P1.block_pulse(100, 0.5)
+
+# Only compile. Running the program would fail with RT EXEC COMMAND UNDERFLOW.
+p.compile(listing=True)
+
+for name in ['P1', 'P2']:
+    violations = p.statistics(name).rt_budget_violations
+    for violation in violations:
+        print(name, violation)
+    # range loop with block pulse of 8 ns and array loop are flagged.
+    assert [v.label for v in violations] == ['loop_0', 'loop_1']
+    assert all(v.q1_time > v.rt_time for v in violations)
+violation = p.statistics('P1').rt_budget_violations[0]
+assert (violation.q1_time, violation.rt_time) == (20, 8)
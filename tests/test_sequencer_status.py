@@ -0,0 +1,35 @@
+import logging
+
+from q1pulse.modules.sequencer_states import parse_sequencer_status
+
+# Flags are reported with ' ', '_' or '-' as separator.
+for response in [
+        'OKAY;STOPPED;ACQ BINNING DONE,;;;',
+        'OKAY;STOPPED;ACQ_BINNING_DONE,;;;',
+        'OKAY;STOPPED;ACQ-BINNING-DONE,;;;',
+        ]:
+    status = parse_sequencer_status(response)
+    assert status.state == 'STOPPED', status
+    assert status.status == 'OKAY', status
+    assert status.level == logging.DEBUG, status
+    assert status.debug_msgs == ('ACQ BINNING DONE',), status
+    assert not status.errors
+
+for response in [
+        'OKAY;STOPPED;;ACQ SCOPE OUT OF RANGE PATH 0,;SEQUENCE PROCESSOR RT EXEC COMMAND UNDERFLOW,;',
+        'OKAY;STOPPED;;ACQ_SCOPE_OUT_OF_RANGE_PATH_0,;SEQUENCE_PROCESSOR_RT_EXEC_COMMAND_UNDERFLOW,;',
+        ]:
+    status = parse_sequencer_status(response)
+    assert status.level == logging.ERROR, status
+    assert status.warnings == ('ACQ SCOPE OUT OF RANGE PATH 0',), status
+    assert status.errors == ('SEQUENCE PROCESSOR RT EXEC COMMAND UNDERFLOW',), status
+    assert status.input_overloaded
+
+status = parse_sequencer_status('OKAY;Q1 STOPPED;;;;')
+assert status.state == 'Q1_STOPPED', status
+assert status.level == logging.DEBUG
+
+# Unknown flags are errors.
+status = parse_sequencer_status('OKAY;STOPPED;NO SUCH FLAG,;;;')
+assert status.level == logging.ERROR, status
+assert status.errors == ('NO SUCH FLAG',), status
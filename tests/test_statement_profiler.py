@@ -0,0 +1,59 @@
+from q1pulse.instrument import Q1Instrument
+from q1pulse.util.statement_profiler import StatementProfiler
+
+from init_pulsars import qcm0, qrm1
+
+instrument = Q1Instrument('q1')
+instrument.add_qcm(qcm0)
+instrument.add_qrm(qrm1)
+instrument.add_control('P1', qcm0.name, [0])
+instrument.add_control('P2', qcm0.name, [1])
+instrument.add_readout('R1', qrm1.name, [])
+
+p = instrument.new_program('statement_profiler')
+p.repetitions = 1
+
+P1 = p.P1
+P2 = p.P2
+R1 = p.R1
+
+N = 20
+R1.add_acquisition_bins('default', N)
+R1.integration_length_acq = 100
+
+
+def pulse_library_ramp(v):
+    P1.ramp(400, -v, v)
+
+
+with p.loop_linspace(-0.5, 0.5, N) as v1:
+    with p.parallel():
+        P2.block_pulse(200, v1)
+        R1.acquire('default', 'increment', t_offset=60)
+    pulse_library_ramp(0.4)
+    p.wait(100)
+
+with StatementProfiler() as profiler:
+    p.compile(listing=True)
+
+print(profiler.report(5))
+
+assert 'LoopStatement' in profiler.per_class
+ramp_line = pulse_library_ramp.__code__.co_firstlineno + 1
+ramp_sites = [site for site in profiler.per_call_site if site.endswith(f':{ramp_line}')]
+assert len(ramp_sites) == 1, list(profiler.per_call_site)
+ramp = profiler.per_call_site[ramp_sites[0]]
+# ramp statements are executed at least N times
+assert ramp.n_instructions > 0
+assert ramp.n_executed >= N * ramp.n_instructions
+
+n_instructions = sum(stats.n_instructions for stats in profiler.per_class.values())
+n_program = sum(p.statistics(name).n_instructions for name in ['P1', 'P2', 'R1'])
+# the instructions of generator.start_main and end_main are not emitted by statements
+assert 0 < n_instructions < n_program, (n_instructions, n_program)
+
+top = profiler.top(3, key='n_executed', per='class')
+assert len(top) == 3
+assert top[0][1].n_executed >= top[1][1].n_executed >= top[2][1].n_executed
+
+instrument.run_program(p)
@@ -0,0 +1,77 @@
+import numpy as np
+
+from q1pulse.instrument import Q1Instrument
+
+from init_pulsars import qcm0, qrm1
+
+instrument = Q1Instrument('q1')
+instrument.add_qcm(qcm0)
+instrument.add_qrm(qrm1)
+instrument.add_control('P1', qcm0.name, [0])
+instrument.add_control('P2', qcm0.name, [1])
+instrument.add_control('P3', qcm0.name, [2])
+instrument.add_readout('R1', qrm1.name, [])
+
+p = instrument.new_program('statistics')
+p.repetitions = 1
+
+P1 = p.P1
+P2 = p.P2
+R1 = p.R1
+
+R1.add_acquisition_bins('default', 1)
+R1.add_weight('ones100', np.ones(100))
+R1.add_weight('ones60', np.ones(60))
+
+P1.add_wave('ramp80', np.linspace(0, 1, 80))
+P1.add_wave('ramp40', np.linspace(1, 0, 40))
+
+p.R.t_wait = 200
+P1.shaped_pulse('ramp80', 0.5)
+p.wait(100)
+P1.shaped_pulse('ramp40', 0.5)
+# wait with register time
+p.wait(p.R.t_wait)
+# long wait of 10 x 65532 ns is compiled to a wait loop
+p.wait(655_320)
+with p.loop_range(4):
+    P2.block_pulse(100, 0.5)
+p.wait(100)
+R1.acquire_weighed('default', 0, 'ones100', 'ones60')
+p.wait(200)
+# P3 has no statements
+
+p.compile()
+
+for name in ['P1', 'P2', 'P3', 'R1']:
+    print(name, p.statistics(name))
+
+stats = p.statistics('P1')
+assert stats.n_waveforms == 2
+assert stats.waveform_memory == 120
+assert stats.n_weights == 0
+assert stats.weight_memory == 0
+assert stats.n_wait_loops == 2
+# t_wait and the loop counter of the wait loop
+assert stats.n_registers >= 2
+assert stats.n_instructions >= stats.n_upd_params > 0
+assert stats.n_rt_instructions >= 10
+assert p.q1asm('P1') is not None
+
+stats = p.statistics('P2')
+assert stats.n_waveforms == 0
+# loop register of range loop
+assert stats.n_registers >= 2
+
+stats = p.statistics('R1')
+assert stats.n_weights == 2
+assert stats.weight_memory == 160
+assert 0 < stats.weight_memory_usage < 1
+
+# sequencer without I/O: no program, but statistics are available.
+stats = p.statistics('P3')
+assert p.q1asm('P3') is None
+assert stats.n_instructions > 0
+# waits of the program are compiled for all sequencers
+assert stats.n_wait_loops == 2
+assert stats.n_waveforms == 0
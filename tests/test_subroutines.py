@@ -0,0 +1,113 @@
+from q1pulse.instrument import Q1Instrument
+from q1pulse.assembler.renderer import render_program, first_difference
+
+from init_pulsars import qcm0, qrm1
+
+instrument = Q1Instrument('q1')
+instrument.add_qcm(qcm0)
+instrument.add_qrm(qrm1)
+instrument.add_control('P1', qcm0.name, [0])
+instrument.add_control('q1', qcm0.name, [2, 3], nco_frequency=20e6)
+instrument.add_readout('R1', qrm1.name, [])
+
+
+def pulse(P1):
+    P1.block_pulse(100, 0.5)
+    P1.ramp(40, 0.5, 0.0)
+
+
+# inline versions of pulse and xx in a parallel section
+def pulse_parallel(P1):
+    P1.block_pulse(100, 0.5)
+    P1.ramp(40, 0.5, 0.0, t_offset=100)
+
+
+def xx_parallel(q1, t_offset):
+    q1.block_pulse(20, 0.3, t_offset=t_offset)
+    q1.shift_phase(0.25, t_offset=t_offset+20)
+    q1.block_pulse(20, 0.3, t_offset=t_offset+20)
+
+
+def build(use_subroutines):
+    p = instrument.new_program(f'subroutines_{use_subroutines}')
+    p.repetitions = 2
+    P1 = p.P1
+    q1 = p.q1
+    R1 = p.R1
+    trigger = p.configure_trigger('R1')
+    counter = p.add_trigger_counter(trigger)
+    R1.add_acquisition_bins('default', 20)
+    R1.integration_length_acq = 100
+    R1.thresholded_acq_threshold = 0.1
+
+    if use_subroutines:
+        with P1.subroutine('pulse'):
+            pulse(P1)
+        with q1.subroutine('x90'):
+            q1.block_pulse(20, 0.3)
+        with q1.subroutine('xx'):
+            q1.call('x90')
+            q1.shift_phase(0.25)
+            q1.call('x90')
+
+    with p.loop_range(10):
+        with p.parallel():
+            if use_subroutines:
+                P1.call('pulse')
+                q1.call('xx', t_offset=8)
+            else:
+                pulse_parallel(P1)
+                xx_parallel(q1, t_offset=8)
+            R1.acquire('default', 'increment', t_offset=60)
+        p.wait(100)
+        P1.set_offset(0.1)
+        p.wait(20)
+        P1.set_offset(0.0)
+        for _ in range(10):
+            if use_subroutines:
+                P1.call('pulse')
+            else:
+                pulse(P1)
+            p.wait(60)
+
+    p.wait(100)
+    p.latch_reset()
+    p.wait(20)
+    P1.latch_enable(True)
+    p.wait(500)
+    with P1.conditional([counter], evaluation_time=20) as flags:
+        with flags.all_set():
+            if use_subroutines:
+                P1.call('pulse')
+            else:
+                pulse(P1)
+        with flags.none_set():
+            P1.ramp(60, 0.25, 0.0)
+    p.wait(40)
+    P1.ramp(60, 0.25, 0.5)
+    p.wait(20)
+    P1.latch_enable(False)
+    p.wait(20)
+
+    p.compile(listing=True)
+    return p
+
+
+p_inline = build(False)
+p = build(True)
+p.describe()
+
+assert p.duration == p_inline.duration
+for condition in [False, True]:
+    output = render_program(p, condition=condition)
+    output_inline = render_program(p_inline, condition=condition)
+    for name in output:
+        t = first_difference(output[name], output_inline[name])
+        assert t is None, (name, condition, t)
+
+n_instructions = p.statistics('P1').n_instructions
+n_instructions_inline = p_inline.statistics('P1').n_instructions
+print(f'P1 instructions: {n_instructions} (inline {n_instructions_inline})')
+assert n_instructions < n_instructions_inline
+
+instrument.run_program(p)
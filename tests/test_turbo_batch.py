@@ -0,0 +1,91 @@
+import os
+import sys
+
+from qblox_instruments import ClusterType
+from qblox_instruments.ieee488_2 import IpTransport
+from qblox_instruments.types import DebugLevel
+
+from q1pulse.turbo_cluster import TurboCluster, BufferedIpTransport
+
+# The SCPI emulator is in the benchmarks directory of the repository.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.scpi_emulator import ScpiEmulator  # noqa: E402
+
+
+HOST = "127.0.0.3"
+CMM_PORT = 5025
+
+# Record the order in which the commands are written to the sockets.
+wire_log = []
+ip_transport_write = IpTransport.write
+buffered_write_lines = BufferedIpTransport.write_lines
+
+
+def port_of(transport):
+    return transport._socket.getpeername()[1]
+
+
+def logging_write(self, cmd_str):
+    wire_log.append((port_of(self), cmd_str))
+    ip_transport_write(self, cmd_str)
+
+
+def logging_write_lines(self, commands):
+    wire_log.extend((port_of(self), cmd) for cmd in commands)
+    buffered_write_lines(self, commands)
+
+
+def module_port(slot):
+    return 25000 + slot
+
+
+with ScpiEmulator({2: ClusterType.CLUSTER_QCM, 4: ClusterType.CLUSTER_QRM}, HOST):
+    cluster = TurboCluster("turbo_batch", HOST, debug=DebugLevel.ERROR_CHECK)
+    IpTransport.write = logging_write
+    BufferedIpTransport.write_lines = logging_write_lines
+    try:
+        cluster.get_system_errors()
+
+        wire_log.clear()
+        with cluster.batch():
+            cluster.stop_sequencer(2, 0)
+            cluster.stop_sequencer(4, 1)
+            assert wire_log == []
+            # a command for the CMM does not overtake the batched module commands
+            cluster.stop_sequencer()
+            assert wire_log == [
+                (module_port(2), "SEQuencer0:STOP"),
+                (module_port(4), "SEQuencer1:STOP"),
+                (CMM_PORT, "SLOT:SEQuencer:STOP"),
+                ]
+            cluster.arm_sequencer(2, 0)
+            assert len(wire_log) == 3
+        assert wire_log[3:] == [(module_port(2), "SEQuencer0:ARM")]
+
+        # a request to the CMM sends the pending commands first
+        wire_log.clear()
+        with cluster.batch():
+            cluster.stop_sequencer(4, 0)
+            assert "Cluster MM" in cluster._read("*IDN?")
+        assert wire_log == [
+            (module_port(4), "SEQuencer0:STOP"),
+            (CMM_PORT, "*IDN?"),
+            ]
+
+        # a request to a module only sends the pending commands of that module
+        wire_log.clear()
+        with cluster.batch():
+            cluster.stop_sequencer(2, 1)
+            cluster.stop_sequencer(4, 1)
+            cluster.module4.get_sequencer_status(1)
+            assert wire_log == [
+                (module_port(4), "SEQuencer1:STOP"),
+                (module_port(4), "SEQuencer1:STATE?"),
+                ]
+        assert wire_log[2:] == [(module_port(2), "SEQuencer1:STOP")]
+
+        assert cluster.get_system_errors() == []
+    finally:
+        IpTransport.write = ip_transport_write
+        BufferedIpTransport.write_lines = buffered_write_lines
+        cluster.close()
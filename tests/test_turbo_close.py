@@ -0,0 +1,42 @@
+import os
+import sys
+
+from qblox_instruments import ClusterType
+from qblox_instruments.types import DebugLevel
+
+from q1pulse.turbo_cluster import TurboCluster
+
+# The SCPI emulator is in the benchmarks directory of the repository.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.scpi_emulator import ScpiEmulator  # noqa: E402
+
+
+HOST = "127.0.0.3"
+
+sequence = {
+    "waveforms": {},
+    "weights": {},
+    "acquisitions": {"default": {"num_bins": 4, "index": 0}},
+    "program": "stop",
+    }
+
+with ScpiEmulator({2: ClusterType.CLUSTER_QCM, 4: ClusterType.CLUSTER_QRM}, HOST):
+    cluster = TurboCluster("turbo_close", HOST, debug=DebugLevel.ERROR_CHECK)
+    cluster.module4.sequencer0.sequence(sequence)
+    cluster.get_system_errors()
+    cluster.get_acquisitions_multiple([(4, 0, "default")])
+    cluster._connections[2]
+
+    transports = [conn._transport for conn in cluster._connections.values()]
+    transports += [conn._transport for conn in cluster._bulk_pools[4]._free]
+    assert len(transports) == 3
+    assert all(transport._socket.fileno() != -1 for transport in transports)
+
+    cluster.close()
+    assert all(transport._socket.fileno() == -1 for transport in transports)
+    # close can be called multiple times
+    cluster.close()
+
+    # close while connections are being opened
+    cluster = TurboCluster("turbo_close", HOST, debug=DebugLevel.ERROR_CHECK)
+    cluster.close()
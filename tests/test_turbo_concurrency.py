@@ -0,0 +1,117 @@
+import os
+import sys
+import threading
+
+from qblox_instruments import ClusterType
+from qblox_instruments.types import DebugLevel
+
+from q1pulse.turbo_cluster import TurboCluster
+from q1pulse.modules.sequencer_states import parse_sequencer_status
+
+# The SCPI emulator is in the benchmarks directory of the repository.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.scpi_emulator import ScpiEmulator  # noqa: E402
+
+
+HOST = "127.0.0.3"
+N_ITERATIONS = 25
+
+modules = {
+    2: ClusterType.CLUSTER_QCM,
+    4: ClusterType.CLUSTER_QRM,
+    5: ClusterType.CLUSTER_QRM,
+    }
+qrm_slots = [4, 5]
+
+
+def sequence(num_bins):
+    return {
+        "waveforms": {},
+        "weights": {},
+        "acquisitions": {"default": {"num_bins": num_bins, "index": 0}},
+        "program": "stop",
+        }
+
+
+def expected_bins(slot, seq_nr):
+    # unique number of bins per sequencer to detect mixed up responses.
+    return 10*slot + seq_nr + 1
+
+
+def read_bulk(cluster):
+    acquisitions = [(slot, seq_nr, "default") for slot in qrm_slots for seq_nr in range(3)]
+    for _ in range(N_ITERATIONS):
+        results = cluster.get_acquisitions_multiple(acquisitions)
+        for (slot, seq_nr, _), bins in zip(acquisitions, results):
+            assert len(bins) == expected_bins(slot, seq_nr), (slot, seq_nr, len(bins))
+
+
+def poll_status(cluster):
+    sequencers = {slot: list(range(6)) for slot in modules}
+    for _ in range(N_ITERATIONS):
+        results = cluster.get_sequencer_status_multiple(sequencers, parse_sequencer_status)
+        assert [(slot, seq_nr) for slot, seq_nr, _ in results] == [
+            (slot, seq_nr) for slot, seq_nrs in sequencers.items() for seq_nr in seq_nrs]
+        for _, _, status in results:
+            assert status.state == "IDLE", status
+
+
+def upload_and_read(cluster, slot):
+    # writes and reads on the main connection while the bulk connection is used.
+    module = cluster.modules[slot-1]
+    for i in range(N_ITERATIONS):
+        module.sequencers[5].sequence(sequence(i+1))
+        bins = module.get_acquisitions(5)["default"]["acquisition"]["bins"]
+        assert len(bins["avg_cnt"]) == i+1, (slot, i, len(bins["avg_cnt"]))
+
+
+def read_cmm(cluster):
+    for _ in range(N_ITERATIONS):
+        assert "Cluster MM" in cluster._read("*IDN?")
+
+
+n_bulk_connections = TurboCluster.n_bulk_connections
+TurboCluster.n_bulk_connections = 2
+
+with ScpiEmulator(modules, HOST, latency=0.0002):
+    cluster = TurboCluster("turbo_concurrency", HOST, debug=DebugLevel.ERROR_CHECK)
+    try:
+        for slot in qrm_slots:
+            for seq_nr in range(3):
+                cluster.modules[slot-1].sequencers[seq_nr].sequence(sequence(expected_bins(slot, seq_nr)))
+        # wait till the uploads on the main connections have been processed.
+        assert cluster.get_system_errors() == []
+
+        tasks = (
+            [(read_bulk, ())] * 3
+            + [(poll_status, ())] * 2
+            + [(upload_and_read, (slot,)) for slot in qrm_slots]
+            + [(read_cmm, ())]
+            )
+        errors = []
+
+        def run(func, args):
+            try:
+                func(cluster, *args)
+            except BaseException as ex:
+                errors.append((func.__name__, ex))
+
+        threads = [threading.Thread(target=run, args=task) for task in tasks]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=120)
+            assert not thread.is_alive(), "deadlock"
+
+        assert errors == [], errors
+        assert cluster.get_system_errors() == []
+
+        statistics = cluster.get_connection_statistics()
+        assert all(statistics[slot].n_transactions >= N_ITERATIONS for slot in modules)
+        bulk_statistics = cluster.get_connection_statistics(bulk=True)
+        assert sorted(bulk_statistics) == qrm_slots
+        assert all(bulk_statistics[slot].n_transactions == 3*N_ITERATIONS for slot in qrm_slots)
+        assert all(cluster._bulk_pools[slot]._n_connections <= 2 for slot in qrm_slots)
+    finally:
+        cluster.close()
+        TurboCluster.n_bulk_connections = n_bulk_connections
@@ -0,0 +1,94 @@
+import socket
+import threading
+import time
+
+import numpy as np
+
+from q1pulse.turbo_cluster import BufferedIpTransport, _read_bin_block
+
+
+class SmallBufferTransport(BufferedIpTransport):
+    # small receive size to split every response over multiple receives.
+    recv_size = 16
+
+
+def serve_fragments(fragments):
+    '''
+    Starts a server on a free local port that sends the fragments
+    with a pause between them, so they arrive as separate receives.
+    Returns the port number.
+    '''
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+
+    def serve():
+        conn, _ = server.accept()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        for fragment in fragments:
+            conn.sendall(fragment)
+            time.sleep(0.02)
+        # keep the connection open till the client closes it.
+        conn.recv(1)
+        conn.close()
+        server.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def connect(fragments, transport_class=BufferedIpTransport):
+    port = serve_fragments(fragments)
+    return transport_class("127.0.0.1", port, timeout=5.0)
+
+
+# line split in the middle and line end in a separate fragment.
+for cls in [BufferedIpTransport, SmallBufferTransport]:
+    transport = connect([b"QBLOX,Clus", b"ter,0001,1.0", b"\n", b"1\n2", b"\n3\n"], cls)
+    assert transport.readline() == "QBLOX,Cluster,0001,1.0\n"
+    assert transport.readline() == "1\n"
+    assert transport.readlines(2) == ["2", "3"]
+    transport.close()
+
+# multiple responses in one fragment and text followed by binary data.
+transport = connect([b"0\n1\n#14ab", b"cd\nnext\n"], SmallBufferTransport)
+assert transport.readlines(2) == ["0", "1"]
+assert transport.read_binary(2) == b"#1"
+assert transport.read_binary(1) == b"4"
+assert transport.read_binary(4) == b"abcd"
+assert transport.readline() == "\n"
+assert transport.readline() == "next\n"
+transport.close()
+
+# binary block larger than recv_size, partially in the buffer,
+# received in many fragments directly in the destination.
+data = np.arange(1000, dtype=np.float32)
+raw = data.tobytes()
+header = f"#{len(str(len(raw)))}{len(raw)}".encode()
+fragments = [b"ok\n" + header + raw[:5]] + [raw[i:i+333] for i in range(5, len(raw), 333)] + [b"\nend\n"]
+for cls in [BufferedIpTransport, SmallBufferTransport]:
+    transport = connect(fragments, cls)
+    assert transport.readline() == "ok\n"
+    result = _read_bin_block(transport, np.float32)
+    assert np.array_equal(result, data)
+    assert transport.readline() == "\n"
+    assert transport.readline() == "end\n"
+    transport.close()
+
+# read_binary with size >= recv_size
+transport = connect([raw[:7], raw[7:100], raw[100:]], SmallBufferTransport)
+assert transport.read_binary(3) == raw[:3]
+assert transport.read_binary(200) == raw[3:203]
+assert transport.read_binary(len(raw) - 203) == raw[203:]
+transport.close()
+
+# connection closed by instrument
+transport = connect([b"partial"], SmallBufferTransport)
+transport._socket.shutdown(socket.SHUT_WR)
+try:
+    transport.readline()
+except ConnectionError:
+    pass
+else:
+    raise AssertionError("ConnectionError expected")
+transport.close()